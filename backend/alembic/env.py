@@ -11,7 +11,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from app.database import Base
 from app.models import (
     User, Group, GroupMember, Book, GroupBook,
-    Comment, CommentLike, UserReadingProgress, SpoilerReport
+    Comment, CommentLike, UserReadingProgress, SpoilerReport,
+    RefreshToken, RevokedSession, IdempotencyKey
 )
 from app.config import get_settings
 
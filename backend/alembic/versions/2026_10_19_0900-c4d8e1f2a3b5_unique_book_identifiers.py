@@ -0,0 +1,141 @@
+"""unique book identifiers
+
+Revision ID: c4d8e1f2a3b5
+Revises: b3e7020cc23c
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Optional
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d8e1f2a3b5'
+down_revision = 'b3e7020cc23c'
+branch_labels = None
+depends_on = None
+
+
+# ISBN normalization as of this revision, frozen here on purpose: later
+# changes to app.utils.isbn must not change what this migration did
+def _isbn13_check_digit(first12: str) -> str:
+    total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(first12))
+    return str((10 - total % 10) % 10)
+
+
+def _normalize_isbn(raw: Optional[str]) -> Optional[str]:
+    """Canonical ISBN-13 for an ISBN-10 or ISBN-13, or None if it is not a valid ISBN."""
+    if not raw:
+        return None
+
+    isbn = raw.replace("-", "").replace(" ", "").strip().upper()
+
+    if len(isbn) == 10 and isbn[:9].isdigit() and (isbn[9].isdigit() or isbn[9] == "X"):
+        if sum((10 - i) * (10 if c == "X" else int(c)) for i, c in enumerate(isbn)) % 11 == 0:
+            first12 = "978" + isbn[:9]
+            return first12 + _isbn13_check_digit(first12)
+
+    if len(isbn) == 13 and isbn.isdigit() and _isbn13_check_digit(isbn[:12]) == isbn[12]:
+        return isbn
+
+    return None
+
+
+def _merge_duplicates(conn, key_column: str) -> None:
+    """Fold books sharing ``key_column`` into the oldest row, re-pointing dependents."""
+    conn.execute(sa.text("DROP TABLE IF EXISTS book_dupes"))
+    conn.execute(sa.text(f"""
+        CREATE TEMP TABLE book_dupes AS
+        SELECT id AS dupe_id,
+               first_value(id) OVER (PARTITION BY {key_column} ORDER BY created_at, id) AS keep_id
+        FROM books
+        WHERE {key_column} IS NOT NULL
+    """))
+    conn.execute(sa.text("DELETE FROM book_dupes WHERE dupe_id = keep_id"))
+
+    # Drop group links / progress rows that would collide once merged
+    conn.execute(sa.text("""
+        DELETE FROM group_books gb
+        USING (
+            SELECT g.id,
+                   row_number() OVER (
+                       PARTITION BY g.group_id, COALESCE(d.keep_id, g.book_id)
+                       ORDER BY g.added_at
+                   ) AS rn
+            FROM group_books g
+            LEFT JOIN book_dupes d ON d.dupe_id = g.book_id
+            WHERE g.book_id IN (SELECT dupe_id FROM book_dupes UNION SELECT keep_id FROM book_dupes)
+        ) ranked
+        WHERE gb.id = ranked.id AND ranked.rn > 1
+    """))
+    conn.execute(sa.text("""
+        DELETE FROM user_reading_progress p
+        USING (
+            SELECT r.id,
+                   row_number() OVER (
+                       PARTITION BY r.user_id, r.group_id, COALESCE(d.keep_id, r.book_id)
+                       ORDER BY r.updated_at DESC
+                   ) AS rn
+            FROM user_reading_progress r
+            LEFT JOIN book_dupes d ON d.dupe_id = r.book_id
+            WHERE r.book_id IN (SELECT dupe_id FROM book_dupes UNION SELECT keep_id FROM book_dupes)
+        ) ranked
+        WHERE p.id = ranked.id AND ranked.rn > 1
+    """))
+
+    for table in ("group_books", "comments", "user_reading_progress"):
+        conn.execute(sa.text(f"""
+            UPDATE {table} t SET book_id = d.keep_id
+            FROM book_dupes d
+            WHERE t.book_id = d.dupe_id
+        """))
+
+    conn.execute(sa.text("DELETE FROM books b USING book_dupes d WHERE b.id = d.dupe_id"))
+    conn.execute(sa.text("DROP TABLE book_dupes"))
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    op.add_column('books', sa.Column('legacy_isbn', sa.String(20), nullable=True))
+
+    # Normalize stored ISBNs (ISBN-10 -> ISBN-13, strip hyphens); values that
+    # are not valid ISBNs move to legacy_isbn, out of the unique index
+    rows = conn.execute(sa.text("SELECT id, isbn FROM books WHERE isbn IS NOT NULL")).fetchall()
+    for book_id, isbn in rows:
+        normalized = _normalize_isbn(isbn)
+        if normalized is None:
+            conn.execute(
+                sa.text("UPDATE books SET isbn = NULL, legacy_isbn = :isbn WHERE id = :id"),
+                {"isbn": isbn, "id": book_id},
+            )
+        elif normalized != isbn:
+            conn.execute(
+                sa.text("UPDATE books SET isbn = :isbn WHERE id = :id"),
+                {"isbn": normalized, "id": book_id},
+            )
+
+    _merge_duplicates(conn, "isbn")
+    _merge_duplicates(conn, "open_library_id")
+
+    op.drop_index('ix_books_open_library_id', 'books')
+    op.drop_index('ix_books_isbn', 'books')
+    op.create_index(
+        'uq_books_isbn', 'books', ['isbn'],
+        unique=True, postgresql_where=sa.text('isbn IS NOT NULL'),
+    )
+    op.create_index(
+        'uq_books_open_library_id', 'books', ['open_library_id'],
+        unique=True, postgresql_where=sa.text('open_library_id IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_books_open_library_id', 'books')
+    op.drop_index('uq_books_isbn', 'books')
+    op.create_index('ix_books_isbn', 'books', ['isbn'])
+    op.create_index('ix_books_open_library_id', 'books', ['open_library_id'])
+    op.execute("UPDATE books SET isbn = legacy_isbn WHERE isbn IS NULL AND legacy_isbn IS NOT NULL")
+    op.drop_column('books', 'legacy_isbn')
@@ -0,0 +1,31 @@
+"""book enrichment columns
+
+Revision ID: d5e9f2a3b4c6
+Revises: c4d8e1f2a3b5
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e9f2a3b4c6'
+down_revision = 'c4d8e1f2a3b5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('books', sa.Column('page_count', sa.Integer(), nullable=True))
+    op.add_column('books', sa.Column('edition_count', sa.Integer(), nullable=True))
+    op.add_column('books', sa.Column('subjects', postgresql.ARRAY(sa.String()), nullable=True))
+    op.add_column('books', sa.Column('enriched_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('books', 'enriched_at')
+    op.drop_column('books', 'subjects')
+    op.drop_column('books', 'edition_count')
+    op.drop_column('books', 'page_count')
@@ -0,0 +1,47 @@
+"""refresh tokens and revoked sessions
+
+Revision ID: e6f0a3b4c5d7
+Revises: d5e9f2a3b4c6
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6f0a3b4c5d7'
+down_revision = 'd5e9f2a3b4c6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # refresh_tokens
+    op.create_table(
+        'refresh_tokens',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('family_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('idx_refresh_tokens_family', 'refresh_tokens', ['family_id'])
+
+    # revoked_sessions
+    op.create_table(
+        'revoked_sessions',
+        sa.Column('family_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_revoked_sessions_revoked_at', 'revoked_sessions', ['revoked_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_revoked_sessions_revoked_at', 'revoked_sessions')
+    op.drop_table('revoked_sessions')
+    op.drop_index('idx_refresh_tokens_family', 'refresh_tokens')
+    op.drop_table('refresh_tokens')
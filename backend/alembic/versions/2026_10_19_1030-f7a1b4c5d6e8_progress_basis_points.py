@@ -0,0 +1,46 @@
+"""progress basis points
+
+Revision ID: f7a1b4c5d6e8
+Revises: e6f0a3b4c5d7
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7a1b4c5d6e8'
+down_revision = 'e6f0a3b4c5d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('comments', sa.Column(
+        'progress_bp', sa.Integer(),
+        sa.Computed('progress_page * 10000 / progress_total_pages', persisted=True),
+        nullable=False
+    ))
+    op.drop_index('idx_comments_progress', 'comments')
+    op.create_index('idx_comments_progress', 'comments', ['book_id', 'group_id', 'progress_bp'])
+    op.drop_column('comments', 'progress_percentage')
+
+    op.add_column('user_reading_progress', sa.Column(
+        'progress_bp', sa.Integer(),
+        sa.Computed('current_page * 10000 / total_pages', persisted=True),
+        nullable=False
+    ))
+    op.drop_column('user_reading_progress', 'progress_percentage')
+
+
+def downgrade() -> None:
+    op.add_column('user_reading_progress', sa.Column('progress_percentage', sa.Numeric(5, 2), nullable=False, server_default='0.00'))
+    op.execute('UPDATE user_reading_progress SET progress_percentage = progress_bp / 100.0')
+    op.drop_column('user_reading_progress', 'progress_bp')
+
+    op.add_column('comments', sa.Column('progress_percentage', sa.Numeric(5, 2), nullable=False, server_default='0.00'))
+    op.execute('UPDATE comments SET progress_percentage = progress_bp / 100.0')
+    op.drop_index('idx_comments_progress', 'comments')
+    op.create_index('idx_comments_progress', 'comments', ['book_id', 'group_id', 'progress_percentage'])
+    op.drop_column('comments', 'progress_bp')
@@ -0,0 +1,33 @@
+"""comment thread indexes
+
+Revision ID: a8b2c5d6e7f9
+Revises: f7a1b4c5d6e8
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8b2c5d6e7f9'
+down_revision = 'f7a1b4c5d6e8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_comments_thread_roots', 'comments',
+        ['book_id', 'group_id', 'progress_bp', 'created_at', 'id'],
+        postgresql_where=sa.text('parent_comment_id IS NULL')
+    )
+    op.create_index(
+        'idx_comments_parent', 'comments', ['parent_comment_id'],
+        postgresql_where=sa.text('parent_comment_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_comments_parent', 'comments')
+    op.drop_index('idx_comments_thread_roots', 'comments')
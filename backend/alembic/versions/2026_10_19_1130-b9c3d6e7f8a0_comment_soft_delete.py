@@ -0,0 +1,41 @@
+"""comment soft delete
+
+Revision ID: b9c3d6e7f8a0
+Revises: a8b2c5d6e7f9
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9c3d6e7f8a0'
+down_revision = 'a8b2c5d6e7f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('comments', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.drop_index('idx_comments_progress', 'comments')
+    op.create_index(
+        'idx_comments_progress', 'comments', ['book_id', 'group_id', 'progress_bp'],
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+    op.create_index(
+        'idx_comments_deleted', 'comments', ['deleted_at'],
+        postgresql_where=sa.text('deleted_at IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    # The old schema has no way to keep a deleted comment, so every soft-deleted
+    # comment is hard-deleted now, including ones still inside the purge grace
+    # period, and their replies go with them through ON DELETE CASCADE, as a
+    # delete did before this revision. Back up comments first if that matters.
+    op.execute('DELETE FROM comments WHERE deleted_at IS NOT NULL')
+    op.drop_index('idx_comments_deleted', 'comments')
+    op.drop_index('idx_comments_progress', 'comments')
+    op.create_index('idx_comments_progress', 'comments', ['book_id', 'group_id', 'progress_bp'])
+    op.drop_column('comments', 'deleted_at')
@@ -0,0 +1,83 @@
+"""spoiler report moderation
+
+Revision ID: c0d4e7f8a9b1
+Revises: b9c3d6e7f8a0
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from app.config import get_settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'c0d4e7f8a9b1'
+down_revision = 'b9c3d6e7f8a0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('comments', sa.Column('report_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('comments', sa.Column('hidden_at', sa.DateTime(), nullable=True))
+    op.drop_index('idx_comments_progress', 'comments')
+    op.create_index(
+        'idx_comments_progress', 'comments', ['book_id', 'group_id', 'progress_bp'],
+        postgresql_where=sa.text('deleted_at IS NULL AND hidden_at IS NULL')
+    )
+
+    # Keep the earliest live report per (comment, reporter) before making them unique;
+    # dismissed reports are history and don't stop the reporter reporting again
+    op.execute('''
+        DELETE FROM spoiler_reports r USING spoiler_reports earlier
+        WHERE r.comment_id = earlier.comment_id
+          AND r.reported_by = earlier.reported_by
+          AND r.status <> 'dismissed' AND earlier.status <> 'dismissed'
+          AND (r.created_at, r.id) > (earlier.created_at, earlier.id)
+    ''')
+    op.create_index(
+        'unique_comment_reporter', 'spoiler_reports', ['comment_id', 'reported_by'],
+        unique=True, postgresql_where=sa.text("status <> 'dismissed'")
+    )
+
+    op.add_column('spoiler_reports', sa.Column('group_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.execute('UPDATE spoiler_reports r SET group_id = c.group_id FROM comments c WHERE c.id = r.comment_id')
+    op.alter_column('spoiler_reports', 'group_id', nullable=False)
+    op.create_foreign_key('spoiler_reports_group_id_fkey', 'spoiler_reports', 'groups', ['group_id'], ['id'], ondelete='CASCADE')
+    op.create_index(
+        'idx_spoiler_reports_pending', 'spoiler_reports', ['group_id', 'created_at', 'id'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+    op.execute('''
+        UPDATE comments c SET report_count = r.count
+        FROM (
+            SELECT comment_id, count(*) AS count FROM spoiler_reports
+            WHERE status <> 'dismissed' GROUP BY comment_id
+        ) r
+        WHERE c.id = r.comment_id
+    ''')
+
+    # Hide what reporting would have hidden: comments at the threshold, and confirmed spoilers
+    threshold = get_settings().spoiler_report_hide_threshold
+    op.execute(sa.text('''
+        UPDATE comments c SET hidden_at = now() AT TIME ZONE 'utc'
+        WHERE (:threshold > 0 AND c.report_count >= :threshold)
+           OR EXISTS (SELECT 1 FROM spoiler_reports r WHERE r.comment_id = c.id AND r.status = 'resolved')
+    ''').bindparams(threshold=threshold))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_spoiler_reports_pending', 'spoiler_reports')
+    op.drop_constraint('spoiler_reports_group_id_fkey', 'spoiler_reports', type_='foreignkey')
+    op.drop_column('spoiler_reports', 'group_id')
+    op.drop_index('unique_comment_reporter', 'spoiler_reports')
+
+    op.drop_index('idx_comments_progress', 'comments')
+    op.create_index(
+        'idx_comments_progress', 'comments', ['book_id', 'group_id', 'progress_bp'],
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+    op.drop_column('comments', 'hidden_at')
+    op.drop_column('comments', 'report_count')
@@ -0,0 +1,28 @@
+"""comment search index
+
+Revision ID: d1e5f8a9b0c2
+Revises: c0d4e7f8a9b1
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1e5f8a9b0c2'
+down_revision = 'c0d4e7f8a9b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_comments_search', 'comments', [sa.text("to_tsvector('english', content)")],
+        postgresql_using='gin',
+        postgresql_where=sa.text('deleted_at IS NULL AND hidden_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_comments_search', 'comments')
@@ -0,0 +1,34 @@
+"""idempotency keys
+
+Revision ID: e2f6a9b0c1d3
+Revises: d1e5f8a9b0c2
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2f6a9b0c1d3'
+down_revision = 'd1e5f8a9b0c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('key', sa.String(255), primary_key=True),
+        sa.Column('fingerprint', sa.String(32), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('body', sa.LargeBinary(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('idempotency_keys')
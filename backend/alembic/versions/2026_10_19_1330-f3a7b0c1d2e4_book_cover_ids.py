@@ -0,0 +1,33 @@
+"""book cover ids
+
+Revision ID: f3a7b0c1d2e4
+Revises: e2f6a9b0c1d3
+Create Date: 2026-10-19 13:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a7b0c1d2e4'
+down_revision = 'e2f6a9b0c1d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('books', sa.Column(
+        'cover_id', sa.Integer(),
+        sa.Computed(r"substring(cover_url from '/b/id/([0-9]{1,9})-[SML]\.jpg')::integer", persisted=True),
+        nullable=True
+    ))
+    op.create_index(
+        'idx_books_cover_id', 'books', ['cover_id'],
+        postgresql_where=sa.text('cover_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_books_cover_id', 'books')
+    op.drop_column('books', 'cover_id')
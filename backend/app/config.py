@@ -8,22 +8,76 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str
+    database_replica_urls: str = ""  # Comma-separated read replicas for GET requests
+    read_your_writes_seconds: float = 10.0  # Keep a client's reads on the primary this long after it writes
+    auto_create_tables: bool = False  # Local throwaway databases only; Alembic owns the schema
+    slow_query_ms: float = 200.0  # Requests with a statement this slow are logged as warnings
+    query_count_warning: int = 20  # ... as are requests issuing this many statements
+
+    # Connection pool, per worker process: keep
+    # replicas * workers * (db_pool_size + db_max_overflow) below Postgres max_connections
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = -1  # Seconds; set below any proxy/server idle timeout (-1 = never)
+    db_pool_use_lifo: bool = True  # Reuse hot connections so idle ones can age out
+    db_pool_pre_ping: bool = False  # Only needed if connections are dropped silently
 
     # Google OAuth
     google_client_id: str
     google_client_secret: str
     google_redirect_uri: str
+    google_certs_url: str = "https://www.googleapis.com/oauth2/v3/certs"
 
     # JWT
     secret_key: str
     algorithm: str = "HS256"
-    access_token_expire_minutes: int = 10080  # 7 days
+    access_token_expire_minutes: int = 15
+    refresh_token_expire_days: int = 30
+    # A just-rotated refresh token still gets the current pair this long (concurrent tabs), not a revocation
+    refresh_reuse_grace_seconds: float = 10.0
+    revocation_filter_capacity: int = 10000  # Sessions revoked within one access token lifetime
+    revocation_sync_seconds: float = 30.0
+
+    # Password hashing
+    password_schemes: str = "bcrypt"  # e.g. "argon2,bcrypt" (requires argon2-cffi)
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_queue_size: int = 16  # Waiting hashes beyond this are shed with 429
 
     # CORS
     frontend_url: str
 
     # Open Library API
     open_library_api_url: str = "https://openlibrary.org"
+    open_library_covers_url: str = "https://covers.openlibrary.org"
+
+    # Book metadata enrichment worker
+    enrichment_workers: int = 2
+    enrichment_queue_size: int = 1000
+    enrichment_max_attempts: int = 5
+    enrichment_backoff_seconds: float = 2.0
+
+    # Comment visibility index (per worker); only built when one process writes every
+    # comment, since it must see them all to answer which comments are visible
+    visibility_index_single_writer: bool = False
+    visibility_index_books: int = 512  # (group, book) feeds kept in memory, least recently read evicted
+    visibility_index_ttl_seconds: float = 60.0  # Reload so direct database changes show up
+
+    # Background purge of soft-deleted comments (per worker)
+    comment_purge_interval_seconds: float = 300.0
+    comment_purge_batch_size: int = 200  # Comments hard-deleted per transaction
+    comment_purge_grace_seconds: float = 3600.0  # Keep deleted comments this long before purging
+    comment_purge_max_in_flight: int = 2  # Skip a run while the worker handles more requests than this
+
+    # Idempotency-Key support for comment and progress POSTs
+    idempotency_store: str = "memory"  # 'memory' (per worker) or 'database' (shared by all workers)
+    idempotency_ttl_seconds: float = 86400.0  # How long a key's response can be replayed
+    idempotency_max_keys: int = 10000  # Memory store only; least recently used keys evicted
+
+    # Cover proxy cache
+    cover_cache_dir: str = "cover_cache"
+    cover_cache_max_mb: int = 256
 
     # Cloudinary
     cloudinary_cloud_name: str
@@ -38,6 +92,7 @@ class Settings(BaseSettings):
     max_group_members: int = 32
     max_comment_length: int = 1000
     max_avatar_size_mb: int = 2
+    spoiler_report_hide_threshold: int = 3  # Hide a comment after this many spoiler reports (0 = never)
 
     class Config:
         env_file = ".env"
@@ -1,26 +1,276 @@
 """Database connection and session management."""
-from sqlalchemy import create_engine
+import hashlib
+import hmac
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import get_settings
+from .utils.metrics import REGISTRY, Counter, Gauge, Histogram
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+DB_QUERY_SECONDS = Histogram(
+    "bookclub_db_query_seconds",
+    "Time per SQL statement, measured around cursor execution.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
 )
+_db_query_seconds = DB_QUERY_SECONDS.labels()
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "bookclub_db_pool_checkout_seconds",
+    "Time to obtain a pooled connection, including waiting for one to be returned.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "bookclub_db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout because the pool was exhausted.",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "bookclub_db_pool_checked_out",
+    "Connections currently checked out of this worker's pool.",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "bookclub_db_pool_overflow",
+    "Connections open beyond pool_size (max_overflow in use).",
+)
+DB_POOL_SATURATION = Gauge(
+    "bookclub_db_pool_saturation",
+    "Checked-out connections as a fraction of pool_size + max_overflow.",
+)
+DB_SESSIONS = Counter(
+    "bookclub_db_sessions_total",
+    "Request database sessions by routing target.",
+    ["target"],
+)
+_db_sessions_primary = DB_SESSIONS.labels("primary")
+_db_sessions_replica = DB_SESSIONS.labels("replica")
+DB_DISCONNECTS = Counter(
+    "bookclub_db_disconnects_total",
+    "Statements that failed because the database connection was lost.",
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times checkouts and counts pool exhaustion."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
+
+
+def _collect_pool_stats() -> None:
+    if engine is None:
+        return
+    pool = engine.pool
+    checked_out = pool.checkedout()
+    DB_POOL_CHECKED_OUT.set(checked_out)
+    DB_POOL_OVERFLOW.set(max(0, pool.overflow()))
+    DB_POOL_SATURATION.set(checked_out / (settings.db_pool_size + max(0, settings.db_max_overflow)))
+
+
+REGISTRY.add_collector(_collect_pool_stats)
+
+
+class QueryStats:
+    """SQL statements executed on behalf of one request (or tracked block)."""
+
+    __slots__ = ("count", "total_seconds", "slowest_seconds", "slowest_statement")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Attribute statements executed within the block to a fresh QueryStats.
+
+    Context variables follow the request into threadpool calls, so sync
+    dependencies and endpoints are counted too.
+
+    Yields:
+        QueryStats that is updated as statements run
+    """
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    _db_query_seconds.observe(elapsed)
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_seconds += elapsed
+        if elapsed >= stats.slowest_seconds:
+            stats.slowest_seconds = elapsed
+            stats.slowest_statement = statement
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+    if exception_context.is_disconnect:
+        # SQLAlchemy invalidates the whole pool, so connections opened before
+        # the outage are replaced on their next checkout instead of failing too
+        DB_DISCONNECTS.inc()
+        logger.warning(f"Database connection lost, pool invalidated: {exception_context.original_exception}")
+
+# Created by init_engine() from the application lifespan, so importing the
+# app (workers, tests, Alembic) never touches the database.
+engine: Optional[Engine] = None
+replica_engines: List[Engine] = []
+_replica_cycle: Optional[Iterator[Engine]] = None
+
+SAFE_METHODS = frozenset({"GET", "HEAD"})
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+
+# Objects keep their loaded state after commit: every column value is known
+# client-side after the INSERT/UPDATE, so responses are built without a
+# reload SELECT per write.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency for getting database sessions."""
-    db = SessionLocal()
+def _create_engine(url: str) -> Engine:
+    new_engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_use_lifo=settings.db_pool_use_lifo,
+        pool_pre_ping=settings.db_pool_pre_ping
+    )
+    event.listen(new_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(new_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(new_engine, "handle_error", _handle_error)
+    return new_engine
+
+
+def init_engine() -> Engine:
+    """
+    Create the primary and replica engines and bind SessionLocal to the
+    primary (idempotent).
+
+    No connection is opened here; the pool connects on first use. Stale
+    connections are handled by pool_recycle and disconnect invalidation
+    rather than a pre-ping round trip on every checkout.
+
+    Returns:
+        The process-wide primary Engine
+    """
+    global engine, replica_engines, _replica_cycle
+    if engine is None:
+        engine = _create_engine(settings.database_url)
+        replica_engines = [
+            _create_engine(url.strip())
+            for url in settings.database_replica_urls.split(",")
+            if url.strip()
+        ]
+        _replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+        logger.info(
+            f"Database pool: size={settings.db_pool_size} max_overflow={settings.db_max_overflow} "
+            f"(up to {settings.db_pool_size + settings.db_max_overflow} connections per worker "
+            f"per database, {len(replica_engines)} read replica(s))"
+        )
+        SessionLocal.configure(bind=engine)
+    return engine
+
+
+def dispose_engine() -> None:
+    """Close all pooled connections (called on application shutdown)."""
+    global engine, replica_engines, _replica_cycle
+    for each in [engine, *replica_engines]:
+        if each is not None:
+            each.dispose()
+    engine = None
+    replica_engines = []
+    _replica_cycle = None
+
+
+def _primary_until_value(until: int) -> str:
+    """``X-Primary-Until`` value: the deadline and an HMAC over it, so clients can't forge one."""
+    signature = hmac.new(
+        settings.secret_key.encode(), f"primary-until:{until}".encode(), hashlib.sha256
+    ).hexdigest()[:32]
+    return f"{until}:{signature}"
+
+
+def _reads_primary(request: Request) -> bool:
+    """Whether the client wrote recently enough that a replica may not have caught up."""
+    primary_until = request.headers.get(PRIMARY_UNTIL_HEADER)
+    if not primary_until:
+        return False
+    try:
+        until = int(primary_until.partition(":")[0])
+    except ValueError:
+        return False
+    return until > time.time() and hmac.compare_digest(primary_until, _primary_until_value(until))
+
+
+def get_db(request: Request, response: Response):
+    """
+    Dependency for getting database sessions.
+
+    Safe (GET/HEAD) requests are served from a read replica when any are
+    configured. Every other request uses the primary and marks the
+    response with a signed ``X-Primary-Until``; clients echo that header
+    back so their reads stay on the primary until replicas have caught up
+    with their own writes (read-your-writes), on whichever worker they
+    land. Forged or expired values are ignored.
+    """
+    if engine is None:
+        init_engine()
+
+    if request.method in SAFE_METHODS:
+        if _replica_cycle is not None and not _reads_primary(request):
+            _db_sessions_replica.inc()
+            db = SessionLocal(bind=next(_replica_cycle))
+        else:
+            _db_sessions_primary.inc()
+            db = SessionLocal()
+    else:
+        if _replica_cycle is not None:
+            until = int(time.time() + settings.read_your_writes_seconds) + 1
+            response.headers[PRIMARY_UNTIL_HEADER] = _primary_until_value(until)
+        _db_sessions_primary.inc()
+        db = SessionLocal()
+
     try:
         yield db
     finally:
@@ -1,13 +1,24 @@
 """Main FastAPI application for BookClub Platform."""
+import time
+
+_boot_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 from .config import get_settings
-from .database import engine, Base
-from .routers import auth, users, groups, books, comments, progress
-from fastapi.middleware.cors import CORSMiddleware
+from .database import Base, SessionLocal, dispose_engine, init_engine
+from .middleware.cors import CORSMiddleware, build_allowlist
+from .middleware.metrics import MetricsMiddleware
+from .middleware.query_stats import QueryStatsMiddleware
+from .routers import auth, users, groups, books, comments, progress, covers
+from .services.comment_purge_service import CommentPurgeService
+from .services.enrichment_service import EnrichmentService
+from .services.password_service import PasswordService
+from .utils.metrics import REGISTRY, Gauge
 
 # Configure logging
 logging.basicConfig(
@@ -18,8 +29,39 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+STARTUP_SECONDS = Gauge(
+    "bookclub_startup_seconds",
+    "Time from importing app.main until the worker was ready to serve.",
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background services on startup and release them on shutdown."""
+    logger.info("BookClub Platform API starting up...")
+    logger.info(f"Environment: {settings.environment}")
+    logger.info(f"Frontend URL: {settings.frontend_url}")
+
+    # The schema is owned by Alembic; create_all is an opt-in for throwaway databases
+    engine = init_engine()
+    if settings.auto_create_tables:
+        Base.metadata.create_all(bind=engine)
+
+    await EnrichmentService.start()
+    await CommentPurgeService.start()
+
+    startup_seconds = time.perf_counter() - _boot_started
+    STARTUP_SECONDS.set(startup_seconds)
+    logger.info(f"Application started successfully in {startup_seconds * 1000:.0f} ms")
+
+    yield
+
+    logger.info("BookClub Platform API shutting down...")
+    await EnrichmentService.stop()
+    await CommentPurgeService.stop()
+    PasswordService.shutdown()
+    dispose_engine()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -28,81 +70,17 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.environment == "development" else None,
     redoc_url="/redoc" if settings.environment == "development" else None,
+    lifespan=lifespan,
 )
 
-# Configure CORS - Using FastAPI's built-in middleware
-logger.info(f"Setting up CORS middleware for environment: {settings.environment}")
-
-# Build explicit allowlist from env (supports comma-separated) + common local dev hosts
-def expand_origin(origin: str) -> list[str]:
-    """Normalize origin strings; if scheme missing, include both https/http variants."""
-    cleaned = origin.strip().rstrip("/")
-    if not cleaned:
-        return []
-    if cleaned.startswith(("http://", "https://")):
-        return [cleaned]
-    return [f"https://{cleaned}", f"http://{cleaned}"]
-
-
-env_origins: list[str] = []
-for raw_origin in settings.frontend_url.split(","):
-    env_origins.extend(expand_origin(raw_origin))
-
-allowed_origins = {
-    *env_origins,
-    "http://localhost:5173",
-    "https://localhost:5173",
-    "http://localhost:3000",
-    "https://localhost:3000",
-}
-
-allowlist = [origin for origin in allowed_origins if origin]
+# Configure CORS: exact-match allowlist from FRONTEND_URL plus local dev hosts
+allowlist = build_allowlist(settings.frontend_url)
 logger.info(f"CORS allowed origins: {allowlist}")
+app.add_middleware(CORSMiddleware, allow_origins=allowlist)
+app.add_middleware(QueryStatsMiddleware)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowlist,
-    allow_origin_regex=".*",  # fallback to ensure header on any origin
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-logger.info("CORS middleware added successfully")
-
-
-# Final safety net: ensure CORS headers are present on every response, including errors
-@app.middleware("http")
-async def add_cors_headers(request: Request, call_next):
-    origin = request.headers.get("origin", "")
-
-    # Preflight handling (covers cases where upstream middleware might not run)
-    if request.method == "OPTIONS":
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={},
-            headers={
-                "Access-Control-Allow-Origin": origin or "*",
-                "Access-Control-Allow-Methods": "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT",
-                "Access-Control-Allow-Headers": request.headers.get("Access-Control-Request-Headers", "*"),
-                "Access-Control-Allow-Credentials": "true",
-                "Access-Control-Max-Age": "600",
-            },
-        )
-
-    try:
-        response = await call_next(request)
-    except Exception as exc:
-        logger.error(f"Unhandled exception processing {request.url}: {exc}", exc_info=True)
-        response = JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"detail": "Internal server error"},
-        )
-    response.headers["Access-Control-Allow-Origin"] = origin or "*"
-    response.headers["Access-Control-Allow-Credentials"] = "true"
-    response.headers["Access-Control-Expose-Headers"] = "*"
-    response.headers.setdefault("Access-Control-Allow-Methods", "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT")
-    response.headers.setdefault("Access-Control-Allow-Headers", "Content-Type, Authorization, *")
-    return response
+# Added last so it is outermost and times the whole stack, CORS included
+app.add_middleware(MetricsMiddleware)
 
 
 # Exception handlers
@@ -152,6 +130,7 @@ app.include_router(groups.router)
 app.include_router(books.router)
 app.include_router(comments.router)
 app.include_router(progress.router)
+app.include_router(covers.router)
 
 
 # Health check endpoint
@@ -171,7 +150,6 @@ async def health_check():
     """Detailed health check endpoint."""
     try:
         # Test database connection
-        from .database import SessionLocal
         from sqlalchemy import text
         db = SessionLocal()
         db.execute(text("SELECT 1"))
@@ -188,20 +166,10 @@ async def health_check():
     }
 
 
-# Startup and shutdown events
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup."""
-    logger.info("BookClub Platform API starting up...")
-    logger.info(f"Environment: {settings.environment}")
-    logger.info(f"Frontend URL: {settings.frontend_url}")
-    logger.info("Application started successfully")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown."""
-    logger.info("BookClub Platform API shutting down...")
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics for this worker process."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
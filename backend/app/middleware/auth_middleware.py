@@ -1,47 +1,97 @@
 """Authentication middleware for JWT token validation."""
+import uuid
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models.user import User
+from ..services.auth_service import AuthService
 from ..utils.security import verify_token
 
 security = HTTPBearer()
 
 
-async def get_current_user(
+class TokenUser:
+    """Authenticated user as described by access token claims (no DB row)."""
+
+    __slots__ = ("id", "name", "avatar_url", "session_id")
+
+    def __init__(self, id: uuid.UUID, name: Optional[str], avatar_url: Optional[str], session_id: str):
+        self.id = id
+        self.name = name
+        self.avatar_url = avatar_url
+        self.session_id = session_id
+
+
+def _token_user_from_payload(payload: dict) -> TokenUser:
+    try:
+        return TokenUser(
+            id=uuid.UUID(payload["sub"]),
+            name=payload.get("name"),
+            avatar_url=payload.get("avatar_url"),
+            session_id=payload["sid"],
+        )
+    except (KeyError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def get_token_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> TokenUser:
     """
-    Dependency to get the current authenticated user from JWT token.
+    Dependency to get the current user from access token claims.
+
+    Verifies the signature, expiry and session revocation without loading
+    the user row; use get_current_user when the full User is needed.
 
     Args:
         credentials: HTTP Bearer token credentials
         db: Database session
 
     Returns:
-        Current User instance
+        TokenUser built from the token claims
 
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid or its session was revoked
     """
-    token = credentials.credentials
-
-    # Verify token and get payload
-    payload = verify_token(token)
-    user_id: str = payload.get("sub")
+    payload = verify_token(credentials.credentials)
+    token_user = _token_user_from_payload(payload)
 
-    if user_id is None:
+    if AuthService.is_session_revoked(db, token_user.session_id):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+            detail="Session has been revoked",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    return token_user
+
+
+async def get_current_user(
+    token_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token.
+
+    Args:
+        token_user: Verified access token claims
+        db: Database session
+
+    Returns:
+        Current User instance
+
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
     # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == token_user.id).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -71,14 +121,12 @@ async def get_current_user_optional(
         return None
 
     try:
-        token = credentials.credentials
-        payload = verify_token(token)
-        user_id: str = payload.get("sub")
-
-        if user_id is None:
+        payload = verify_token(credentials.credentials)
+        token_user = _token_user_from_payload(payload)
+        if AuthService.is_session_revoked(db, token_user.session_id):
             return None
 
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.query(User).filter(User.id == token_user.id).first()
         return user
     except HTTPException:
         return None
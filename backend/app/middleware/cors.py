@@ -1,34 +1,155 @@
-"""Custom CORS middleware."""
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-
-
-class SimpleCORSMiddleware(BaseHTTPMiddleware):
-    """Simple CORS middleware that allows all origins for now."""
-
-    async def dispatch(self, request: Request, call_next):
-        origin = request.headers.get("origin", "")
-
-        # Handle preflight requests
-        if request.method == "OPTIONS":
-            return Response(
-                status_code=200,
-                headers={
-                    "Access-Control-Allow-Origin": origin or "*",
-                    "Access-Control-Allow-Methods": "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT",
-                    "Access-Control-Allow-Headers": "Content-Type, Authorization",
-                    "Access-Control-Allow-Credentials": "true",
-                    "Access-Control-Max-Age": "600",
-                },
-            )
-
-        # Handle actual requests
-        response = await call_next(request)
-
-        # Add CORS headers to all responses
-        response.headers["Access-Control-Allow-Origin"] = origin or "*"
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        response.headers["Access-Control-Expose-Headers"] = "*"
-
-        return response
+"""Allowlist-based CORS middleware (pure ASGI)."""
+import json
+import logging
+from typing import Dict, Iterable, List, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+ALLOW_METHODS = "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+DEV_ORIGINS = (
+    "http://localhost:5173",
+    "https://localhost:5173",
+    "http://localhost:3000",
+    "https://localhost:3000",
+)
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+def expand_origin(origin: str) -> List[str]:
+    """Normalize origin strings; if scheme missing, include both https/http variants."""
+    cleaned = origin.strip().rstrip("/")
+    if not cleaned:
+        return []
+    if cleaned.startswith(("http://", "https://")):
+        return [cleaned]
+    return [f"https://{cleaned}", f"http://{cleaned}"]
+
+
+def build_allowlist(frontend_url: str) -> List[str]:
+    """Build the origin allowlist from FRONTEND_URL (comma-separated) plus local dev hosts."""
+    origins = set(DEV_ORIGINS)
+    for raw_origin in frontend_url.split(","):
+        origins.update(expand_origin(raw_origin))
+    return sorted(origins)
+
+
+class CORSMiddleware:
+    """
+    CORS for an exact set of origins, with all header work precomputed.
+
+    Requests without an Origin header pass straight through. Preflight
+    responses are built once per (origin, requested headers) and replayed.
+    Unhandled errors still get a JSON 500 carrying CORS headers, so the
+    browser shows the real failure instead of a CORS error.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Iterable[str],
+        expose_headers: str = "*",
+        max_age: int = 600,
+        preflight_cache_size: int = 256,
+    ):
+        self.app = app
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        self.max_age = str(max_age).encode()
+        self.preflight_cache_size = preflight_cache_size
+        self._simple_headers: Headers = [
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-expose-headers", expose_headers.encode("latin-1")),
+            (b"vary", b"Origin"),
+        ]
+        self._preflight_cache: Dict[Tuple[bytes, bytes], Headers] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed = origin in self.allow_origins
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(origin, allowed, request_headers or b"", send)
+            return
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [(b"access-control-allow-origin", origin), *self._simple_headers]
+        response_started = False
+
+        async def send_with_cors(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cors)
+        except Exception as exc:
+            if response_started:
+                raise
+            logger.error(f"Unhandled exception processing {scope['path']}: {exc}", exc_info=True)
+            body = json.dumps({
+                "detail": "An unexpected error occurred",
+                "message": "Internal server error"
+            }).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    *cors_headers,
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+
+    async def _preflight(self, origin: bytes, allowed: bool, request_headers: bytes, send: Send) -> None:
+        if not allowed:
+            body = b"Disallowed CORS origin"
+            await send({
+                "type": "http.response.start",
+                "status": 400,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"vary", b"Origin"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        key = (origin, request_headers)
+        headers = self._preflight_cache.get(key)
+        if headers is None:
+            headers = [
+                (b"access-control-allow-origin", origin),
+                (b"access-control-allow-methods", ALLOW_METHODS.encode()),
+                (b"access-control-allow-headers", request_headers or b"*"),
+                (b"access-control-allow-credentials", b"true"),
+                (b"access-control-max-age", self.max_age),
+                (b"vary", b"Origin"),
+                (b"content-length", b"0"),
+            ]
+            # Requested headers are client-controlled; don't let them grow the cache unbounded
+            if len(self._preflight_cache) < self.preflight_cache_size:
+                self._preflight_cache[key] = headers
+        await send({"type": "http.response.start", "status": 200, "headers": list(headers)})
+        await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,88 @@
+"""Request instrumentation middleware (pure ASGI)."""
+import time
+from typing import Dict, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..utils.metrics import Counter, Gauge, Histogram
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "bookclub_http_request_duration_seconds",
+    "Request latency by route template, from first byte received to last byte sent.",
+    ["method", "route"],
+)
+HTTP_REQUESTS = Counter(
+    "bookclub_http_requests_total",
+    "Requests by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "bookclub_http_response_size_bytes",
+    "Response body size by route template.",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "bookclub_http_requests_in_flight",
+    "Requests currently being handled by this worker.",
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+_in_flight = HTTP_REQUESTS_IN_FLIGHT.labels()
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and response size per route template.
+
+    Routes are labelled by their template (``/groups/{group_id}``) taken from
+    the route FastAPI matched, never the raw URL, so label cardinality stays
+    bounded. Metric children are cached per (method, route, status) so the
+    per-request cost is two clock reads and a dict lookup.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._children: Dict[Tuple[str, str, int], tuple] = {}
+
+    def _children_for(self, method: str, route: str, status: int) -> tuple:
+        key = (method, route, status)
+        children = self._children.get(key)
+        if children is None:
+            children = (
+                HTTP_REQUEST_SECONDS.labels(method, route),
+                HTTP_RESPONSE_BYTES.labels(method, route),
+                HTTP_REQUESTS.labels(method, route, status),
+            )
+            self._children[key] = children
+        return children
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        body_bytes = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, body_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        _in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - start
+            _in_flight.dec()
+            # The router adds the matched route to the shared scope dict
+            route = scope.get("route")
+            route_path = getattr(route, "path_format", UNMATCHED_ROUTE)
+            latency, size, requests = self._children_for(scope["method"], route_path, status)
+            latency.observe(elapsed)
+            size.observe(body_bytes)
+            requests.inc()
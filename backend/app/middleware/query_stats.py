@@ -0,0 +1,101 @@
+"""Per-request SQL statistics middleware (pure ASGI)."""
+import logging
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..config import get_settings
+from ..database import track_queries
+from ..utils.metrics import Counter, Histogram
+from .metrics import UNMATCHED_ROUTE
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "bookclub_db_queries_per_request",
+    "SQL statements issued per request, by route template.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "bookclub_db_seconds_per_request",
+    "Total SQL execution time per request, by route template.",
+    ["route"],
+)
+DB_SLOW_REQUESTS = Counter(
+    "bookclub_db_slow_requests_total",
+    "Requests over the slow-query or query-count threshold, by route template.",
+    ["route"],
+)
+
+
+class QueryStatsMiddleware:
+    """
+    Attributes SQL statement count, DB time and the slowest statement to
+    each request.
+
+    The figures go to metrics, to a log line (warning level when the
+    request crosses ``slow_query_ms`` or ``query_count_warning``), and in
+    development to ``X-DB-*`` response headers. Headers only cover
+    statements issued before the response started.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.debug_headers = settings.environment == "development"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        with track_queries() as stats:
+
+            async def send_with_stats(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    if self.debug_headers:
+                        message["headers"] = [
+                            *message.get("headers", ()),
+                            (b"x-db-query-count", str(stats.count).encode()),
+                            (b"x-db-time-ms", f"{stats.total_seconds * 1000:.1f}".encode()),
+                            (b"x-db-slowest-ms", f"{stats.slowest_seconds * 1000:.1f}".encode()),
+                        ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                self._report(scope, status, stats)
+
+    @staticmethod
+    def _report(scope: Scope, status: int, stats) -> None:
+        route = getattr(scope.get("route"), "path_format", UNMATCHED_ROUTE)
+        DB_QUERIES_PER_REQUEST.labels(route).observe(stats.count)
+        if stats.count == 0:
+            return
+        DB_SECONDS_PER_REQUEST.labels(route).observe(stats.total_seconds)
+
+        slow = (
+            stats.slowest_seconds * 1000 >= settings.slow_query_ms
+            or stats.count >= settings.query_count_warning
+        )
+        if slow:
+            DB_SLOW_REQUESTS.labels(route).inc()
+        if slow or logger.isEnabledFor(logging.DEBUG):
+            slowest = " ".join((stats.slowest_statement or "").split())[:500]
+            logger.log(
+                logging.WARNING if slow else logging.DEBUG,
+                f"db_stats method={scope['method']} route={route} status={status} "
+                f"queries={stats.count} db_ms={stats.total_seconds * 1000:.1f} "
+                f"slowest_ms={stats.slowest_seconds * 1000:.1f} slowest_sql=\"{slowest}\"",
+                extra={
+                    "method": scope["method"],
+                    "route": route,
+                    "status": status,
+                    "db_queries": stats.count,
+                    "db_ms": round(stats.total_seconds * 1000, 1),
+                    "db_slowest_ms": round(stats.slowest_seconds * 1000, 1),
+                    "db_slowest_sql": slowest,
+                },
+            )
@@ -5,6 +5,8 @@ from .book import Book, GroupBook
 from .comment import Comment, CommentLike
 from .progress import UserReadingProgress
 from .report import SpoilerReport
+from .session import RefreshToken, RevokedSession
+from .idempotency import IdempotencyKey
 
 __all__ = [
     "User",
@@ -16,4 +18,7 @@ __all__ = [
     "CommentLike",
     "UserReadingProgress",
     "SpoilerReport",
+    "RefreshToken",
+    "RevokedSession",
+    "IdempotencyKey",
 ]
@@ -1,10 +1,11 @@
 """Book models."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, String, Integer, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 from ..database import Base
+from ..utils.covers import cover_proxy_path
 
 
 class Book(Base):
@@ -15,15 +16,45 @@ class Book(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(500), nullable=False)
     author = Column(String(255), nullable=False)
-    isbn = Column(String(20), nullable=True, index=True)
-    open_library_id = Column(String(50), nullable=True, index=True)
+    isbn = Column(String(20), nullable=True)  # Normalized ISBN-13
+    legacy_isbn = Column(String(20), nullable=True)  # Pre-normalization value that was not a valid ISBN
+    open_library_id = Column(String(50), nullable=True)
     cover_url = Column(String, nullable=True)  # Hotlinked from Open Library
+    # Open Library cover ID from cover_url, generated by the database so the
+    # cover proxy can check it is serving a known cover with one index lookup
+    cover_id = Column(
+        Integer,
+        Computed(r"substring(cover_url from '/b/id/([0-9]{1,9})-[SML]\.jpg')::integer", persisted=True),
+        nullable=True
+    )
+    # Filled in asynchronously from Open Library by EnrichmentService
+    page_count = Column(Integer, nullable=True)
+    edition_count = Column(Integer, nullable=True)
+    subjects = Column(ARRAY(String), nullable=True)
+    enriched_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
-    group_books = relationship("GroupBook", back_populates="book", cascade="all, delete-orphan")
-    comments = relationship("Comment", back_populates="book", cascade="all, delete-orphan")
-    reading_progress = relationship("UserReadingProgress", back_populates="book", cascade="all, delete-orphan")
+    group_books = relationship("GroupBook", back_populates="book", cascade="all, delete-orphan", passive_deletes=True)
+    comments = relationship("Comment", back_populates="book", cascade="all, delete-orphan", passive_deletes=True)
+    reading_progress = relationship("UserReadingProgress", back_populates="book", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        # Partial unique indexes back the upsert in BookService.create_book
+        Index("uq_books_isbn", "isbn", unique=True, postgresql_where=text("isbn IS NOT NULL")),
+        Index(
+            "uq_books_open_library_id",
+            "open_library_id",
+            unique=True,
+            postgresql_where=text("open_library_id IS NOT NULL"),
+        ),
+        Index("idx_books_cover_id", "cover_id", postgresql_where=text("cover_id IS NOT NULL")),
+    )
+
+    @property
+    def cover_thumbnail_url(self):
+        """API path of the cached thumbnail for this book's cover, if proxied."""
+        return cover_proxy_path(self.cover_url)
 
     def __repr__(self):
         return f"<Book {self.title} by {self.author}>"
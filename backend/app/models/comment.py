@@ -1,7 +1,7 @@
 """Comment models."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Numeric, CheckConstraint, UniqueConstraint, Index
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Computed, CheckConstraint, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy import text
@@ -20,27 +20,34 @@ class Comment(Base):
     content = Column(String, nullable=False)
     progress_page = Column(Integer, nullable=False)
     progress_total_pages = Column(Integer, nullable=False)
-    # Computed column: progress_percentage = (progress_page / progress_total_pages) * 100
-    progress_percentage = Column(
-        Numeric(5, 2),
-        nullable=False,
-        server_default=text("0.00")
+    # Progress in basis points (1/100 of a percent, 0-10000), generated by the
+    # database so visibility checks are integer comparisons on the index
+    progress_bp = Column(
+        Integer,
+        Computed("progress_page * 10000 / progress_total_pages", persisted=True),
+        nullable=False
     )
     parent_comment_id = Column(UUID(as_uuid=True), ForeignKey("comments.id", ondelete="CASCADE"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Soft deletion: hidden from reads at once, hard-deleted later by CommentPurgeService
+    deleted_at = Column(DateTime, nullable=True)
+    # Spoiler moderation: reports received, and when the comment was hidden because of them
+    report_count = Column(Integer, default=0, server_default="0", nullable=False)
+    hidden_at = Column(DateTime, nullable=True)
 
     # Relationships
     group = relationship("Group", back_populates="comments")
     book = relationship("Book", back_populates="comments")
     user = relationship("User", back_populates="comments")
-    likes = relationship("CommentLike", back_populates="comment", cascade="all, delete-orphan")
-    reports = relationship("SpoilerReport", back_populates="comment", cascade="all, delete-orphan")
+    likes = relationship("CommentLike", back_populates="comment", cascade="all, delete-orphan", passive_deletes=True)
+    reports = relationship("SpoilerReport", back_populates="comment", cascade="all, delete-orphan", passive_deletes=True)
     parent = relationship("Comment", remote_side=[id], back_populates="replies")
     replies = relationship(
         "Comment",
         back_populates="parent",
         cascade="all, delete-orphan",
-        single_parent=True
+        single_parent=True,
+        passive_deletes=True
     )
 
     __table_args__ = (
@@ -48,8 +55,38 @@ class Comment(Base):
         CheckConstraint("progress_page >= 0", name="check_progress_page_positive"),
         CheckConstraint("progress_total_pages > 0", name="check_progress_total_pages_positive"),
         CheckConstraint("progress_page <= progress_total_pages", name="check_progress_page_not_exceeds_total"),
-        Index("idx_comments_progress", "book_id", "group_id", "progress_percentage"),
+        Index(
+            "idx_comments_progress", "book_id", "group_id", "progress_bp",
+            postgresql_where=text("deleted_at IS NULL AND hidden_at IS NULL")
+        ),
+        # Threaded view: keyset pages of top-level comments, then replies by parent
+        Index(
+            "idx_comments_thread_roots", "book_id", "group_id", "progress_bp", "created_at", "id",
+            postgresql_where=text("parent_comment_id IS NULL")
+        ),
+        Index("idx_comments_parent", "parent_comment_id", postgresql_where=text("parent_comment_id IS NOT NULL")),
+        # Full-text search on an expression, so no tsvector is stored in (or returned with) the row.
+        # Same predicate as idx_comments_progress, so Postgres can AND the two bitmaps
+        Index(
+            "idx_comments_search", text("to_tsvector('english', content)"),
+            postgresql_using="gin",
+            postgresql_where=text("deleted_at IS NULL AND hidden_at IS NULL")
+        ),
+        # Purge queue: only soft-deleted rows are indexed
+        Index("idx_comments_deleted", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
     )
+    # Read progress_bp back in the INSERT/UPDATE itself (RETURNING)
+    __mapper_args__ = {"eager_defaults": True}
+
+    @property
+    def is_removed(self) -> bool:
+        """Deleted by its author or hidden by spoiler reports; feeds show it only as a placeholder."""
+        return self.deleted_at is not None or self.hidden_at is not None
+
+    @property
+    def progress_percentage(self) -> float:
+        """Progress as a percentage with two decimals, as exposed by the API."""
+        return self.progress_bp / 100
 
     def __repr__(self):
         return f"<Comment id={self.id} progress={self.progress_percentage}%>"
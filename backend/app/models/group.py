@@ -19,12 +19,13 @@ class Group(Base):
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    # Relationships
+    # Relationships (passive_deletes: the ON DELETE CASCADE foreign keys remove
+    # children in the database instead of SQLAlchemy loading and deleting each)
     creator = relationship("User", back_populates="created_groups", foreign_keys=[created_by])
-    members = relationship("GroupMember", back_populates="group", cascade="all, delete-orphan")
-    books = relationship("GroupBook", back_populates="group", cascade="all, delete-orphan")
-    comments = relationship("Comment", back_populates="group", cascade="all, delete-orphan")
-    reading_progress = relationship("UserReadingProgress", back_populates="group", cascade="all, delete-orphan")
+    members = relationship("GroupMember", back_populates="group", cascade="all, delete-orphan", passive_deletes=True)
+    books = relationship("GroupBook", back_populates="group", cascade="all, delete-orphan", passive_deletes=True)
+    comments = relationship("Comment", back_populates="group", cascade="all, delete-orphan", passive_deletes=True)
+    reading_progress = relationship("UserReadingProgress", back_populates="group", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Group {self.name} ({self.invite_code})>"
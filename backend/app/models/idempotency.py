@@ -0,0 +1,25 @@
+"""Idempotency key model."""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import UUID
+from ..database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Response recorded for a client-supplied ``Idempotency-Key``.
+
+    Only used when ``IDEMPOTENCY_STORE=database``. A row without a status
+    code is a request still in progress.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(32), nullable=False)  # Hash of the request path and body
+    status_code = Column(Integer, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    expires_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<IdempotencyKey user_id={self.user_id} key={self.key}>"
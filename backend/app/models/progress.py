@@ -1,10 +1,9 @@
 """Reading progress model."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Numeric, CheckConstraint, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Computed, CheckConstraint, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from sqlalchemy import text
 from ..database import Base
 
 
@@ -19,11 +18,11 @@ class UserReadingProgress(Base):
     group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
     current_page = Column(Integer, nullable=False)
     total_pages = Column(Integer, nullable=False)
-    # Computed column: progress_percentage = (current_page / total_pages) * 100
-    progress_percentage = Column(
-        Numeric(5, 2),
-        nullable=False,
-        server_default=text("0.00")
+    # Progress in basis points (1/100 of a percent, 0-10000), generated by the database
+    progress_bp = Column(
+        Integer,
+        Computed("current_page * 10000 / total_pages", persisted=True),
+        nullable=False
     )
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
@@ -38,6 +37,13 @@ class UserReadingProgress(Base):
         CheckConstraint("current_page <= total_pages", name="check_current_page_not_exceeds_total"),
         UniqueConstraint("user_id", "book_id", "group_id", name="unique_user_book_group_progress"),
     )
+    # Read progress_bp back in the INSERT/UPDATE itself (RETURNING)
+    __mapper_args__ = {"eager_defaults": True}
+
+    @property
+    def progress_percentage(self) -> float:
+        """Percentage read (0-100, two decimals)."""
+        return self.progress_bp / 100
 
     def __repr__(self):
         return f"<UserReadingProgress user_id={self.user_id} book_id={self.book_id} progress={self.progress_percentage}%>"
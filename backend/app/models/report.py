@@ -1,9 +1,10 @@
 """Spoiler report model."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, DateTime, ForeignKey, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy import text
 from ..database import Base
 
 
@@ -14,6 +15,8 @@ class SpoilerReport(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     comment_id = Column(UUID(as_uuid=True), ForeignKey("comments.id", ondelete="CASCADE"), nullable=False)
+    # Copied from the comment so a group's moderation queue is one index range
+    group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
     reported_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     reason = Column(String, nullable=True)
     status = Column(String(20), default="pending", nullable=False)  # 'pending', 'resolved', 'dismissed'
@@ -25,6 +28,17 @@ class SpoilerReport(Base):
 
     __table_args__ = (
         CheckConstraint("status IN ('pending', 'resolved', 'dismissed')", name="check_status"),
+        # One live report per user and comment; dismissed ones don't stop a new report
+        Index(
+            "unique_comment_reporter", "comment_id", "reported_by",
+            unique=True,
+            postgresql_where=text("status <> 'dismissed'")
+        ),
+        # Moderation queue: only pending reports are indexed
+        Index(
+            "idx_spoiler_reports_pending", "group_id", "created_at", "id",
+            postgresql_where=text("status = 'pending'")
+        ),
     )
 
     def __repr__(self):
@@ -0,0 +1,44 @@
+"""Refresh token and session revocation models."""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from ..database import Base
+
+
+class RefreshToken(Base):
+    """
+    Issued refresh token.
+
+    Every login starts a session (``family_id``); each refresh rotates the
+    token within the family. Presenting an already-rotated token revokes
+    the whole family, after a few seconds' grace for concurrent refreshes.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)  # JWT "jti"
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    family_id = Column(UUID(as_uuid=True), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("idx_refresh_tokens_family", "family_id"),
+    )
+
+    def __repr__(self):
+        return f"<RefreshToken id={self.id} family_id={self.family_id}>"
+
+
+class RevokedSession(Base):
+    """Session (refresh token family) revoked by logout or token reuse."""
+
+    __tablename__ = "revoked_sessions"
+
+    family_id = Column(UUID(as_uuid=True), primary_key=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedSession family_id={self.family_id}>"
@@ -22,12 +22,12 @@ class User(Base):
     last_login = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
-    group_memberships = relationship("GroupMember", back_populates="user", cascade="all, delete-orphan")
-    created_groups = relationship("Group", back_populates="creator", foreign_keys="Group.created_by")
-    comments = relationship("Comment", back_populates="user", cascade="all, delete-orphan")
-    reading_progress = relationship("UserReadingProgress", back_populates="user", cascade="all, delete-orphan")
-    comment_likes = relationship("CommentLike", back_populates="user", cascade="all, delete-orphan")
-    spoiler_reports = relationship("SpoilerReport", back_populates="reporter", cascade="all, delete-orphan")
+    group_memberships = relationship("GroupMember", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    created_groups = relationship("Group", back_populates="creator", foreign_keys="Group.created_by", passive_deletes=True)
+    comments = relationship("Comment", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    reading_progress = relationship("UserReadingProgress", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    comment_likes = relationship("CommentLike", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    spoiler_reports = relationship("SpoilerReport", back_populates="reporter", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<User {self.name} ({self.email})>"
@@ -1,11 +1,14 @@
 """Authentication routes for email/password and Google OAuth."""
+from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from ..database import get_db
-from ..schemas.auth import EmailPasswordRegister, EmailPasswordLogin, GoogleAuthRequest, TokenResponse
+from ..schemas.auth import (
+    EmailPasswordRegister, EmailPasswordLogin, GoogleAuthRequest, RefreshTokenRequest, TokenResponse
+)
 from ..schemas.user import UserResponse
 from ..services.auth_service import AuthService
-from ..middleware.auth_middleware import get_current_user
+from ..middleware.auth_middleware import TokenUser, get_current_user, get_token_user
 from ..models.user import User
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -24,15 +27,15 @@ async def register(
         db: Database session
 
     Returns:
-        JWT access token and user information
+        JWT access and refresh tokens and user information
     """
-    user = AuthService.register_user(
+    user = await AuthService.register_user(
         db,
         email=user_data.email,
         password=user_data.password,
         name=user_data.name
     )
-    return AuthService.create_token_response(user)
+    return AuthService.create_token_response(db, user)
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -48,10 +51,10 @@ async def login(
         db: Database session
 
     Returns:
-        JWT access token and user information
+        JWT access and refresh tokens and user information
     """
-    user = AuthService.authenticate_user(db, credentials.email, credentials.password)
-    return AuthService.create_token_response(user)
+    user = await AuthService.authenticate_user(db, credentials.email, credentials.password)
+    return AuthService.create_token_response(db, user)
 
 
 @router.post("/google", response_model=TokenResponse)
@@ -67,9 +70,9 @@ async def google_auth(
         db: Database session
 
     Returns:
-        JWT access token and user information
+        JWT access and refresh tokens and user information
     """
-    return AuthService.authenticate_google_user(db, auth_request.token)
+    return await AuthService.authenticate_google_user(db, auth_request.token)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -89,34 +92,43 @@ async def get_current_user_info(
 
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_db)
+):
     """
-    Logout user (client-side should remove token).
+    Logout user by revoking the current session.
+
+    The session's refresh tokens stop working immediately and its access
+    tokens are rejected from then on (client-side should remove both tokens).
 
     Args:
         current_user: Current authenticated user
+        db: Database session
 
     Returns:
         Success message
     """
-    # JWT tokens are stateless, so logout is handled client-side
-    # This endpoint is mainly for consistent API and future enhancements
+    AuthService.revoke_session(db, UUID(current_user.session_id))
     return {"message": "Logged out successfully"}
 
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
-    current_user: User = Depends(get_current_user),
+    refresh_request: RefreshTokenRequest,
     db: Session = Depends(get_db)
 ):
     """
-    Refresh JWT token for current user.
+    Exchange a refresh token for a new access/refresh token pair.
+
+    The presented refresh token is invalidated (rotation); reusing it after
+    a short grace period revokes the whole session.
 
     Args:
-        current_user: Current authenticated user
+        refresh_request: Refresh token issued at login or by a previous refresh
         db: Database session
 
     Returns:
-        New JWT access token and user information
+        New JWT access and refresh tokens and user information
     """
-    return AuthService.create_token_response(current_user)
+    return AuthService.refresh_session(db, refresh_request.refresh_token)
@@ -1,6 +1,6 @@
 """Book management routes."""
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, status, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
 from ..database import get_db
@@ -10,21 +10,31 @@ from ..schemas.book import (
     GroupBookCreate,
     GroupBookResponse,
     BookCreate,
+    BookBatchCreate,
     UserProgressSnapshot
 )
 from ..services.book_service import BookService
-from ..middleware.auth_middleware import get_current_user
-from ..models.user import User
+from ..services.cover_service import CoverService
+from ..services.enrichment_service import EnrichmentService
+from ..middleware.auth_middleware import TokenUser, get_token_user
 from ..models.progress import UserReadingProgress
+from ..utils.covers import cover_id_from_url, THUMBNAIL_SIZE
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
 
+def _prefetch_cover(background_tasks: BackgroundTasks, book) -> None:
+    """Cache a book's cover thumbnail in the background so group pages don't wait on Open Library."""
+    cover_id = cover_id_from_url(book.cover_url)
+    if cover_id is not None:
+        background_tasks.add_task(CoverService.prefetch, cover_id, THUMBNAIL_SIZE)
+
+
 @router.get("/search", response_model=List[BookSearchResult])
 async def search_books(
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(10, ge=1, le=50, description="Maximum number of results"),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenUser = Depends(get_token_user)
 ):
     """
     Search for books using Open Library API.
@@ -43,20 +53,40 @@ async def search_books(
 @router.post("", response_model=BookResponse, status_code=status.HTTP_201_CREATED)
 async def create_book(
     book_data: BookCreate,
-    current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
     Create a new book record (idempotent on ISBN/Open Library ID).
     """
     book = BookService.create_book(db, book_data)
+    EnrichmentService.enqueue_if_needed(book)
+    _prefetch_cover(background_tasks, book)
     return BookResponse.from_orm(book)
 
 
+@router.post("/batch", response_model=List[BookResponse], status_code=status.HTTP_201_CREATED)
+async def create_books(
+    batch: BookBatchCreate,
+    background_tasks: BackgroundTasks,
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create several book records in one round trip (idempotent on ISBN/Open Library ID).
+    """
+    books = BookService.create_books(db, batch.books)
+    for book in books:
+        EnrichmentService.enqueue_if_needed(book)
+        _prefetch_cover(background_tasks, book)
+    return [BookResponse.from_orm(book) for book in books]
+
+
 @router.get("/{book_id}", response_model=BookResponse)
 async def get_book(
     book_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -70,7 +100,8 @@ async def get_book(
 async def add_book_to_group(
     group_id: UUID,
     book_data: GroupBookCreate,
-    current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -79,6 +110,7 @@ async def add_book_to_group(
     Args:
         group_id: Group UUID
         book_data: Book data (either existing book_id or new book info)
+        background_tasks: Background tasks (cover prefetch)
         current_user: Current authenticated user
         db: Database session
 
@@ -91,6 +123,8 @@ async def add_book_to_group(
         current_user.id,
         book_data
     )
+    EnrichmentService.enqueue_if_needed(group_book.book)
+    _prefetch_cover(background_tasks, group_book.book)
 
     # Create response with book details
     response = GroupBookResponse(
@@ -107,7 +141,7 @@ async def add_book_to_group(
 @router.get("/groups/{group_id}/books", response_model=List[GroupBookResponse])
 async def get_group_books(
     group_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -125,6 +159,7 @@ async def get_group_books(
 
     result = []
     for group_book in group_books:
+        EnrichmentService.enqueue_if_needed(group_book.book)
         progress = db.query(UserReadingProgress).filter(
             UserReadingProgress.user_id == current_user.id,
             UserReadingProgress.book_id == group_book.book_id,
@@ -1,78 +1,109 @@
 """Comment management routes with visibility filtering."""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 from ..database import get_db
 from ..schemas.comment import (
     CommentCreate,
-    CommentResponse,
     CommentWithUser,
     CommentUpdate,
-    CommentLikeResponse
+    CommentLikeState,
+    CommentThreadPage,
+    CommentSearchPage
 )
+from ..schemas.report import SpoilerReportAck, SpoilerReportCreate, SpoilerReportPage, SpoilerReportReview
+from ..models.comment import Comment
 from ..services.comment_service import CommentService
-from ..middleware.auth_middleware import get_current_user
-from ..models.user import User
+from ..services.idempotency_service import IdempotencyService
+from ..services.report_service import ReportService
+from ..middleware.auth_middleware import TokenUser, get_token_user
+from ..utils.serialization import FastJSONResponse, comment_payload
 
 router = APIRouter(prefix="/comments", tags=["Comments"])
 
 
+def _comment_payloads(db: Session, comments: List[Comment], user_id: UUID) -> List[dict]:
+    """
+    Build comment payloads with authors and like stats (one like query for all).
+
+    Authors must already be loaded; placeholders for removed comments
+    don't show theirs, so it is not loaded for them.
+    """
+    like_stats = CommentService.get_like_stats(db, [comment.id for comment in comments], user_id)
+    return [
+        comment_payload(comment, 0, False, "", None) if comment.is_removed else comment_payload(
+            comment,
+            *like_stats.get(comment.id, (0, False)),
+            comment.user.name,
+            comment.user.avatar_url
+        )
+        for comment in comments
+    ]
+
+
+def _comment_feed(db: Session, comments: List[Comment], user_id: UUID) -> FastJSONResponse:
+    """Serialize a list of comments with their authors and like stats."""
+    return FastJSONResponse(_comment_payloads(db, comments, user_id))
+
+
 @router.post("/groups/{group_id}/comments", response_model=CommentWithUser, status_code=status.HTTP_201_CREATED)
 async def create_comment(
     group_id: UUID,
     comment_data: CommentCreate,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
     Create a new comment in a group.
+    A retry with the same ``Idempotency-Key`` header returns the original comment.
 
     Args:
         group_id: Group UUID
         comment_data: Comment creation data
+        request: Incoming request
+        response: Response carrying headers set by dependencies
+        idempotency_key: Client-chosen key identifying this comment across retries
         current_user: Current authenticated user
         db: Database session
 
     Returns:
         Created comment with user information
     """
-    comment = CommentService.create_comment(
-        db,
-        group_id,
-        current_user.id,
-        comment_data
-    )
-
-    # Get like count and user liked status
-    like_count = CommentService.get_comment_like_count(db, comment.id)
-    user_has_liked = CommentService.user_has_liked_comment(db, comment.id, current_user.id)
-
-    # Create response with user info
-    response = CommentWithUser(
-        id=comment.id,
-        group_id=comment.group_id,
-        book_id=comment.book_id,
-        user_id=comment.user_id,
-        content=comment.content,
-        progress_page=comment.progress_page,
-        progress_total_pages=comment.progress_total_pages,
-        progress_percentage=comment.progress_percentage,
-        parent_comment_id=comment.parent_comment_id,
-        created_at=comment.created_at,
-        like_count=like_count,
-        user_has_liked=user_has_liked,
-        user_name=current_user.name,
-        user_avatar_url=current_user.avatar_url
+    fingerprint = IdempotencyService.fingerprint(request.url.path, comment_data.model_dump_json())
+    replay = await IdempotencyService.begin(current_user.id, idempotency_key, fingerprint, response.headers)
+    if replay is not None:
+        return replay
+
+    try:
+        comment = CommentService.create_comment(
+            db,
+            group_id,
+            current_user.id,
+            comment_data
+        )
+    except Exception:
+        await IdempotencyService.abandon(current_user.id, idempotency_key)
+        raise
+
+    # A new comment has no likes yet
+    result = FastJSONResponse(
+        comment_payload(comment, 0, False, current_user.name, current_user.avatar_url),
+        status_code=status.HTTP_201_CREATED,
+        headers=response.headers
     )
-    return response
+    await IdempotencyService.finish(current_user.id, idempotency_key, result)
+    return result
 
 
 @router.get("/groups/{group_id}/books/{book_id}/comments", response_model=List[CommentWithUser])
 async def get_book_comments(
     group_id: UUID,
     book_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -95,37 +126,14 @@ async def get_book_comments(
         current_user.id
     )
 
-    result = []
-    for comment in comments:
-        like_count = CommentService.get_comment_like_count(db, comment.id)
-        user_has_liked = CommentService.user_has_liked_comment(db, comment.id, current_user.id)
-
-        response = CommentWithUser(
-            id=comment.id,
-            group_id=comment.group_id,
-            book_id=comment.book_id,
-            user_id=comment.user_id,
-            content=comment.content,
-            progress_page=comment.progress_page,
-            progress_total_pages=comment.progress_total_pages,
-            progress_percentage=comment.progress_percentage,
-            parent_comment_id=comment.parent_comment_id,
-            created_at=comment.created_at,
-            like_count=like_count,
-            user_has_liked=user_has_liked,
-            user_name=comment.user.name,
-            user_avatar_url=comment.user.avatar_url
-        )
-        result.append(response)
-
-    return result
+    return _comment_feed(db, comments, current_user.id)
 
 
 @router.get("/groups/{group_id}/books/{book_id}/comments/ahead", response_model=List[CommentWithUser])
 async def get_book_comments_ahead(
     group_id: UUID,
     book_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -138,36 +146,103 @@ async def get_book_comments_ahead(
         current_user.id
     )
 
-    result = []
-    for comment in comments:
-        like_count = CommentService.get_comment_like_count(db, comment.id)
-        user_has_liked = CommentService.user_has_liked_comment(db, comment.id, current_user.id)
-
-        response = CommentWithUser(
-          id=comment.id,
-          group_id=comment.group_id,
-          book_id=comment.book_id,
-          user_id=comment.user_id,
-          content=comment.content,
-          progress_page=comment.progress_page,
-          progress_total_pages=comment.progress_total_pages,
-          progress_percentage=comment.progress_percentage,
-          parent_comment_id=comment.parent_comment_id,
-          created_at=comment.created_at,
-          like_count=like_count,
-          user_has_liked=user_has_liked,
-          user_name=comment.user.name,
-          user_avatar_url=comment.user.avatar_url
+    return _comment_feed(db, comments, current_user.id)
+
+
+@router.get("/groups/{group_id}/books/{book_id}/comments/search", response_model=CommentSearchPage)
+async def search_book_comments(
+    group_id: UUID,
+    book_id: UUID,
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    limit: int = Query(20, ge=1, le=50, description="Maximum number of results"),
+    offset: int = Query(0, ge=0, description="next_offset from the previous page"),
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Search the comments visible to the user, best matches first.
+
+    Args:
+        group_id: Group UUID
+        book_id: Book UUID
+        q: Search text; supports "quoted phrases", OR and -excluded words
+        limit: Maximum number of results (1-50)
+        offset: Results to skip
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Page of matching comments with the next offset
+    """
+    comments = CommentService.search_comments(
+        db,
+        group_id,
+        book_id,
+        current_user.id,
+        q,
+        limit,
+        offset
+    )
+
+    return FastJSONResponse({
+        "comments": _comment_payloads(db, comments, current_user.id),
+        "next_offset": offset + limit if len(comments) == limit else None,
+    })
+
+
+@router.get("/groups/{group_id}/books/{book_id}/threads", response_model=CommentThreadPage)
+async def get_book_threads(
+    group_id: UUID,
+    book_id: UUID,
+    limit: int = Query(20, ge=1, le=50, description="Maximum number of top-level threads"),
+    after: Optional[UUID] = Query(None, description="next_after from the previous page"),
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get visible comments as threads: a page of top-level comments with all
+    their visible replies, each parent before its replies.
+
+    Args:
+        group_id: Group UUID
+        book_id: Book UUID
+        limit: Maximum number of top-level threads (1-50)
+        after: Last top-level comment of the previous page
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Page of threaded comments with reply counts and the next cursor
+    """
+    threads, next_after = CommentService.get_visible_threads(
+        db,
+        group_id,
+        book_id,
+        current_user.id,
+        limit,
+        after
+    )
+
+    like_stats = CommentService.get_like_stats(db, [comment.id for comment, _, _ in threads], current_user.id)
+    comments = []
+    for comment, depth, reply_count in threads:
+        payload = comment_payload(
+            comment,
+            *like_stats.get(comment.id, (0, False)),
+            comment.user.name,
+            comment.user.avatar_url
         )
-        result.append(response)
+        payload["depth"] = depth
+        payload["reply_count"] = reply_count
+        comments.append(payload)
 
-    return result
+    return FastJSONResponse({"comments": comments, "next_after": next_after})
 
 
 @router.get("/{comment_id}", response_model=CommentWithUser)
 async def get_comment(
     comment_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -183,33 +258,19 @@ async def get_comment(
     """
     comment = CommentService.get_comment_by_id(db, comment_id, current_user.id)
 
-    like_count = CommentService.get_comment_like_count(db, comment.id)
-    user_has_liked = CommentService.user_has_liked_comment(db, comment.id, current_user.id)
-
-    response = CommentWithUser(
-        id=comment.id,
-        group_id=comment.group_id,
-        book_id=comment.book_id,
-        user_id=comment.user_id,
-        content=comment.content,
-        progress_page=comment.progress_page,
-        progress_total_pages=comment.progress_total_pages,
-        progress_percentage=comment.progress_percentage,
-        parent_comment_id=comment.parent_comment_id,
-        created_at=comment.created_at,
-        like_count=like_count,
-        user_has_liked=user_has_liked,
-        user_name=comment.user.name,
-        user_avatar_url=comment.user.avatar_url
+    like_stats = CommentService.get_like_stats(db, [comment.id], current_user.id)
+    like_count, user_has_liked = like_stats.get(comment.id, (0, False))
+    return FastJSONResponse(
+        comment_payload(comment, like_count, user_has_liked, comment.user.name, comment.user.avatar_url)
     )
-    return response
 
 
 @router.put("/{comment_id}", response_model=CommentWithUser)
 async def update_comment(
     comment_id: UUID,
     comment_data: CommentUpdate,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -218,6 +279,7 @@ async def update_comment(
     Args:
         comment_id: Comment UUID
         comment_data: Comment update data
+        response: Response carrying headers set by dependencies
         current_user: Current authenticated user
         db: Database session
 
@@ -231,32 +293,18 @@ async def update_comment(
         comment_data
     )
 
-    like_count = CommentService.get_comment_like_count(db, comment.id)
-    user_has_liked = CommentService.user_has_liked_comment(db, comment.id, current_user.id)
-
-    response = CommentWithUser(
-        id=comment.id,
-        group_id=comment.group_id,
-        book_id=comment.book_id,
-        user_id=comment.user_id,
-        content=comment.content,
-        progress_page=comment.progress_page,
-        progress_total_pages=comment.progress_total_pages,
-        progress_percentage=comment.progress_percentage,
-        parent_comment_id=comment.parent_comment_id,
-        created_at=comment.created_at,
-        like_count=like_count,
-        user_has_liked=user_has_liked,
-        user_name=current_user.name,
-        user_avatar_url=current_user.avatar_url
+    like_stats = CommentService.get_like_stats(db, [comment.id], current_user.id)
+    like_count, user_has_liked = like_stats.get(comment.id, (0, False))
+    return FastJSONResponse(
+        comment_payload(comment, like_count, user_has_liked, current_user.name, current_user.avatar_url),
+        headers=response.headers
     )
-    return response
 
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_comment(
     comment_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -270,54 +318,158 @@ async def delete_comment(
     CommentService.delete_comment(db, comment_id, current_user.id)
 
 
-@router.post("/{comment_id}/like", response_model=CommentLikeResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/{comment_id}/like", response_model=CommentLikeState)
 async def like_comment(
     comment_id: UUID,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
-    Like a comment.
+    Like a comment (idempotent).
 
     Args:
         comment_id: Comment UUID
+        response: Response carrying headers set by dependencies
         current_user: Current authenticated user
         db: Database session
 
     Returns:
-        Created comment like
+        The comment's like count and the user's liked state
     """
-    like = CommentService.like_comment(db, comment_id, current_user.id)
-    return CommentLikeResponse.from_orm(like)
+    like_count, user_has_liked = CommentService.like_comment(db, comment_id, current_user.id)
+    return FastJSONResponse(
+        {"comment_id": comment_id, "like_count": like_count, "user_has_liked": user_has_liked},
+        headers=response.headers
+    )
 
 
-@router.delete("/{comment_id}/like", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{comment_id}/like", response_model=CommentLikeState)
 async def unlike_comment(
     comment_id: UUID,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
-    Remove like from a comment.
+    Remove like from a comment (idempotent).
 
     Args:
         comment_id: Comment UUID
+        response: Response carrying headers set by dependencies
         current_user: Current authenticated user
         db: Database session
+
+    Returns:
+        The comment's like count and the user's liked state
     """
-    CommentService.unlike_comment(db, comment_id, current_user.id)
+    like_count, user_has_liked = CommentService.unlike_comment(db, comment_id, current_user.id)
+    return FastJSONResponse(
+        {"comment_id": comment_id, "like_count": like_count, "user_has_liked": user_has_liked},
+        headers=response.headers
+    )
 
 
-@router.post("/{comment_id}/report", status_code=status.HTTP_202_ACCEPTED)
+@router.post("/{comment_id}/report", response_model=SpoilerReportAck, status_code=status.HTTP_202_ACCEPTED)
 async def report_comment(
     comment_id: UUID,
-    reason: str = Body(..., embed=True, min_length=1),
-    current_user: User = Depends(get_current_user),
+    report_data: SpoilerReportCreate,
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
-    Report a comment for review. For now this just acknowledges the report.
+    Report a comment as a spoiler for the group admins to review.
+    Repeated reports by the same user are acknowledged but not counted again.
+
+    Args:
+        comment_id: Comment UUID
+        report_data: Report reason
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Acknowledgement with the comment's report count and hidden state
+    """
+    report_count, hidden = ReportService.report_comment(
+        db,
+        comment_id,
+        current_user.id,
+        report_data.reason
+    )
+    return {
+        "message": "Report received",
+        "comment_id": comment_id,
+        "reason": report_data.reason,
+        "report_count": report_count,
+        "hidden": hidden,
+    }
+
+
+@router.get("/groups/{group_id}/reports", response_model=SpoilerReportPage)
+async def get_moderation_queue(
+    group_id: UUID,
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of reports"),
+    after: Optional[UUID] = Query(None, description="next_after from the previous page"),
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a group's pending spoiler reports, oldest first (group admins only).
+
+    Args:
+        group_id: Group UUID
+        limit: Maximum number of reports (1-100)
+        after: Last report of the previous page
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Page of pending reports with the reported comments and the next cursor
+    """
+    rows, next_after = ReportService.get_moderation_queue(
+        db,
+        group_id,
+        current_user.id,
+        limit,
+        after
+    )
+
+    return {
+        "reports": [
+            {
+                "id": report.id,
+                "comment_id": report.comment_id,
+                "group_id": report.group_id,
+                "reported_by": report.reported_by,
+                "reason": report.reason,
+                "status": report.status,
+                "created_at": report.created_at,
+                "comment_content": comment.content,
+                "comment_progress_percentage": comment.progress_percentage,
+                "comment_report_count": comment.report_count,
+                "comment_hidden": comment.hidden_at is not None,
+            }
+            for report, comment in rows
+        ],
+        "next_after": next_after,
+    }
+
+
+@router.put("/reports/{report_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def review_report(
+    report_id: UUID,
+    review: SpoilerReportReview,
+    current_user: TokenUser = Depends(get_token_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Resolve (keep hidden) or dismiss (restore) a reported comment, closing
+    all of its pending reports (group admins only).
+
+    Args:
+        report_id: Any pending report of the comment
+        review: Moderator's decision
+        current_user: Current authenticated user
+        db: Database session
     """
-    # Reuse visibility check to ensure user can see the comment
-    CommentService.get_comment_by_id(db, comment_id, current_user.id)
-    return {"message": "Report received", "comment_id": comment_id, "reason": reason}
+    ReportService.review_report(db, report_id, current_user.id, review.status)
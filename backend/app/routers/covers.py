@@ -0,0 +1,49 @@
+"""Cover image proxy routes."""
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Path, status
+from fastapi.responses import FileResponse, Response
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..services.cover_service import CoverService
+
+router = APIRouter(prefix="/covers", tags=["Covers"])
+
+# URLs are keyed by Open Library cover ID, not content, so browsers revalidate
+# daily with the content-hash ETag instead of treating the image as immutable
+COVER_CACHE_CONTROL = "public, max-age=86400"
+
+
+@router.get("/{cover_id}/{size}")
+async def get_cover(
+    cover_id: int,
+    size: str = Path(..., pattern="^[SML]$", description="Cover size (S, M or L)"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Serve an Open Library cover from the local cache.
+
+    The image is fetched from Open Library on first use, and only for cover
+    IDs that a stored book uses. No authentication is required so the URL
+    can be used directly in <img> tags.
+
+    Args:
+        cover_id: Open Library cover ID
+        size: Cover size
+        if_none_match: ETag sent by the browser for revalidation
+        db: Database session
+
+    Returns:
+        The cover image, or 304 if the browser copy is current
+    """
+    cover = await CoverService.get_cover(cover_id, size, db)
+
+    headers = {
+        "Cache-Control": COVER_CACHE_CONTROL,
+        "ETag": f'"{cover.digest[:32]}"',
+    }
+    if if_none_match and headers["ETag"] in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Opened and streamed by the response itself, straight from the blob
+    return FileResponse(cover.path, media_type="image/jpeg", headers=headers, stat_result=cover.stat)
@@ -1,6 +1,6 @@
 """Group management routes."""
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 from ..database import get_db
@@ -14,8 +14,8 @@ from ..schemas.group import (
 from ..schemas.book import GroupBookCreate, GroupBookResponse, BookResponse, UserProgressSnapshot
 from ..services.group_service import GroupService
 from ..services.book_service import BookService
-from ..middleware.auth_middleware import get_current_user
-from ..models.user import User
+from ..services.enrichment_service import EnrichmentService
+from ..middleware.auth_middleware import TokenUser, get_token_user
 from ..models.group import GroupMember
 from ..models.progress import UserReadingProgress
 
@@ -25,7 +25,7 @@ router = APIRouter(prefix="/groups", tags=["Groups"])
 @router.post("", response_model=GroupResponse, status_code=status.HTTP_201_CREATED)
 async def create_group(
     group_data: GroupCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -69,7 +69,7 @@ async def create_group(
 
 @router.get("", response_model=List[GroupResponse])
 async def get_my_groups(
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -117,7 +117,7 @@ async def get_my_groups(
 @router.get("/{group_id}", response_model=GroupResponse)
 async def get_group(
     group_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -163,11 +163,12 @@ async def get_group(
 async def add_book_to_group(
     group_id: UUID,
     book_data: GroupBookCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """Add a book to a group (alias for books router, keeps /groups path consistent)."""
     group_book = BookService.add_book_to_group(db, group_id, current_user.id, book_data)
+    EnrichmentService.enqueue_if_needed(group_book.book)
     return GroupBookResponse(
         id=group_book.id,
         group_id=group_book.group_id,
@@ -181,7 +182,7 @@ async def add_book_to_group(
 @router.get("/{group_id}/books", response_model=List[GroupBookResponse])
 async def get_group_books(
     group_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """List books for a group (alias for books router, keeps /groups path consistent)."""
@@ -189,6 +190,7 @@ async def get_group_books(
 
     result = []
     for group_book in group_books:
+        EnrichmentService.enqueue_if_needed(group_book.book)
         progress = db.query(UserReadingProgress).filter(
             UserReadingProgress.user_id == current_user.id,
             UserReadingProgress.book_id == group_book.book_id,
@@ -217,7 +219,7 @@ async def get_group_books(
 async def update_group(
     group_id: UUID,
     group_data: GroupUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -263,7 +265,7 @@ async def update_group(
 @router.delete("/{group_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_group(
     group_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -280,7 +282,7 @@ async def delete_group(
 @router.post("/join", response_model=GroupResponse)
 async def join_group(
     join_request: GroupJoinRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -325,7 +327,7 @@ async def join_group(
 @router.post("/{group_id}/leave", status_code=status.HTTP_204_NO_CONTENT)
 async def leave_group(
     group_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -342,7 +344,7 @@ async def leave_group(
 @router.get("/{group_id}/members", response_model=List[GroupMemberResponse])
 async def get_group_members(
     group_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -378,7 +380,7 @@ async def get_group_members(
 async def remove_member(
     group_id: UUID,
     member_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -397,7 +399,7 @@ async def remove_member(
 async def promote_member(
     group_id: UUID,
     member_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -1,6 +1,6 @@
 """Reading progress management routes."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
 from ..database import get_db
@@ -10,9 +10,10 @@ from ..schemas.progress import (
     ProgressUpdate,
     ProgressWithBook
 )
+from ..services.idempotency_service import IdempotencyService
 from ..services.progress_service import ProgressService
-from ..middleware.auth_middleware import get_current_user
-from ..models.user import User
+from ..middleware.auth_middleware import TokenUser, get_token_user
+from ..utils.serialization import FastJSONResponse, progress_payload, progress_with_book_payload
 
 router = APIRouter(prefix="/progress", tags=["Reading Progress"])
 
@@ -20,32 +21,55 @@ router = APIRouter(prefix="/progress", tags=["Reading Progress"])
 @router.post("", response_model=ProgressResponse, status_code=status.HTTP_201_CREATED)
 async def create_or_update_progress(
     progress_data: ProgressCreate,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
     Create or update reading progress for a book in a group.
+    A retry with the same ``Idempotency-Key`` header returns the original response.
 
     Args:
         progress_data: Progress data
+        request: Incoming request
+        response: Response carrying headers set by dependencies
+        idempotency_key: Client-chosen key identifying this update across retries
         current_user: Current authenticated user
         db: Database session
 
     Returns:
         Created or updated progress
     """
-    progress = ProgressService.create_or_update_progress(
-        db,
-        current_user.id,
-        progress_data
+    fingerprint = IdempotencyService.fingerprint(request.url.path, progress_data.model_dump_json())
+    replay = await IdempotencyService.begin(current_user.id, idempotency_key, fingerprint, response.headers)
+    if replay is not None:
+        return replay
+
+    try:
+        progress = ProgressService.create_or_update_progress(
+            db,
+            current_user.id,
+            progress_data
+        )
+    except Exception:
+        await IdempotencyService.abandon(current_user.id, idempotency_key)
+        raise
+
+    result = FastJSONResponse(
+        progress_payload(progress),
+        status_code=status.HTTP_201_CREATED,
+        headers=response.headers
     )
-    return ProgressResponse.from_orm(progress)
+    await IdempotencyService.finish(current_user.id, idempotency_key, result)
+    return result
 
 
 @router.get("", response_model=List[ProgressWithBook])
 async def get_my_progress(
     group_id: Optional[UUID] = Query(None, description="Filter by group ID"),
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -65,31 +89,14 @@ async def get_my_progress(
         group_id
     )
 
-    result = []
-    for progress in progress_list:
-        response = ProgressWithBook(
-            id=progress.id,
-            user_id=progress.user_id,
-            book_id=progress.book_id,
-            group_id=progress.group_id,
-            current_page=progress.current_page,
-            total_pages=progress.total_pages,
-            progress_percentage=progress.progress_percentage,
-            updated_at=progress.updated_at,
-            book_title=progress.book.title,
-            book_author=progress.book.author,
-            book_cover_url=progress.book.cover_url
-        )
-        result.append(response)
-
-    return result
+    return FastJSONResponse([progress_with_book_payload(progress) for progress in progress_list])
 
 
 @router.get("/groups/{group_id}/books/{book_id}", response_model=ProgressResponse)
 async def get_user_book_progress(
     group_id: UUID,
     book_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -117,14 +124,14 @@ async def get_user_book_progress(
             detail="Progress not found for this book"
         )
 
-    return ProgressResponse.from_orm(progress)
+    return FastJSONResponse(progress_payload(progress))
 
 
 @router.get("/groups/{group_id}/books/{book_id}/all", response_model=List[ProgressResponse])
 async def get_group_book_progress(
     group_id: UUID,
     book_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -146,14 +153,15 @@ async def get_group_book_progress(
         current_user.id
     )
 
-    return [ProgressResponse.from_orm(p) for p in progress_list]
+    return FastJSONResponse([progress_payload(progress) for progress in progress_list])
 
 
 @router.put("/{progress_id}", response_model=ProgressResponse)
 async def update_progress(
     progress_id: UUID,
     progress_data: ProgressUpdate,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -162,6 +170,7 @@ async def update_progress(
     Args:
         progress_id: Progress UUID
         progress_data: Progress update data
+        response: Response carrying headers set by dependencies
         current_user: Current authenticated user
         db: Database session
 
@@ -174,13 +183,13 @@ async def update_progress(
         current_user.id,
         progress_data
     )
-    return ProgressResponse.from_orm(progress)
+    return FastJSONResponse(progress_payload(progress), headers=response.headers)
 
 
 @router.delete("/{progress_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_progress(
     progress_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from uuid import UUID
 from ..database import get_db
 from ..schemas.user import UserResponse, UserUpdate, UserPublic
-from ..middleware.auth_middleware import get_current_user
+from ..middleware.auth_middleware import TokenUser, get_current_user, get_token_user
 from ..models.user import User
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -49,14 +49,13 @@ async def update_my_profile(
         current_user.avatar_url = user_data.avatar_url
 
     db.commit()
-    db.refresh(current_user)
     return UserResponse.from_orm(current_user)
 
 
 @router.get("/{user_id}", response_model=UserPublic)
 async def get_user_by_id(
     user_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_token_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -2,7 +2,24 @@
 from .user import UserCreate, UserResponse, UserUpdate, UserPublic
 from .group import GroupCreate, GroupResponse, GroupUpdate, GroupMemberResponse, GroupJoinRequest
 from .book import BookCreate, BookResponse, BookSearchResult, GroupBookCreate, GroupBookResponse
-from .comment import CommentCreate, CommentResponse, CommentWithUser, CommentUpdate, CommentLikeResponse
+from .comment import (
+    CommentCreate,
+    CommentResponse,
+    CommentWithUser,
+    CommentUpdate,
+    CommentLikeResponse,
+    CommentLikeState,
+    CommentThreadItem,
+    CommentThreadPage,
+    CommentSearchPage
+)
+from .report import (
+    SpoilerReportCreate,
+    SpoilerReportAck,
+    SpoilerReportResponse,
+    SpoilerReportPage,
+    SpoilerReportReview
+)
 from .progress import ProgressCreate, ProgressResponse, ProgressUpdate, ProgressWithBook
 from .auth import TokenResponse, GoogleAuthRequest, GoogleUserInfo
 
@@ -26,6 +43,15 @@ __all__ = [
     "CommentWithUser",
     "CommentUpdate",
     "CommentLikeResponse",
+    "CommentLikeState",
+    "CommentThreadItem",
+    "CommentThreadPage",
+    "CommentSearchPage",
+    "SpoilerReportCreate",
+    "SpoilerReportAck",
+    "SpoilerReportResponse",
+    "SpoilerReportPage",
+    "SpoilerReportReview",
     "ProgressCreate",
     "ProgressResponse",
     "ProgressUpdate",
@@ -6,10 +6,17 @@ from .user import UserResponse
 class TokenResponse(BaseModel):
     """Schema for token response."""
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
+    expires_in: int = Field(..., description="Access token lifetime in seconds")
     user: UserResponse
 
 
+class RefreshTokenRequest(BaseModel):
+    """Schema for exchanging a refresh token."""
+    refresh_token: str
+
+
 class EmailPasswordRegister(BaseModel):
     """Schema for email/password registration."""
     email: EmailStr
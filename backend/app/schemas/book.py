@@ -1,8 +1,7 @@
 """Book schemas for request/response validation."""
 from datetime import datetime
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 from uuid import UUID
-from decimal import Decimal
 from pydantic import BaseModel, Field
 
 
@@ -19,12 +18,21 @@ class BookCreate(BookBase):
     cover_url: Optional[str] = None
 
 
+class BookBatchCreate(BaseModel):
+    """Schema for creating several books at once (e.g. from search results)."""
+    books: List[BookCreate] = Field(..., min_length=1, max_length=50)
+
+
 class BookResponse(BookBase):
     """Schema for book response."""
     id: UUID
     isbn: Optional[str] = None
     open_library_id: Optional[str] = None
     cover_url: Optional[str] = None
+    cover_thumbnail_url: Optional[str] = None  # Cached copy served by /covers
+    page_count: Optional[int] = None
+    edition_count: Optional[int] = None
+    subjects: Optional[List[str]] = None
     created_at: datetime
 
     class Config:
@@ -56,7 +64,7 @@ class UserProgressSnapshot(BaseModel):
     """Minimal progress snapshot embedded in group book responses."""
     current_page: int
     total_pages: int
-    progress_percentage: Decimal
+    progress_percentage: float
 
     class Config:
         from_attributes = True
@@ -1,9 +1,9 @@
 """Comment schemas for request/response validation."""
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
-from decimal import Decimal
 from pydantic import BaseModel, Field
+from .progress import MAX_PAGES
 
 
 class CommentBase(BaseModel):
@@ -14,8 +14,9 @@ class CommentBase(BaseModel):
 class CommentCreate(CommentBase):
     """Schema for creating a new comment."""
     book_id: UUID
-    progress_page: int = Field(..., ge=0)
-    progress_total_pages: int = Field(..., gt=0)
+    progress_page: int = Field(..., ge=0, le=MAX_PAGES)
+    # Defaults to the user's progress total, then the book's enriched page count
+    progress_total_pages: Optional[int] = Field(None, gt=0, le=MAX_PAGES)
     parent_comment_id: Optional[UUID] = None
 
 
@@ -35,19 +36,28 @@ class CommentLikeResponse(BaseModel):
         from_attributes = True
 
 
+class CommentLikeState(BaseModel):
+    """Schema for a comment's likes after a like or unlike."""
+    comment_id: UUID
+    like_count: int
+    user_has_liked: bool
+
+
 class CommentResponse(CommentBase):
     """Schema for comment response."""
     id: UUID
     group_id: UUID
     book_id: UUID
-    user_id: UUID
+    user_id: Optional[UUID] = None  # None on deleted/hidden placeholders
     progress_page: int
     progress_total_pages: int
-    progress_percentage: Decimal
+    progress_percentage: float
     parent_comment_id: Optional[UUID] = None
     created_at: datetime
     like_count: Optional[int] = None
     user_has_liked: Optional[bool] = None
+    deleted: bool = False  # Placeholder for a deleted comment that still has replies
+    hidden: bool = False  # Placeholder for a comment hidden by spoiler reports
 
     class Config:
         from_attributes = True
@@ -60,3 +70,21 @@ class CommentWithUser(CommentResponse):
 
     class Config:
         from_attributes = True
+
+
+class CommentThreadItem(CommentWithUser):
+    """Schema for a comment in a threaded view."""
+    depth: int  # 0 for top-level comments
+    reply_count: int  # Direct replies visible to the viewer
+
+
+class CommentSearchPage(BaseModel):
+    """Schema for a page of search results, best match first."""
+    comments: List[CommentWithUser]
+    next_offset: Optional[int] = None  # Pass as ``offset`` for the next page
+
+
+class CommentThreadPage(BaseModel):
+    """Schema for a page of top-level threads, each parent listed before its replies."""
+    comments: List[CommentThreadItem]
+    next_after: Optional[UUID] = None  # Pass as ``after`` for the next page
@@ -2,25 +2,31 @@
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
-from decimal import Decimal
 from pydantic import BaseModel, Field
 
+# Progress is stored as page * 10000 / total in an int4 column, so pages
+# above ~214,748 would overflow; reject them here with a 422 instead
+MAX_PAGES = 200_000
+
 
 class ProgressBase(BaseModel):
     """Base progress schema."""
-    current_page: int = Field(..., ge=0)
-    total_pages: int = Field(..., gt=0)
+    current_page: int = Field(..., ge=0, le=MAX_PAGES)
+    total_pages: int = Field(..., gt=0, le=MAX_PAGES)
 
 
 class ProgressCreate(ProgressBase):
     """Schema for creating reading progress."""
     book_id: UUID
     group_id: UUID
+    # Defaults to the book's enriched page count when omitted
+    total_pages: Optional[int] = Field(None, gt=0, le=MAX_PAGES)
 
 
 class ProgressUpdate(ProgressBase):
     """Schema for updating reading progress."""
-    pass
+    # Defaults to the progress entry's current total when omitted
+    total_pages: Optional[int] = Field(None, gt=0, le=MAX_PAGES)
 
 
 class ProgressResponse(ProgressBase):
@@ -29,7 +35,7 @@ class ProgressResponse(ProgressBase):
     user_id: UUID
     book_id: UUID
     group_id: UUID
-    progress_percentage: Decimal
+    progress_percentage: float
     updated_at: datetime
 
     class Config:
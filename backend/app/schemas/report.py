@@ -0,0 +1,48 @@
+"""Spoiler report schemas for request/response validation."""
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+class SpoilerReportCreate(BaseModel):
+    """Schema for reporting a comment."""
+    reason: str = Field(..., min_length=1, max_length=1000)
+
+
+class SpoilerReportAck(BaseModel):
+    """Schema for the reporter's acknowledgement."""
+    message: str
+    comment_id: UUID
+    reason: str
+    report_count: int  # Reports the comment has received, this one included
+    hidden: bool  # Whether the comment is now hidden from feeds
+
+
+class SpoilerReportResponse(BaseModel):
+    """Schema for a report in the moderation queue."""
+    id: UUID
+    comment_id: UUID
+    group_id: UUID
+    reported_by: UUID
+    reason: Optional[str] = None
+    status: str  # 'pending', 'resolved' or 'dismissed'
+    created_at: datetime
+    comment_content: str
+    comment_progress_percentage: float
+    comment_report_count: int
+    comment_hidden: bool
+
+    class Config:
+        from_attributes = True
+
+
+class SpoilerReportPage(BaseModel):
+    """Schema for a page of the moderation queue, oldest report first."""
+    reports: List[SpoilerReportResponse]
+    next_after: Optional[UUID] = None  # Pass as ``after`` for the next page
+
+
+class SpoilerReportReview(BaseModel):
+    """Schema for a moderator's decision on a reported comment."""
+    status: str = Field(..., pattern="^(resolved|dismissed)$")  # 'resolved' keeps it hidden, 'dismissed' restores it
@@ -1,41 +1,31 @@
 """Authentication service for email/password and Google OAuth."""
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from ..config import get_settings
 from ..models.user import User
+from ..models.session import RefreshToken, RevokedSession
 from ..schemas.auth import GoogleUserInfo, TokenResponse
 from ..schemas.user import UserResponse
-from ..utils.security import create_access_token
+from ..utils.security import create_access_token, verify_token
+from ..utils.google_jwks import JWKSCache
+from ..utils.revocation import RevocationList
+from .password_service import PasswordService
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+google_jwks = JWKSCache(settings.google_certs_url)
+revoked_sessions = RevocationList(settings.revocation_filter_capacity, settings.revocation_sync_seconds)
 
 
 class AuthService:
     """Service for handling authentication operations."""
 
     @staticmethod
-    def hash_password(password: str) -> str:
-        """Hash a password. Truncates to 72 bytes for bcrypt compatibility."""
-        # Bcrypt has a 72-byte limit, so truncate if necessary
-        password_bytes = password.encode('utf-8')[:72]
-        truncated_password = password_bytes.decode('utf-8', errors='ignore')
-        return pwd_context.hash(truncated_password)
-
-    @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash. Truncates to 72 bytes for bcrypt compatibility."""
-        # Bcrypt has a 72-byte limit, so truncate if necessary
-        password_bytes = plain_password.encode('utf-8')[:72]
-        return pwd_context.verify(password_bytes, hashed_password)
-
-    @staticmethod
-    def register_user(db: Session, email: str, password: str, name: str) -> User:
+    async def register_user(db: Session, email: str, password: str, name: str) -> User:
         """
         Register a new user with email and password.
 
@@ -49,7 +39,7 @@ class AuthService:
             Created user
 
         Raises:
-            HTTPException: If email already exists
+            HTTPException: If email already exists, or 429 if the hash queue is full
         """
         # Check if user exists
         existing_user = db.query(User).filter(User.email == email).first()
@@ -63,19 +53,21 @@ class AuthService:
         user = User(
             email=email,
             name=name,
-            password_hash=AuthService.hash_password(password),
+            password_hash=await PasswordService.hash_password(password),
             last_login=datetime.utcnow()
         )
         db.add(user)
         db.commit()
-        db.refresh(user)
         return user
 
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> User:
+    async def authenticate_user(db: Session, email: str, password: str) -> User:
         """
         Authenticate user with email and password.
 
+        Outdated password hashes (old scheme or bcrypt cost) are transparently
+        replaced on a successful login.
+
         Args:
             db: Database session
             email: User email
@@ -85,7 +77,7 @@ class AuthService:
             Authenticated user
 
         Raises:
-            HTTPException: If credentials are invalid
+            HTTPException: If credentials are invalid, or 429 if the hash queue is full
         """
         user = db.query(User).filter(User.email == email).first()
         if not user or not user.password_hash:
@@ -94,22 +86,27 @@ class AuthService:
                 detail="Invalid email or password"
             )
 
-        if not AuthService.verify_password(password, user.password_hash):
+        valid, new_hash = await PasswordService.verify_password(password, user.password_hash)
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
+        if new_hash:
+            user.password_hash = new_hash
 
         # Update last login
         user.last_login = datetime.utcnow()
         db.commit()
-        db.refresh(user)
         return user
 
     @staticmethod
-    def verify_google_token(token: str) -> GoogleUserInfo:
+    async def verify_google_token(token: str) -> GoogleUserInfo:
         """
-        Verify Google ID token and extract user information.
+        Verify Google ID token locally and extract user information.
+
+        The signature is checked against Google's cached signing keys, so
+        a login normally involves no network round trip.
 
         Args:
             token: Google ID token from frontend
@@ -118,22 +115,30 @@ class AuthService:
             GoogleUserInfo with user data
 
         Raises:
-            HTTPException: If token is invalid
+            HTTPException: If token is invalid or the signing keys are unavailable
         """
-        try:
-            idinfo = id_token.verify_oauth2_token(
-                token,
-                requests.Request(),
-                settings.google_client_id
-            )
+        import httpx
+        from jose import JWTError, jwt
 
-            # Verify token is for our app
-            if idinfo['aud'] != settings.google_client_id:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = await google_jwks.get_key(kid) if kid else None
+            if key is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token audience"
+                    detail="Invalid Google token: unknown signing key"
                 )
 
+            # Checks signature, expiry, audience and issuer
+            idinfo = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=settings.google_client_id,
+                issuer=GOOGLE_ISSUERS,
+                options={"verify_at_hash": False}
+            )
+
             # Extract user information
             return GoogleUserInfo(
                 google_id=idinfo['sub'],
@@ -142,11 +147,16 @@ class AuthService:
                 avatar_url=idinfo.get('picture', '')
             )
 
-        except ValueError as e:
+        except (JWTError, KeyError) as e:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=f"Invalid Google token: {str(e)}"
             )
+        except httpx.HTTPError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Failed to fetch Google signing keys: {str(e)}"
+            )
 
     @staticmethod
     def get_or_create_user(db: Session, google_user: GoogleUserInfo) -> User:
@@ -167,7 +177,6 @@ class AuthService:
             # Update last login
             user.last_login = datetime.utcnow()
             db.commit()
-            db.refresh(user)
             return user
 
         # Create new user
@@ -180,33 +189,198 @@ class AuthService:
         )
         db.add(user)
         db.commit()
-        db.refresh(user)
         return user
 
     @staticmethod
-    def create_token_response(user: User) -> TokenResponse:
+    def create_token_response(db: Session, user: User, session_id: Optional[uuid.UUID] = None) -> TokenResponse:
         """
-        Create JWT token response for authenticated user.
+        Issue an access token and a new refresh token for a user.
+
+        The access token embeds the claims most endpoints need (id, name,
+        avatar) so they can authenticate without loading the user.
 
         Args:
+            db: Database session
             user: Authenticated user
+            session_id: Session to continue when rotating; a new session is started if omitted
 
         Returns:
-            TokenResponse with access token and user info
+            TokenResponse with access token, refresh token and user info
         """
+        session_id = session_id or uuid.uuid4()
+        refresh = RefreshToken(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            family_id=session_id,
+            expires_at=datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
+        )
+        db.add(refresh)
+        db.commit()
+        return AuthService._sign_tokens(user, refresh)
+
+    @staticmethod
+    def _sign_tokens(user: User, refresh: RefreshToken) -> TokenResponse:
+        """Sign an access token and a refresh token for a stored refresh token's session."""
+        session_id = refresh.family_id
+        user_response = UserResponse.from_orm(user)
+
         access_token = create_access_token(
-            data={"sub": str(user.id)},
+            data={
+                "sub": str(user_response.id),
+                "name": user_response.name,
+                "avatar_url": user_response.avatar_url,
+                "sid": str(session_id),
+                "type": "access",
+            },
             expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
         )
+        refresh_token = create_access_token(
+            data={
+                "sub": str(user_response.id),
+                "jti": str(refresh.id),
+                "sid": str(session_id),
+                "type": "refresh",
+            },
+            expires_delta=refresh.expires_at - datetime.utcnow()
+        )
 
         return TokenResponse(
             access_token=access_token,
+            refresh_token=refresh_token,
             token_type="bearer",
-            user=UserResponse.from_orm(user)
+            expires_in=settings.access_token_expire_minutes * 60,
+            user=user_response
         )
 
     @staticmethod
-    def authenticate_google_user(db: Session, token: str) -> TokenResponse:
+    def refresh_session(db: Session, token: str) -> TokenResponse:
+        """
+        Exchange a refresh token for a new token pair (rotation).
+
+        Each refresh token can be used once. Presenting one that was already
+        rotated means it leaked, so the whole session is revoked, unless it
+        was rotated less than ``refresh_reuse_grace_seconds`` ago: then it
+        is most likely a concurrent refresh (another tab) and gets a pair
+        for the session's current refresh token instead.
+
+        Args:
+            db: Database session
+            token: Refresh token issued by create_token_response
+
+        Returns:
+            TokenResponse with new access and refresh tokens
+
+        Raises:
+            HTTPException: If the token is invalid, expired, reused or revoked
+        """
+        invalid = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        payload = verify_token(token, token_type="refresh")
+
+        try:
+            token_id = uuid.UUID(payload["jti"])
+        except (KeyError, ValueError):
+            raise invalid
+
+        # Lock the row so two concurrent refreshes can't both rotate it
+        stored = db.query(RefreshToken).filter(RefreshToken.id == token_id).with_for_update().first()
+        if not stored or str(stored.user_id) != payload["sub"]:
+            raise invalid
+
+        now = datetime.utcnow()
+        successor = None
+        if stored.revoked_at is not None:
+            if stored.revoked_at > now - timedelta(seconds=settings.refresh_reuse_grace_seconds):
+                # Revoking the session revokes every token, so a live one means plain rotation
+                successor = db.query(RefreshToken).filter(
+                    RefreshToken.family_id == stored.family_id,
+                    RefreshToken.revoked_at.is_(None),
+                    RefreshToken.expires_at > now
+                ).order_by(RefreshToken.created_at.desc()).first()
+            if successor is None:
+                AuthService.revoke_session(db, stored.family_id)
+                raise invalid
+
+        if stored.expires_at <= now or AuthService.is_session_revoked(db, str(stored.family_id)):
+            raise invalid
+
+        user = db.query(User).filter(User.id == stored.user_id).first()
+        if not user:
+            raise invalid
+
+        if successor is not None:
+            db.commit()  # Release the row lock
+            return AuthService._sign_tokens(user, successor)
+
+        stored.revoked_at = now
+        return AuthService.create_token_response(db, user, session_id=stored.family_id)
+
+    @staticmethod
+    def revoke_session(db: Session, session_id: uuid.UUID) -> None:
+        """
+        Revoke a session: its refresh tokens stop working immediately and its
+        access tokens are rejected by every worker within one sync interval.
+
+        Args:
+            db: Database session
+            session_id: Session (refresh token family) id
+        """
+        now = datetime.utcnow()
+        db.merge(RevokedSession(family_id=session_id, revoked_at=now))
+        db.query(RefreshToken).filter(
+            RefreshToken.family_id == session_id,
+            RefreshToken.revoked_at.is_(None)
+        ).update({RefreshToken.revoked_at: now}, synchronize_session=False)
+        db.commit()
+        revoked_sessions.add(str(session_id))
+
+    @staticmethod
+    def sync_revocations(db: Session) -> None:
+        """
+        Reload the revocation filter from the database.
+
+        Only sessions revoked within one access token lifetime are loaded;
+        access tokens of older revocations have expired on their own.
+
+        Args:
+            db: Database session
+        """
+        cutoff = datetime.utcnow() - timedelta(minutes=settings.access_token_expire_minutes)
+        rows = db.query(RevokedSession.family_id).filter(RevokedSession.revoked_at >= cutoff).all()
+        revoked_sessions.replace(str(row.family_id) for row in rows)
+
+    @staticmethod
+    def is_session_revoked(db: Session, session_id: str) -> bool:
+        """
+        Check whether a session has been revoked.
+
+        Answered from the in-memory filter in the common case; the database
+        is only consulted to confirm a filter hit or for the periodic sync.
+
+        Args:
+            db: Database session
+            session_id: Session id from the token's "sid" claim
+
+        Returns:
+            True if the session is revoked
+        """
+        if revoked_sessions.needs_sync():
+            AuthService.sync_revocations(db)
+        if not revoked_sessions.might_be_revoked(session_id):
+            return False
+        try:
+            family_id = uuid.UUID(session_id)
+        except ValueError:
+            return True
+        return db.query(RevokedSession.family_id).filter(
+            RevokedSession.family_id == family_id
+        ).first() is not None
+
+    @staticmethod
+    async def authenticate_google_user(db: Session, token: str) -> TokenResponse:
         """
         Authenticate user with Google token and return JWT.
 
@@ -218,13 +392,13 @@ class AuthService:
             TokenResponse with JWT and user info
         """
         # Verify Google token
-        google_user = AuthService.verify_google_token(token)
+        google_user = await AuthService.verify_google_token(token)
 
         # Get or create user
         user = AuthService.get_or_create_user(db, google_user)
 
         # Create and return JWT token
-        return AuthService.create_token_response(user)
+        return AuthService.create_token_response(db, user)
 
     @staticmethod
     def get_current_user(db: Session, user_id: str) -> User:
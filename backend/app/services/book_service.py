@@ -1,13 +1,17 @@
 """Book service for Open Library API integration and book management."""
+from datetime import datetime
 from typing import List, Optional
-from uuid import UUID
-import httpx
+from uuid import UUID, uuid4
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from ..config import get_settings
 from ..models.book import Book, GroupBook
 from ..models.group import Group, GroupMember
 from ..schemas.book import BookCreate, BookSearchResult, GroupBookCreate
+from ..utils.isbn import normalize_isbn
 
 settings = get_settings()
 
@@ -30,6 +34,8 @@ class BookService:
         Raises:
             HTTPException: If API request fails
         """
+        import httpx  # deferred so workers that never search don't load it
+
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(
@@ -49,10 +55,11 @@ class BookService:
                     # Get first author
                     author = doc.get("author_name", ["Unknown"])[0] if doc.get("author_name") else "Unknown"
 
-                    # Get ISBN
-                    isbn = None
-                    if doc.get("isbn"):
-                        isbn = doc["isbn"][0]
+                    # Get first valid ISBN, normalized to ISBN-13
+                    isbn = next(
+                        (n for n in map(normalize_isbn, doc.get("isbn") or []) if n),
+                        None
+                    )
 
                     # Get Open Library ID (from key like "/works/OL123W")
                     ol_id = None
@@ -81,44 +88,170 @@ class BookService:
                 detail=f"Failed to search books: {str(e)}"
             )
 
+    @staticmethod
+    def _book_row(book_data: BookCreate) -> dict:
+        """
+        Build an insert row for a book with normalized identifiers.
+
+        Raises:
+            HTTPException: If an ISBN is given but is not a valid ISBN-10/13
+        """
+        isbn = normalize_isbn(book_data.isbn)
+        if book_data.isbn and book_data.isbn.strip() and isbn is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid ISBN: {book_data.isbn}"
+            )
+        return {
+            "id": uuid4(),
+            "title": book_data.title,
+            "author": book_data.author,
+            "isbn": isbn,
+            "open_library_id": book_data.open_library_id or None,
+            "cover_url": book_data.cover_url,
+            "created_at": datetime.utcnow(),
+        }
+
+    @staticmethod
+    def _upsert_statement(conflict_column):
+        """
+        Build an INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement.
+
+        The no-op style update (only back-filling a missing cover) makes
+        RETURNING yield the existing row on conflict, so callers always get
+        a Book back from the single statement.
+        """
+        stmt = pg_insert(Book)
+        if conflict_column is not None:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[conflict_column],
+                index_where=conflict_column.isnot(None),
+                set_={"cover_url": func.coalesce(Book.cover_url, stmt.excluded.cover_url)},
+            )
+        return stmt.returning(Book, sort_by_parameter_order=True)
+
+    @staticmethod
+    def _find_existing(db: Session, row: dict) -> Optional[Book]:
+        """Look up a book by its normalized ISBN or Open Library ID."""
+        if row["isbn"]:
+            book = db.query(Book).filter(Book.isbn == row["isbn"]).first()
+            if book:
+                return book
+        if row["open_library_id"]:
+            return db.query(Book).filter(
+                Book.open_library_id == row["open_library_id"]
+            ).first()
+        return None
+
     @staticmethod
     def create_book(db: Session, book_data: BookCreate) -> Book:
         """
-        Create a new book in the database.
+        Create a book, or return the existing one with the same ISBN/Open Library ID.
+
+        Creation is a single upsert against the partial unique indexes on
+        ``books.isbn`` and ``books.open_library_id``, so concurrent adds of
+        the same book cannot create duplicates.
 
         Args:
             db: Database session
             book_data: Book creation data
 
         Returns:
-            Created Book instance
+            Created or existing Book instance
+
+        Raises:
+            HTTPException: If the ISBN is invalid
         """
-        # Check if book already exists by ISBN or Open Library ID
-        if book_data.isbn:
-            existing = db.query(Book).filter(Book.isbn == book_data.isbn).first()
-            if existing:
-                return existing
-
-        if book_data.open_library_id:
-            existing = db.query(Book).filter(
-                Book.open_library_id == book_data.open_library_id
-            ).first()
-            if existing:
-                return existing
-
-        # Create new book
-        book = Book(
-            title=book_data.title,
-            author=book_data.author,
-            isbn=book_data.isbn,
-            open_library_id=book_data.open_library_id,
-            cover_url=book_data.cover_url
-        )
-        db.add(book)
-        db.commit()
-        db.refresh(book)
+        row = BookService._book_row(book_data)
+        if row["isbn"]:
+            conflict_column = Book.isbn
+        elif row["open_library_id"]:
+            conflict_column = Book.open_library_id
+        else:
+            conflict_column = None
+
+        try:
+            book = db.scalars(
+                BookService._upsert_statement(conflict_column),
+                [row],
+                execution_options={"populate_existing": True},
+            ).one()
+            db.commit()
+        except IntegrityError:
+            # ISBN is new but the Open Library ID belongs to another row
+            db.rollback()
+            book = BookService._find_existing(db, row)
+            if not book:
+                raise
         return book
 
+    @staticmethod
+    def create_books(db: Session, books_data: List[BookCreate]) -> List[Book]:
+        """
+        Create many books at once (e.g. a page of search results).
+
+        Rows are deduplicated in Python by normalized identifier and then
+        upserted with one multi-row statement per conflict target.
+
+        Args:
+            db: Database session
+            books_data: Book creation data
+
+        Returns:
+            Book instances in the same order as ``books_data``
+
+        Raises:
+            HTTPException: If any ISBN is invalid
+        """
+        rows = [BookService._book_row(book_data) for book_data in books_data]
+
+        # A multi-row ON CONFLICT DO UPDATE may not touch the same row twice
+        by_isbn: dict = {}
+        by_ol_id: dict = {}
+        plain: List[dict] = []
+        for row in rows:
+            if row["isbn"]:
+                by_isbn.setdefault(row["isbn"], row)
+            elif row["open_library_id"]:
+                by_ol_id.setdefault(row["open_library_id"], row)
+            else:
+                plain.append(row)
+
+        try:
+            isbn_books = list(db.scalars(
+                BookService._upsert_statement(Book.isbn),
+                list(by_isbn.values()),
+                execution_options={"populate_existing": True},
+            )) if by_isbn else []
+            ol_books = list(db.scalars(
+                BookService._upsert_statement(Book.open_library_id),
+                list(by_ol_id.values()),
+                execution_options={"populate_existing": True},
+            )) if by_ol_id else []
+            plain_books = list(db.scalars(
+                BookService._upsert_statement(None),
+                plain,
+            )) if plain else []
+            db.commit()
+        except IntegrityError:
+            # Cross-identifier collision somewhere in the batch; resolve row by row
+            db.rollback()
+            return [BookService.create_book(db, book_data) for book_data in books_data]
+
+        isbn_map = dict(zip(by_isbn.keys(), isbn_books))
+        ol_map = dict(zip(by_ol_id.keys(), ol_books))
+        plain_iter = iter(plain_books)
+
+        result = []
+        for row in rows:
+            if row["isbn"]:
+                result.append(isbn_map[row["isbn"]])
+            elif row["open_library_id"]:
+                result.append(ol_map[row["open_library_id"]])
+            else:
+                result.append(next(plain_iter))
+        return result
+
     @staticmethod
     def get_book(db: Session, book_id: UUID) -> Book:
         """
@@ -228,7 +361,6 @@ class BookService:
         )
         db.add(group_book)
         db.commit()
-        db.refresh(group_book)
         return group_book
 
     @staticmethod
@@ -0,0 +1,117 @@
+"""Background hard deletion of soft-deleted comments."""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, select
+from sqlalchemy.orm import aliased
+from ..config import get_settings
+from ..database import SessionLocal
+from ..middleware.metrics import HTTP_REQUESTS_IN_FLIGHT
+from ..models.comment import Comment
+from ..utils.metrics import Counter
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+COMMENTS_PURGED = Counter(
+    "bookclub_comments_purged_total",
+    "Soft-deleted comments hard-deleted by the background purger.",
+)
+
+_in_flight = HTTP_REQUESTS_IN_FLIGHT.labels()
+
+
+class CommentPurgeService:
+    """
+    Hard-deletes soft-deleted comments off the request path.
+
+    Every ``comment_purge_interval_seconds`` the purger deletes batches of
+    at most ``comment_purge_batch_size`` comments, each in its own short
+    transaction, until a batch deletes nothing or the worker gets busy.
+    Only comments without replies are purged, so a deleted thread goes
+    bottom-up (its leaves in one batch, their parents in the next, all in
+    the same run) and a deleted comment with live replies stays as their
+    placeholder. Likes and reports go with the comment through ``ON DELETE CASCADE``.
+    """
+
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def start(cls) -> None:
+        """Start the purge task (called on application startup)."""
+        cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Cancel the purge task (called on application shutdown)."""
+        if cls._task is None:
+            return
+        cls._task.cancel()
+        await asyncio.gather(cls._task, return_exceptions=True)
+        cls._task = None
+
+    @staticmethod
+    def _is_quiet() -> bool:
+        return _in_flight.value <= settings.comment_purge_max_in_flight
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            await asyncio.sleep(settings.comment_purge_interval_seconds)
+            try:
+                await cls.purge()
+            except Exception as e:
+                logger.error(f"Comment purge failed: {e}", exc_info=True)
+
+    @classmethod
+    async def purge(cls) -> int:
+        """
+        Run batches until one deletes nothing or the worker gets busy.
+
+        A short batch is not the end: deleting a thread's leaves can leave
+        their deleted parents reply-less for the next batch.
+
+        Returns:
+            Number of comments deleted
+        """
+        total = 0
+        while cls._is_quiet():
+            purged = await asyncio.to_thread(cls.purge_batch, settings.comment_purge_batch_size)
+            if not purged:
+                break
+            total += purged
+        return total
+
+    @staticmethod
+    def purge_batch(batch_size: int) -> int:
+        """
+        Hard-delete one batch of comments deleted more than the grace period ago.
+
+        Rows locked by another worker's purge are skipped rather than waited on.
+
+        Args:
+            batch_size: Maximum number of comments to delete
+
+        Returns:
+            Number of comments deleted
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.comment_purge_grace_seconds)
+        replies = aliased(Comment)
+        batch = select(Comment.id).where(
+            Comment.deleted_at < cutoff,
+            ~select(replies.id).where(replies.parent_comment_id == Comment.id).exists()
+        ).order_by(Comment.deleted_at).limit(batch_size).with_for_update(skip_locked=True)
+
+        db = SessionLocal()
+        try:
+            purged = db.execute(
+                delete(Comment).where(Comment.id.in_(batch.scalar_subquery()))
+            ).rowcount
+            db.commit()
+        finally:
+            db.close()
+        if purged:
+            COMMENTS_PURGED.inc(purged)
+            logger.info(f"Purged {purged} deleted comments")
+        return purged
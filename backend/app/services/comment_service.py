@@ -1,18 +1,31 @@
 """Comment service for managing comments with visibility filtering."""
-from typing import List, Optional
-from uuid import UUID
-from decimal import Decimal
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy.orm import Session, aliased, contains_eager
+from sqlalchemy import DateTime, and_, case, delete, exists, func, lambda_stmt, literal, literal_column, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
 from fastapi import HTTPException, status
+from .. import database
 from ..config import get_settings
+from ..models.book import Book
 from ..models.comment import Comment, CommentLike
 from ..models.group import GroupMember
 from ..models.progress import UserReadingProgress
 from ..schemas.comment import CommentCreate, CommentUpdate
+from ..utils.visibility_index import BookComments, CommentVisibilityIndex
+from .group_service import GroupService
+from .progress_service import ProgressService
 
 settings = get_settings()
 
+visibility_index = CommentVisibilityIndex(settings.visibility_index_books, settings.visibility_index_ttl_seconds)
+
+# Text search configuration; the document expression must match idx_comments_search
+SEARCH_CONFIG = literal_column("'english'")
+search_document = func.to_tsvector(SEARCH_CONFIG, Comment.content)
+
 
 class CommentService:
     """Service for handling comment operations with visibility logic."""
@@ -41,35 +54,43 @@ class CommentService:
         """
         # Validate parent comment if provided
         if comment_data.parent_comment_id:
-            parent = db.query(Comment).filter(Comment.id == comment_data.parent_comment_id).first()
-            if not parent:
+            parent = db.get(Comment, comment_data.parent_comment_id)
+            if not parent or parent.is_removed:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parent comment not found")
             if parent.group_id != group_id or parent.book_id != comment_data.book_id:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Parent comment must be in same group and book")
 
         # Verify user is member of group
-        membership = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id
-        ).first()
+        membership = GroupService.get_membership(db, group_id, user_id)
         if not membership:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You must be a member of this group to comment"
             )
 
+        # Prefill total pages from the user's progress, then enriched book metadata
+        total_pages = comment_data.progress_total_pages
+        if not total_pages:
+            total_pages = db.query(UserReadingProgress.total_pages).filter(
+                UserReadingProgress.user_id == user_id,
+                UserReadingProgress.book_id == comment_data.book_id,
+                UserReadingProgress.group_id == group_id
+            ).scalar() or db.query(Book.page_count).filter(
+                Book.id == comment_data.book_id
+            ).scalar()
+        if not total_pages:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Total pages is required for this book"
+            )
+
         # Validate progress
-        if comment_data.progress_page > comment_data.progress_total_pages:
+        if comment_data.progress_page > total_pages:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Progress page cannot exceed total pages"
             )
 
-        # Calculate progress percentage
-        progress_percentage = (
-            Decimal(comment_data.progress_page) / Decimal(comment_data.progress_total_pages) * 100
-        )
-
         # Create comment
         comment = Comment(
             group_id=group_id,
@@ -77,15 +98,38 @@ class CommentService:
             user_id=user_id,
             content=comment_data.content,
             progress_page=comment_data.progress_page,
-            progress_total_pages=comment_data.progress_total_pages,
-            progress_percentage=progress_percentage,
+            progress_total_pages=total_pages,
             parent_comment_id=comment_data.parent_comment_id
         )
         db.add(comment)
         db.commit()
-        db.refresh(comment)
+        visibility_index.add((group_id, comment.book_id), comment.id, comment.progress_bp, comment.created_at)
         return comment
 
+    @staticmethod
+    def _book_comments_loader(db: Session, group_id: UUID, book_id: UUID):
+        """Loader that builds the visibility index entry for one (group, book)."""
+        def load() -> BookComments:
+            return BookComments(db.execute(lambda_stmt(
+                lambda: select(Comment.id, Comment.progress_bp, Comment.created_at).where(
+                    Comment.group_id == group_id,
+                    Comment.book_id == book_id,
+                    Comment.deleted_at.is_(None),
+                    Comment.hidden_at.is_(None)
+                ).order_by(Comment.progress_bp, Comment.created_at)
+            )))
+        return load
+
+    @staticmethod
+    def _index_is_complete(db: Session) -> bool:
+        """
+        Whether visibility index entries loaded through ``db`` hold every comment.
+
+        Only when this process is the only writer (it indexes its own new
+        comments) and the session reads the primary, not a lagging replica.
+        """
+        return settings.visibility_index_single_writer and db.get_bind() is database.engine
+
     @staticmethod
     def get_visible_comments(
         db: Session,
@@ -95,7 +139,10 @@ class CommentService:
     ) -> List[Comment]:
         """
         Get comments visible to user based on their reading progress.
-        User can only see comments where comment.progress_percentage <= user.progress_percentage - 3.0
+        User can only see comments at or below their own progress (compared in basis points).
+
+        Deleted or hidden comments that still have visible replies are
+        included as placeholders (``is_removed``) so the replies keep their thread.
 
         Args:
             db: Database session
@@ -104,32 +151,70 @@ class CommentService:
             user_id: User UUID
 
         Returns:
-            List of visible Comment instances
+            List of visible Comment instances, authors loaded (placeholders' are not)
         """
         # Get user's current progress for this book in this group
-        user_progress = db.query(UserReadingProgress).filter(
-            UserReadingProgress.user_id == user_id,
-            UserReadingProgress.book_id == book_id,
-            UserReadingProgress.group_id == group_id
-        ).first()
-
-        if not user_progress:
-            # If user has no progress, they can only see comments at 0% progress
-            max_visible_percentage = Decimal("0.00")
-        else:
-            # User can see comments up to their current progress (no buffer)
-            max_visible_percentage = user_progress.progress_percentage
-
-        # Query comments with visibility filter
-        comments = db.query(Comment).filter(
-            and_(
+        user_progress = ProgressService.get_user_progress(db, user_id, book_id, group_id)
+
+        # Without progress a user only sees comments made at 0%; otherwise
+        # everything up to their current progress (no buffer)
+        max_visible_bp = user_progress.progress_bp if user_progress else 0
+
+        # The in-memory index can answer "nothing visible" without a query
+        if visibility_index.visible_count(
+            (group_id, book_id),
+            max_visible_bp,
+            CommentService._book_comments_loader(db, group_id, book_id),
+            CommentService._index_is_complete(db)
+        ) == 0:
+            return []
+
+        # Rows stream from the (book_id, group_id, progress_bp) index range;
+        # fetching hundreds of ids by primary key is slower
+        comments = db.execute(lambda_stmt(
+            lambda: select(Comment).join(Comment.user).options(contains_eager(Comment.user)).where(
                 Comment.group_id == group_id,
                 Comment.book_id == book_id,
-                Comment.progress_percentage <= max_visible_percentage
-            )
-        ).order_by(Comment.progress_percentage, Comment.created_at).all()
+                Comment.progress_bp <= max_visible_bp,
+                Comment.deleted_at.is_(None),
+                Comment.hidden_at.is_(None)
+            ).order_by(Comment.progress_bp, Comment.created_at)
+        )).scalars().all()
+        return CommentService._with_removed_parents(db, comments, max_visible_bp)
 
-        return comments
+    @staticmethod
+    def _with_removed_parents(db: Session, comments: List[Comment], max_visible_bp: int) -> List[Comment]:
+        """
+        Add the removed ancestors of ``comments`` that are within the viewer's progress.
+
+        A parent within progress is only missing from the feed if it was
+        deleted or hidden, so this is usually a no-op; otherwise one
+        primary-key lookup per level of removed ancestors.
+
+        Args:
+            db: Database session
+            comments: Live comments in feed order
+            max_visible_bp: Viewer's progress in basis points
+
+        Returns:
+            The comments and placeholders, in feed order
+        """
+        seen = {comment.id for comment in comments}
+        missing = {comment.parent_comment_id for comment in comments} - seen - {None}
+        placeholders = []
+        while missing:
+            parents = db.execute(
+                select(Comment).where(
+                    Comment.id.in_(missing),
+                    Comment.progress_bp <= max_visible_bp
+                )
+            ).scalars().all()
+            placeholders.extend(parents)
+            seen.update(missing)
+            missing = {parent.parent_comment_id for parent in parents} - seen - {None}
+        if not placeholders:
+            return comments
+        return sorted(comments + placeholders, key=lambda comment: (comment.progress_bp, comment.created_at))
 
     @staticmethod
     def get_comments_ahead(
@@ -148,35 +233,248 @@ class CommentService:
             user_id: User UUID
 
         Returns:
-            List of Comment instances that are ahead of the user's visible progress
+            List of Comment instances that are ahead of the user's visible progress,
+            authors loaded
         """
         # Get user's current progress for this book in this group
-        user_progress = db.query(UserReadingProgress).filter(
-            UserReadingProgress.user_id == user_id,
-            UserReadingProgress.book_id == book_id,
-            UserReadingProgress.group_id == group_id
-        ).first()
+        user_progress = ProgressService.get_user_progress(db, user_id, book_id, group_id)
 
-        if not user_progress:
-            max_visible_percentage = Decimal("0.00")
-        else:
-            max_visible_percentage = user_progress.progress_percentage
+        max_visible_bp = user_progress.progress_bp if user_progress else 0
 
-        comments = db.query(Comment).filter(
-            and_(
+        # A complete index entry slices out exactly the comments ahead
+        ahead_ids = visibility_index.ahead_ids(
+            (group_id, book_id),
+            max_visible_bp,
+            CommentService._book_comments_loader(db, group_id, book_id),
+            CommentService._index_is_complete(db)
+        )
+        if ahead_ids is not None:
+            if not ahead_ids:
+                return []
+            return db.execute(
+                select(Comment).join(Comment.user).options(contains_eager(Comment.user)).where(
+                    Comment.id.in_(ahead_ids),
+                    Comment.deleted_at.is_(None),
+                    Comment.hidden_at.is_(None)
+                ).order_by(Comment.progress_bp, Comment.created_at)
+            ).scalars().all()
+
+        return db.execute(lambda_stmt(
+            lambda: select(Comment).join(Comment.user).options(contains_eager(Comment.user)).where(
                 Comment.group_id == group_id,
                 Comment.book_id == book_id,
-                Comment.progress_percentage > max_visible_percentage
+                Comment.progress_bp > max_visible_bp,
+                Comment.deleted_at.is_(None),
+                Comment.hidden_at.is_(None)
+            ).order_by(Comment.progress_bp, Comment.created_at)
+        )).scalars().all()
+
+    @staticmethod
+    def get_visible_threads(
+        db: Session,
+        group_id: UUID,
+        book_id: UUID,
+        user_id: UUID,
+        limit: int,
+        after: Optional[UUID] = None
+    ) -> Tuple[List[Tuple[Comment, int, int]], Optional[UUID]]:
+        """
+        Get a page of visible top-level comments with their whole visible reply trees.
+
+        Threads are ordered like the flat feed (progress, then age) and
+        fetched with one recursive CTE. Replies beyond the viewer's progress
+        are hidden together with everything below them. Deleted and hidden
+        comments are kept as placeholders while they have live replies below them.
+
+        Args:
+            db: Database session
+            group_id: Group UUID
+            book_id: Book UUID
+            user_id: User UUID
+            limit: Maximum number of top-level threads
+            after: Last top-level comment of the previous page
+
+        Returns:
+            ``(comment, depth, visible reply count)`` in thread order (each
+            parent before its replies; placeholders are ``is_removed``),
+            and the cursor for the next page or None on the last page
+
+        Raises:
+            HTTPException: If the ``after`` cursor is not a top-level comment of this book
+        """
+        user_progress = ProgressService.get_user_progress(db, user_id, book_id, group_id)
+        max_visible_bp = user_progress.progress_bp if user_progress else 0
+
+        if visibility_index.visible_count(
+            (group_id, book_id),
+            max_visible_bp,
+            CommentService._book_comments_loader(db, group_id, book_id),
+            CommentService._index_is_complete(db)
+        ) == 0:
+            return [], None
+
+        replies = aliased(Comment)
+        roots = select(
+            Comment.id,
+            Comment.progress_bp,
+            Comment.created_at
+        ).where(
+            Comment.group_id == group_id,
+            Comment.book_id == book_id,
+            Comment.parent_comment_id.is_(None),
+            Comment.progress_bp <= max_visible_bp,
+            # Removed roots only matter as placeholders for their replies
+            or_(
+                and_(Comment.deleted_at.is_(None), Comment.hidden_at.is_(None)),
+                select(replies.id).where(replies.parent_comment_id == Comment.id).exists()
+            )
+        )
+        if after is not None:
+            cursor = db.get(Comment, after)
+            if not cursor or cursor.parent_comment_id or cursor.group_id != group_id or cursor.book_id != book_id:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid thread cursor")
+            roots = roots.where(
+                tuple_(Comment.progress_bp, Comment.created_at, Comment.id)
+                > tuple_(cursor.progress_bp, cursor.created_at, cursor.id)
             )
-        ).order_by(Comment.progress_percentage, Comment.created_at).all()
+        page = roots.order_by(Comment.progress_bp, Comment.created_at, Comment.id).limit(limit).subquery()
+
+        # Anchor: this page's roots; recursive step: visible direct replies
+        thread = select(
+            page.c.id,
+            page.c.progress_bp.label("root_bp"),
+            page.c.created_at.label("root_created_at"),
+            page.c.id.label("root_id"),
+            literal(0).label("depth")
+        ).cte("thread", recursive=True)
+        thread = thread.union_all(
+            select(
+                Comment.id,
+                thread.c.root_bp,
+                thread.c.root_created_at,
+                thread.c.root_id,
+                thread.c.depth + 1
+            ).join(
+                thread, Comment.parent_comment_id == thread.c.id
+            ).where(
+                Comment.progress_bp <= max_visible_bp
+            )
+        )
 
-        return comments
+        rows = db.execute(
+            select(Comment, thread.c.depth)
+            .join(thread, Comment.id == thread.c.id)
+            .join(Comment.user)
+            .options(contains_eager(Comment.user))
+            .order_by(
+                thread.c.root_bp,
+                thread.c.root_created_at,
+                thread.c.root_id,
+                thread.c.depth,
+                Comment.progress_bp,
+                Comment.created_at
+            )
+        ).all()
+
+        # Page on the roots fetched, before pruning can drop any of them
+        root_ids = [comment.id for comment, depth in rows if depth == 0]
+        next_after = root_ids[-1] if len(root_ids) == limit else None
+
+        # Drop removed comments with nothing live below them; rows are ordered
+        # by depth within a thread, so walking backwards sees replies first
+        live_below = set()
+        kept = []
+        for comment, depth in reversed(rows):
+            if not comment.is_removed or comment.id in live_below:
+                live_below.add(comment.parent_comment_id)
+                kept.append((comment, depth))
+        kept.reverse()
+
+        reply_counts = Counter(comment.parent_comment_id for comment, _ in kept)
+        threads = [(comment, depth, reply_counts[comment.id]) for comment, depth in kept]
+        return threads, next_after
+
+    @staticmethod
+    def search_comments(
+        db: Session,
+        group_id: UUID,
+        book_id: UUID,
+        user_id: UUID,
+        query: str,
+        limit: int,
+        offset: int = 0
+    ) -> List[Comment]:
+        """
+        Full-text search over the comments visible to a user, best matches first.
+
+        The progress filter is part of the indexed query, so comments
+        beyond the user's progress are never matched, ranked or returned.
+
+        Args:
+            db: Database session
+            group_id: Group UUID
+            book_id: Book UUID
+            user_id: User UUID
+            query: Search text (web search syntax: quoted phrases, OR, -word)
+            limit: Maximum number of results
+            offset: Results to skip
+
+        Returns:
+            Matching Comment instances with their authors loaded
+        """
+        user_progress = ProgressService.get_user_progress(db, user_id, book_id, group_id)
+        max_visible_bp = user_progress.progress_bp if user_progress else 0
+
+        if visibility_index.visible_count(
+            (group_id, book_id),
+            max_visible_bp,
+            CommentService._book_comments_loader(db, group_id, book_id),
+            CommentService._index_is_complete(db)
+        ) == 0:
+            return []
+
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        return db.execute(
+            select(Comment)
+            .join(Comment.user)
+            .options(contains_eager(Comment.user))
+            .where(
+                Comment.group_id == group_id,
+                Comment.book_id == book_id,
+                Comment.progress_bp <= max_visible_bp,
+                Comment.deleted_at.is_(None),
+                Comment.hidden_at.is_(None),
+                search_document.op("@@")(tsquery)
+            )
+            .order_by(
+                func.ts_rank_cd(search_document, tsquery).desc(),
+                Comment.progress_bp,
+                Comment.created_at,
+                Comment.id
+            )
+            .limit(limit)
+            .offset(offset)
+        ).scalars().all()
+
+    @staticmethod
+    def _check_progress(db: Session, user_id: UUID, group_id: UUID, book_id: UUID, progress_bp: int) -> None:
+        """Raise 403 if a comment at ``progress_bp`` is beyond the user's reading progress."""
+        user_progress = ProgressService.get_user_progress(db, user_id, book_id, group_id)
+
+        max_visible_bp = user_progress.progress_bp if user_progress else 0
+
+        if progress_bp > max_visible_bp:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have sufficient reading progress to view this comment"
+            )
 
     @staticmethod
     def get_comment_by_id(
         db: Session,
         comment_id: UUID,
-        user_id: UUID
+        user_id: UUID,
+        include_hidden: bool = False
     ) -> Comment:
         """
         Get a comment by ID, checking visibility.
@@ -185,6 +483,7 @@ class CommentService:
             db: Database session
             comment_id: Comment UUID
             user_id: User UUID
+            include_hidden: Also return comments hidden by spoiler reports
 
         Returns:
             Comment instance
@@ -192,30 +491,23 @@ class CommentService:
         Raises:
             HTTPException: If comment not found or not visible
         """
-        comment = db.query(Comment).filter(Comment.id == comment_id).first()
-        if not comment:
+        # A comment the visibility index holds is checked before it is loaded,
+        # so comments beyond the viewer's progress cost no row fetch
+        indexed = visibility_index.locate(comment_id)
+        if indexed is not None:
+            (group_id, book_id), progress_bp = indexed
+            CommentService._check_progress(db, user_id, group_id, book_id, progress_bp)
+
+        comment = db.get(Comment, comment_id)
+        if not comment or comment.deleted_at is not None or (comment.hidden_at is not None and not include_hidden):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Comment not found"
             )
 
         # Check if user can see this comment
-        user_progress = db.query(UserReadingProgress).filter(
-            UserReadingProgress.user_id == user_id,
-            UserReadingProgress.book_id == comment.book_id,
-            UserReadingProgress.group_id == comment.group_id
-        ).first()
-
-        if user_progress:
-            max_visible = user_progress.progress_percentage
-        else:
-            max_visible = Decimal("0.00")
-
-        if comment.progress_percentage > max_visible:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have sufficient reading progress to view this comment"
-            )
+        if indexed is None:
+            CommentService._check_progress(db, user_id, comment.group_id, comment.book_id, comment.progress_bp)
 
         return comment
 
@@ -241,8 +533,8 @@ class CommentService:
         Raises:
             HTTPException: If not found or not authorized
         """
-        comment = db.query(Comment).filter(Comment.id == comment_id).first()
-        if not comment:
+        comment = db.get(Comment, comment_id)
+        if not comment or comment.is_removed:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Comment not found"
@@ -256,7 +548,6 @@ class CommentService:
 
         comment.content = comment_data.content
         db.commit()
-        db.refresh(comment)
         return comment
 
     @staticmethod
@@ -268,6 +559,10 @@ class CommentService:
         """
         Delete a comment (user can only delete their own comments).
 
+        The comment is only marked deleted, which hides it from every read
+        at once; ``CommentPurgeService`` hard-deletes it (and its likes and
+        reports) later, in small batches, once it has no replies left.
+
         Args:
             db: Database session
             comment_id: Comment UUID
@@ -276,8 +571,8 @@ class CommentService:
         Raises:
             HTTPException: If not found or not authorized
         """
-        comment = db.query(Comment).filter(Comment.id == comment_id).first()
-        if not comment:
+        comment = db.get(Comment, comment_id)
+        if not comment or comment.deleted_at is not None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Comment not found"
@@ -289,17 +584,62 @@ class CommentService:
                 detail="You can only delete your own comments"
             )
 
-        db.delete(comment)
+        comment.deleted_at = datetime.utcnow()
         db.commit()
+        visibility_index.remove((comment.group_id, comment.book_id), comment.id, comment.progress_bp)
+
+    @staticmethod
+    def _likeable_by(user_id: UUID) -> List:
+        """
+        WHERE clauses on ``Comment`` for comments the user may like or unlike.
+
+        Live, within the user's progress in the comment's group and book,
+        and in a group the user still belongs to (progress outlives membership).
+        """
+        viewer_bp = select(UserReadingProgress.progress_bp).where(
+            UserReadingProgress.user_id == user_id,
+            UserReadingProgress.book_id == Comment.book_id,
+            UserReadingProgress.group_id == Comment.group_id
+        ).scalar_subquery()
+        return [
+            Comment.deleted_at.is_(None),
+            Comment.hidden_at.is_(None),
+            Comment.progress_bp <= func.coalesce(viewer_bp, 0),
+            exists().where(
+                GroupMember.group_id == Comment.group_id,
+                GroupMember.user_id == user_id
+            )
+        ]
+
+    @staticmethod
+    def _raise_not_likeable(db: Session, comment_id: UUID, user_id: UUID) -> None:
+        """
+        Raise why ``_likeable_by`` rejected a comment, if it still does.
+
+        Raises:
+            HTTPException: 404 if the comment is not found, 403 if it is
+                beyond the user's progress or they are not a group member
+        """
+        comment = CommentService.get_comment_by_id(db, comment_id, user_id)
+        if not GroupService.get_membership(db, comment.group_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You must be a member of this group"
+            )
 
     @staticmethod
     def like_comment(
         db: Session,
         comment_id: UUID,
         user_id: UUID
-    ) -> CommentLike:
+    ) -> Tuple[int, bool]:
         """
-        Like a comment (user must be able to see it first).
+        Like a comment (user must be able to see it). Liking twice is a no-op.
+
+        The visibility check, the insert and the new count are one
+        statement: ``INSERT ... SELECT`` from the comment only if it is
+        within the user's progress, ``ON CONFLICT DO NOTHING``, in a CTE
+        next to the count.
 
         Args:
             db: Database session
@@ -307,75 +647,121 @@ class CommentService:
             user_id: User UUID
 
         Returns:
-            Created CommentLike instance
+            Tuple of (like count, user has liked)
 
         Raises:
-            HTTPException: If comment not visible or already liked
+            HTTPException: If comment not found or not visible
         """
-        # Verify comment is visible to user
-        comment = CommentService.get_comment_by_id(db, comment_id, user_id)
-
-        # Check if already liked
-        existing = db.query(CommentLike).filter(
-            CommentLike.comment_id == comment_id,
-            CommentLike.user_id == user_id
-        ).first()
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="You have already liked this comment"
-            )
-
-        like = CommentLike(
-            comment_id=comment_id,
-            user_id=user_id
+        visible_comment = select(
+            literal(uuid4(), PG_UUID(as_uuid=True)),
+            Comment.id,
+            literal(user_id, PG_UUID(as_uuid=True)),
+            literal(datetime.utcnow(), DateTime())
+        ).where(
+            Comment.id == comment_id,
+            *CommentService._likeable_by(user_id)
         )
-        db.add(like)
+        inserted = insert(CommentLike).from_select(
+            ["id", "comment_id", "user_id", "created_at"], visible_comment
+        ).on_conflict_do_nothing(
+            index_elements=[CommentLike.comment_id, CommentLike.user_id]
+        ).returning(CommentLike.id).cte("inserted")
+
+        # The outer query sees the table as it was before the insert
+        previous_count, added, had_liked = db.execute(select(
+            select(func.count(CommentLike.id)).where(
+                CommentLike.comment_id == comment_id
+            ).scalar_subquery(),
+            select(func.count()).select_from(inserted).scalar_subquery(),
+            exists().where(
+                CommentLike.comment_id == comment_id,
+                CommentLike.user_id == user_id
+            )
+        )).one()
         db.commit()
-        db.refresh(like)
-        return like
+
+        if not added and not had_liked:
+            # Either not visible (raise why) or a concurrent double-tap of
+            # this user won the insert after this statement's snapshot
+            CommentService._raise_not_likeable(db, comment_id, user_id)
+            return previous_count + 1, True
+        return previous_count + added, True
 
     @staticmethod
     def unlike_comment(
         db: Session,
         comment_id: UUID,
         user_id: UUID
-    ) -> None:
+    ) -> Tuple[int, bool]:
         """
-        Remove like from a comment.
+        Remove the user's like from a comment (user must be able to see it).
+        Unliking twice is a no-op.
+
+        The visibility check, the delete and the new count are one statement
+        (``DELETE ... RETURNING`` limited to a likeable comment, in a CTE
+        next to the count and the check).
 
         Args:
             db: Database session
             comment_id: Comment UUID
             user_id: User UUID
 
+        Returns:
+            Tuple of (like count, user has liked), the latter always False
+
         Raises:
-            HTTPException: If like not found
+            HTTPException: If comment not found or not visible
         """
-        like = db.query(CommentLike).filter(
-            CommentLike.comment_id == comment_id,
+        visible_comment = select(Comment.id).where(
+            Comment.id == comment_id,
+            *CommentService._likeable_by(user_id)
+        )
+        deleted = delete(CommentLike).where(
+            CommentLike.comment_id.in_(visible_comment),
             CommentLike.user_id == user_id
-        ).first()
-        if not like:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Like not found"
-            )
-
-        db.delete(like)
+        ).returning(CommentLike.id).cte("deleted")
+
+        # The outer query sees the table as it was before the delete
+        like_count, visible = db.execute(select(
+            select(func.count(CommentLike.id)).where(
+                CommentLike.comment_id == comment_id
+            ).scalar_subquery()
+            - select(func.count()).select_from(deleted).scalar_subquery(),
+            visible_comment.exists()
+        )).one()
         db.commit()
 
-    @staticmethod
-    def get_comment_like_count(db: Session, comment_id: UUID) -> int:
-        """Get the number of likes for a comment."""
-        return db.query(func.count(CommentLike.id)).filter(
-            CommentLike.comment_id == comment_id
-        ).scalar()
+        if not visible:
+            CommentService._raise_not_likeable(db, comment_id, user_id)
+        return like_count, False
 
     @staticmethod
-    def user_has_liked_comment(db: Session, comment_id: UUID, user_id: UUID) -> bool:
-        """Check if user has liked a comment."""
-        return db.query(CommentLike).filter(
-            CommentLike.comment_id == comment_id,
-            CommentLike.user_id == user_id
-        ).first() is not None
+    def get_like_stats(
+        db: Session,
+        comment_ids: List[UUID],
+        user_id: UUID
+    ) -> Dict[UUID, Tuple[int, bool]]:
+        """
+        Get like counts and the user's liked state for many comments in one query.
+
+        Args:
+            db: Database session
+            comment_ids: Comment UUIDs
+            user_id: User UUID
+
+        Returns:
+            Mapping of comment id to (like count, user has liked); comments
+            without likes are absent
+        """
+        if not comment_ids:
+            return {}
+        rows = db.execute(
+            select(
+                CommentLike.comment_id,
+                func.count(CommentLike.id),
+                func.count(case((CommentLike.user_id == user_id, 1)))
+            ).where(
+                CommentLike.comment_id.in_(comment_ids)
+            ).group_by(CommentLike.comment_id)
+        ).all()
+        return {comment_id: (count, liked > 0) for comment_id, count, liked in rows}
@@ -0,0 +1,278 @@
+"""Cover proxy service with a content-addressed, size-bounded disk cache."""
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from ..config import get_settings
+from ..models.book import Book
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _atomic_write(path: str, content: bytes) -> None:
+    """Write a file via rename so other workers never see a partial image."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class CachedCover(NamedTuple):
+    """A cover image on disk, ready to be served as a file."""
+    path: str
+    digest: str  # SHA-256 of the image
+    stat: os.stat_result
+
+
+class CoverCache:
+    """
+    Disk cache for cover images.
+
+    Images are stored once under their SHA-256 content hash (identical images,
+    e.g. Open Library placeholders, share a blob) and small key files map
+    "<cover_id>-<size>" to a hash. Keys are evicted least-recently-used once
+    the total blob size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._keys: "OrderedDict[str, str]" = OrderedDict()  # key -> digest, LRU first
+        self._blob_sizes: Dict[str, int] = {}
+        self._blob_refs: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, asyncio.Lock] = {}
+        self._load()
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.jpg")
+
+    def _key_path(self, key: str) -> str:
+        return os.path.join(self.root, "keys", key)
+
+    def _load(self) -> None:
+        """Rebuild the in-memory index from disk, oldest entries first."""
+        keys_dir = os.path.join(self.root, "keys")
+        os.makedirs(keys_dir, exist_ok=True)
+
+        entries = []
+        for name in os.listdir(keys_dir):
+            path = os.path.join(keys_dir, name)
+            try:
+                with open(path) as f:
+                    digest = f.read().strip()
+                entries.append((os.path.getmtime(path), name, digest, os.path.getsize(self.blob_path(digest))))
+            except OSError:
+                continue
+
+        for _, key, digest, size in sorted(entries):
+            self._track(key, digest, size)
+        self._evict()
+
+    def _track(self, key: str, digest: str, size: int) -> None:
+        self._keys[key] = digest
+        if digest not in self._blob_sizes:
+            self._blob_sizes[digest] = size
+            self._total_bytes += size
+        self._blob_refs[digest] = self._blob_refs.get(digest, 0) + 1
+
+    def _forget(self, key: str) -> None:
+        """Drop a key, removing its blob once no other key references it."""
+        digest = self._keys.pop(key)
+        try:
+            os.unlink(self._key_path(key))
+        except FileNotFoundError:
+            pass
+
+        self._blob_refs[digest] -= 1
+        if self._blob_refs[digest] == 0:
+            del self._blob_refs[digest]
+            self._total_bytes -= self._blob_sizes.pop(digest)
+            try:
+                os.unlink(self.blob_path(digest))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._keys) > 1:
+            self._forget(next(iter(self._keys)))
+
+    def lookup(self, key: str) -> Optional[CachedCover]:
+        """
+        Find the cached image for a key and mark it recently used.
+
+        Nothing is opened: the caller can answer a conditional request from
+        the digest, or serve the path as a file.
+
+        Returns:
+            The cached cover, or None on a miss (including when another
+            worker already evicted the blob)
+        """
+        with self._lock:
+            digest = self._keys.get(key)
+            if digest is None:
+                return None
+            path = self.blob_path(digest)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                self._forget(key)
+                return None
+            self._keys.move_to_end(key)
+            return CachedCover(path, digest, stat)
+
+    def store(self, key: str, content: bytes) -> CachedCover:
+        """Persist an image under its content hash."""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.blob_path(digest)
+
+        with self._lock:
+            if self._keys.get(key) == digest and os.path.exists(path):
+                self._keys.move_to_end(key)
+                return CachedCover(path, digest, os.stat(path))
+            if key in self._keys:
+                self._forget(key)
+
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                _atomic_write(path, content)
+            _atomic_write(self._key_path(key), digest.encode())
+
+            self._track(key, digest, len(content))
+            self._evict()
+            return CachedCover(path, digest, os.stat(path))
+
+    def fetch_lock(self, key: str) -> asyncio.Lock:
+        """Per-key lock so concurrent misses trigger a single upstream fetch."""
+        return self._fetch_locks.setdefault(key, asyncio.Lock())
+
+    def release_fetch_lock(self, key: str, lock: asyncio.Lock) -> None:
+        if not lock.locked() and self._fetch_locks.get(key) is lock:
+            del self._fetch_locks[key]
+
+
+_cache: Optional[CoverCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cover_cache() -> CoverCache:
+    """
+    Get the process-wide cover cache, creating it on first use.
+
+    Creating it scans the cache directory, so call this off the event loop.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CoverCache(settings.cover_cache_dir, settings.cover_cache_max_mb * 1024 * 1024)
+    return _cache
+
+
+class CoverService:
+    """Service for proxying and caching Open Library cover images."""
+
+    @staticmethod
+    async def _fetch(cover_id: int, size: str) -> bytes:
+        """
+        Download a cover from Open Library.
+
+        Raises:
+            HTTPException: If the cover does not exist or the request fails
+        """
+        import httpx  # deferred so workers that never proxy covers don't load it
+
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(
+                    f"{settings.open_library_covers_url}/b/id/{cover_id}-{size}.jpg",
+                    params={"default": "false"},
+                    follow_redirects=True,
+                    timeout=10.0
+                )
+        except httpx.HTTPError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Failed to fetch cover: {str(e)}"
+            )
+
+        if response.status_code == status.HTTP_404_NOT_FOUND:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cover not found"
+            )
+        if response.is_error:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Failed to fetch cover: HTTP {response.status_code}"
+            )
+        return response.content
+
+    @staticmethod
+    def is_book_cover(db: Session, cover_id: int) -> bool:
+        """Check that some book's ``cover_url`` is the Open Library cover ``cover_id``."""
+        return db.query(Book.id).filter(Book.cover_id == cover_id).first() is not None
+
+    @staticmethod
+    async def get_cover(
+        cover_id: int,
+        size: str,
+        db: Optional[Session] = None
+    ) -> CachedCover:
+        """
+        Get a cover from the cache, fetching it from Open Library on first use.
+
+        Args:
+            cover_id: Open Library cover ID
+            size: Cover size ("S", "M" or "L")
+            db: Session used to check, before fetching an uncached cover, that
+                a book uses it; None when the ID comes from a stored book
+
+        Returns:
+            The cached cover
+
+        Raises:
+            HTTPException: If no book uses the cover or it can't be fetched
+        """
+        cache = await asyncio.to_thread(get_cover_cache)
+        key = f"{cover_id}-{size}"
+
+        hit = await asyncio.to_thread(cache.lookup, key)
+        if hit:
+            return hit
+
+        if db is not None and not await asyncio.to_thread(CoverService.is_book_cover, db, cover_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cover not found"
+            )
+
+        lock = cache.fetch_lock(key)
+        try:
+            async with lock:
+                hit = await asyncio.to_thread(cache.lookup, key)
+                if hit:
+                    return hit
+                content = await CoverService._fetch(cover_id, size)
+                return await asyncio.to_thread(cache.store, key, content)
+        finally:
+            cache.release_fetch_lock(key, lock)
+
+    @staticmethod
+    async def prefetch(cover_id: int, size: str) -> None:
+        """Warm the cache for a cover (used as a background task); errors are logged."""
+        try:
+            await CoverService.get_cover(cover_id, size)
+        except HTTPException as e:
+            logger.info(f"Cover prefetch for {cover_id}-{size} skipped: {e.detail}")
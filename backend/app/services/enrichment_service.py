@@ -0,0 +1,204 @@
+"""Background enrichment of book metadata from Open Library."""
+import asyncio
+import logging
+import random
+from datetime import datetime
+from statistics import median
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
+from uuid import UUID
+from ..config import get_settings
+from ..database import SessionLocal
+from ..models.book import Book
+
+if TYPE_CHECKING:
+    import httpx
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+MAX_SUBJECTS = 20
+
+
+class EnrichmentError(Exception):
+    """Raised when an enrichment attempt fails and may be retried."""
+
+
+class EnrichmentService:
+    """
+    Enriches new Book rows (page count, edition count, subjects) off the request path.
+
+    Jobs go through a bounded in-process queue drained by a few worker tasks.
+    Failed jobs are retried with exponential backoff; when the queue is full
+    new jobs are dropped and picked up again the next time the book is listed.
+    """
+
+    _queue: Optional[asyncio.Queue] = None
+    _workers: List[asyncio.Task] = []
+    _pending: Set[UUID] = set()
+
+    @classmethod
+    async def start(cls) -> None:
+        """Start the worker tasks (called on application startup)."""
+        cls._queue = asyncio.Queue(maxsize=settings.enrichment_queue_size)
+        cls._pending = set()
+        cls._workers = [
+            asyncio.create_task(cls._worker()) for _ in range(settings.enrichment_workers)
+        ]
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Cancel the worker tasks (called on application shutdown)."""
+        for task in cls._workers:
+            task.cancel()
+        await asyncio.gather(*cls._workers, return_exceptions=True)
+        cls._workers = []
+        cls._queue = None
+
+    @classmethod
+    def enqueue(cls, book_id: UUID, attempt: int = 0) -> bool:
+        """
+        Queue a book for enrichment.
+
+        Returns:
+            True if queued, False if the worker isn't running, the book is
+            already queued, or the queue is full
+        """
+        if cls._queue is None or (attempt == 0 and book_id in cls._pending):
+            return False
+        try:
+            cls._queue.put_nowait((book_id, attempt))
+        except asyncio.QueueFull:
+            logger.warning(f"Enrichment queue full, dropping book {book_id}")
+            cls._pending.discard(book_id)
+            return False
+        cls._pending.add(book_id)
+        return True
+
+    @classmethod
+    def enqueue_if_needed(cls, book: Book) -> None:
+        """Queue a book unless it has already been enriched."""
+        if book.enriched_at is None:
+            cls.enqueue(book.id)
+
+    @classmethod
+    async def _worker(cls) -> None:
+        queue = cls._queue
+        while True:
+            book_id, attempt = await queue.get()
+            try:
+                await cls._enrich(book_id)
+                cls._pending.discard(book_id)
+            except EnrichmentError as e:
+                if attempt + 1 < settings.enrichment_max_attempts:
+                    delay = settings.enrichment_backoff_seconds * (2 ** attempt) * random.uniform(0.5, 1.5)
+                    logger.info(f"Enrichment of book {book_id} failed ({e}), retrying in {delay:.1f}s")
+                    asyncio.get_running_loop().call_later(delay, cls.enqueue, book_id, attempt + 1)
+                else:
+                    logger.warning(f"Giving up enrichment of book {book_id}: {e}")
+                    cls._pending.discard(book_id)
+            except Exception as e:
+                logger.error(f"Unexpected error enriching book {book_id}: {e}", exc_info=True)
+                cls._pending.discard(book_id)
+            finally:
+                queue.task_done()
+
+    @classmethod
+    async def _enrich(cls, book_id: UUID) -> None:
+        identifiers = await asyncio.to_thread(cls._load_identifiers, book_id)
+        if identifiers is None:
+            return
+        import httpx  # deferred until the first book is actually enriched
+
+        try:
+            metadata = await cls.fetch_metadata(*identifiers)
+        except httpx.HTTPError as e:
+            raise EnrichmentError(f"Open Library request failed: {e}") from e
+        await asyncio.to_thread(cls._store_metadata, book_id, metadata)
+
+    @staticmethod
+    def _load_identifiers(book_id: UUID) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """Return (isbn, open_library_id), or None if the book is gone or already enriched."""
+        db = SessionLocal()
+        try:
+            row = db.query(Book.isbn, Book.open_library_id, Book.enriched_at).filter(
+                Book.id == book_id
+            ).first()
+        finally:
+            db.close()
+        if row is None or row.enriched_at is not None:
+            return None
+        return row.isbn, row.open_library_id
+
+    @staticmethod
+    def _store_metadata(book_id: UUID, metadata: dict) -> None:
+        db = SessionLocal()
+        try:
+            db.query(Book).filter(Book.id == book_id).update(
+                {**metadata, "enriched_at": datetime.utcnow()},
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    async def _get_json(client: "httpx.AsyncClient", path: str, **params) -> Optional[dict]:
+        """GET an Open Library JSON document; None on 404, EnrichmentError on other failures."""
+        response = await client.get(
+            f"{settings.open_library_api_url}{path}",
+            params=params,
+            follow_redirects=True,
+            timeout=10.0
+        )
+        if response.status_code == 404:
+            return None
+        if response.is_error:
+            raise EnrichmentError(f"Open Library returned HTTP {response.status_code} for {path}")
+        return response.json()
+
+    @staticmethod
+    async def fetch_metadata(isbn: Optional[str], open_library_id: Optional[str]) -> dict:
+        """
+        Fetch page count, edition count and subjects for a book.
+
+        The page count comes from the ISBN's edition when known, otherwise
+        the median over the work's editions.
+
+        Args:
+            isbn: Normalized ISBN-13
+            open_library_id: Open Library work ID (e.g. "OL123W")
+
+        Returns:
+            Dict of Book column values to update
+        """
+        import httpx
+
+        metadata = {}
+        async with httpx.AsyncClient() as client:
+            if isbn:
+                edition = await EnrichmentService._get_json(client, f"/isbn/{isbn}.json")
+                if edition:
+                    if edition.get("number_of_pages"):
+                        metadata["page_count"] = edition["number_of_pages"]
+                    if not open_library_id and edition.get("works"):
+                        open_library_id = edition["works"][0]["key"].split("/")[-1]
+
+            if open_library_id and open_library_id.endswith("W"):
+                work = await EnrichmentService._get_json(client, f"/works/{open_library_id}.json")
+                if work and work.get("subjects"):
+                    metadata["subjects"] = work["subjects"][:MAX_SUBJECTS]
+
+                editions = await EnrichmentService._get_json(
+                    client, f"/works/{open_library_id}/editions.json", limit=50
+                )
+                if editions:
+                    metadata["edition_count"] = editions.get("size")
+                    pages = [
+                        entry["number_of_pages"]
+                        for entry in editions.get("entries", [])
+                        if entry.get("number_of_pages")
+                    ]
+                    if pages and "page_count" not in metadata:
+                        metadata["page_count"] = int(median(pages))
+
+        return metadata
@@ -2,7 +2,7 @@
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import func
+from sqlalchemy import func, lambda_stmt, select
 from fastapi import HTTPException, status
 from ..config import get_settings
 from ..models.group import Group, GroupMember
@@ -16,6 +16,30 @@ settings = get_settings()
 class GroupService:
     """Service for handling group operations."""
 
+    @staticmethod
+    def get_membership(db: Session, group_id: UUID, user_id: UUID) -> Optional[GroupMember]:
+        """
+        Get a user's membership in a group.
+
+        This check runs on nearly every group-scoped request, so it is a
+        lambda statement: SQLAlchemy builds and caches the SELECT once and
+        later calls only bind new parameter values.
+
+        Args:
+            db: Database session
+            group_id: Group UUID
+            user_id: User UUID
+
+        Returns:
+            GroupMember instance or None
+        """
+        return db.execute(lambda_stmt(
+            lambda: select(GroupMember).where(
+                GroupMember.group_id == group_id,
+                GroupMember.user_id == user_id
+            ).limit(1)
+        )).scalars().first()
+
     @staticmethod
     def create_group(
         db: Session,
@@ -56,7 +80,6 @@ class GroupService:
         )
         db.add(membership)
         db.commit()
-        db.refresh(group)
         return group
 
     @staticmethod
@@ -89,10 +112,7 @@ class GroupService:
             )
 
         # Verify user is member
-        membership = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id
-        ).first()
+        membership = GroupService.get_membership(db, group_id, user_id)
         if not membership:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -149,12 +169,8 @@ class GroupService:
             )
 
         # Verify user is admin
-        membership = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id,
-            GroupMember.role == "admin"
-        ).first()
-        if not membership:
+        membership = GroupService.get_membership(db, group_id, user_id)
+        if not membership or membership.role != "admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only group admins can update group information"
@@ -167,7 +183,6 @@ class GroupService:
             group.description = group_data.description
 
         db.commit()
-        db.refresh(group)
         return group
 
     @staticmethod
@@ -195,12 +210,8 @@ class GroupService:
             )
 
         # Verify user is admin
-        membership = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id,
-            GroupMember.role == "admin"
-        ).first()
-        if not membership:
+        membership = GroupService.get_membership(db, group_id, user_id)
+        if not membership or membership.role != "admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only group admins can delete the group"
@@ -238,10 +249,7 @@ class GroupService:
             )
 
         # Check if already a member
-        existing = db.query(GroupMember).filter(
-            GroupMember.group_id == group.id,
-            GroupMember.user_id == user_id
-        ).first()
+        existing = GroupService.get_membership(db, group.id, user_id)
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -266,7 +274,6 @@ class GroupService:
         )
         db.add(membership)
         db.commit()
-        db.refresh(group)
         return group
 
     @staticmethod
@@ -286,10 +293,7 @@ class GroupService:
         Raises:
             HTTPException: If not a member or last admin
         """
-        membership = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id
-        ).first()
+        membership = GroupService.get_membership(db, group_id, user_id)
         if not membership:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -332,10 +336,7 @@ class GroupService:
             HTTPException: If user not a member
         """
         # Verify user is member
-        membership = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id
-        ).first()
+        membership = GroupService.get_membership(db, group_id, user_id)
         if not membership:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -366,22 +367,15 @@ class GroupService:
             HTTPException: If not authorized or member not found
         """
         # Verify user is admin
-        admin_membership = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id,
-            GroupMember.role == "admin"
-        ).first()
-        if not admin_membership:
+        admin_membership = GroupService.get_membership(db, group_id, user_id)
+        if not admin_membership or admin_membership.role != "admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only group admins can remove members"
             )
 
         # Find member to remove
-        member = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == member_id
-        ).first()
+        member = GroupService.get_membership(db, group_id, member_id)
         if not member:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -426,22 +420,15 @@ class GroupService:
             HTTPException: If not authorized or member not found
         """
         # Verify user is admin
-        admin_membership = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id,
-            GroupMember.role == "admin"
-        ).first()
-        if not admin_membership:
+        admin_membership = GroupService.get_membership(db, group_id, user_id)
+        if not admin_membership or admin_membership.role != "admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only group admins can promote members"
             )
 
         # Find member to promote
-        member = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == member_id
-        ).first()
+        member = GroupService.get_membership(db, group_id, member_id)
         if not member:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -456,5 +443,4 @@ class GroupService:
 
         member.role = "admin"
         db.commit()
-        db.refresh(member)
         return member
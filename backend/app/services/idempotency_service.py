@@ -0,0 +1,211 @@
+"""Idempotency-Key handling for retried POST requests."""
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from typing import Mapping, Optional
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+from starlette.responses import Response
+from ..config import get_settings
+from ..database import SessionLocal
+from ..models.idempotency import IdempotencyKey
+from ..utils.idempotency import (
+    IN_PROGRESS_SECONDS,
+    IdempotencyKeyInUse,
+    IdempotencyKeyReused,
+    IdempotencyStore,
+    MemoryIdempotencyStore,
+    StoredResponse,
+)
+from ..utils.metrics import Counter
+
+settings = get_settings()
+
+IDEMPOTENT_REPLAYS = Counter(
+    "bookclub_idempotent_replays_total",
+    "Requests answered from the Idempotency-Key store instead of being run again.",
+)
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """
+    Store shared by all workers, in the ``idempotency_keys`` table.
+
+    Claiming a key is one upsert that only overwrites an expired row;
+    a user's expired rows are deleted when they finish their next request.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+
+    def begin(self, user_id: UUID, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        now = datetime.utcnow()
+        claim = insert(IdempotencyKey).values(
+            user_id=user_id,
+            key=key,
+            fingerprint=fingerprint,
+            expires_at=now + timedelta(seconds=IN_PROGRESS_SECONDS)
+        )
+        claim = claim.on_conflict_do_update(
+            index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+            set_={
+                "fingerprint": claim.excluded.fingerprint,
+                "status_code": None,
+                "body": None,
+                "expires_at": claim.excluded.expires_at,
+            },
+            where=IdempotencyKey.expires_at <= now
+        ).returning(IdempotencyKey.key)
+
+        db = SessionLocal()
+        try:
+            claimed = db.execute(claim).first()
+            existing = None if claimed else db.get(IdempotencyKey, (user_id, key))
+            db.commit()
+        finally:
+            db.close()
+
+        if claimed:
+            return None
+        if existing is None:
+            raise IdempotencyKeyInUse(key)
+        if existing.fingerprint != fingerprint:
+            raise IdempotencyKeyReused(key)
+        if existing.status_code is None:
+            raise IdempotencyKeyInUse(key)
+        return StoredResponse(existing.status_code, existing.body)
+
+    def finish(self, user_id: UUID, key: str, response: StoredResponse) -> None:
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(IdempotencyKey).where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key
+                ).values(
+                    status_code=response.status_code,
+                    body=response.body,
+                    expires_at=now + timedelta(seconds=self.ttl)
+                )
+            )
+            db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.expires_at <= now
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def abandon(self, user_id: UUID, key: str) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.status_code.is_(None)
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+
+def _build_store() -> IdempotencyStore:
+    if settings.idempotency_store == "memory":
+        return MemoryIdempotencyStore(settings.idempotency_max_keys, settings.idempotency_ttl_seconds)
+    if settings.idempotency_store == "database":
+        return DatabaseIdempotencyStore(settings.idempotency_ttl_seconds)
+    raise ValueError(f"Unknown IDEMPOTENCY_STORE {settings.idempotency_store!r} (use 'memory' or 'database')")
+
+
+idempotency_store = _build_store()
+
+
+class IdempotencyService:
+    """
+    Lets clients safely retry a POST by sending an ``Idempotency-Key`` header.
+
+    The first request with a key runs normally and its response is stored
+    for ``idempotency_ttl_seconds``; a retry with the same key, path and
+    body gets that response back (with ``Idempotent-Replayed: true``)
+    without the route running again. Requests without the header are not
+    affected. Failed requests are not stored, so they can be retried.
+
+    The store is called in a worker thread: the database store runs its
+    own short transactions, apart from the request's session, and must not
+    block the event loop while it does.
+    """
+
+    @staticmethod
+    def fingerprint(path: str, body: str) -> str:
+        """Hash identifying the request a key was first used for."""
+        return hashlib.blake2b(f"{path}\n{body}".encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    async def begin(
+        user_id: UUID,
+        key: Optional[str],
+        fingerprint: str,
+        headers: Mapping[str, str]
+    ) -> Optional[Response]:
+        """
+        Claim an idempotency key, or get the response it already produced.
+
+        Args:
+            user_id: User UUID
+            key: Idempotency-Key header value, if sent
+            fingerprint: ``fingerprint()`` of this request
+            headers: Headers to add to a replayed response
+
+        Returns:
+            The original response to return as-is, or None to run the request
+
+        Raises:
+            HTTPException: If the key's request is still running or the key
+                was used for a different request
+        """
+        if key is None:
+            return None
+        try:
+            stored = await asyncio.to_thread(idempotency_store.begin, user_id, key, fingerprint)
+        except IdempotencyKeyInUse:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress"
+            )
+        except IdempotencyKeyReused:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="This Idempotency-Key was already used for a different request"
+            )
+        if stored is None:
+            return None
+        IDEMPOTENT_REPLAYS.inc()
+        return Response(
+            stored.body,
+            status_code=stored.status_code,
+            media_type="application/json",
+            headers={**headers, REPLAYED_HEADER: "true"}
+        )
+
+    @staticmethod
+    async def finish(user_id: UUID, key: Optional[str], response: Response) -> None:
+        """Store a successful response under the key claimed by ``begin``."""
+        if key is not None:
+            await asyncio.to_thread(
+                idempotency_store.finish, user_id, key, StoredResponse(response.status_code, response.body)
+            )
+
+    @staticmethod
+    async def abandon(user_id: UUID, key: Optional[str]) -> None:
+        """Release the key claimed by ``begin`` after the request failed."""
+        if key is not None:
+            await asyncio.to_thread(idempotency_store.abandon, user_id, key)
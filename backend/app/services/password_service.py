@@ -0,0 +1,89 @@
+"""Off-loop password hashing with admission control."""
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from ..config import get_settings
+from ..utils.metrics import Counter, Gauge, Histogram
+from ..utils.security import get_password_hash, verify_and_update_password
+
+settings = get_settings()
+
+PASSWORD_HASH_SECONDS = Histogram(
+    "bookclub_password_hash_seconds",
+    "Time to hash or verify a password, including time queued for a worker.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "bookclub_password_hash_queue_depth",
+    "Password hash jobs admitted and not yet finished (running + waiting).",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "bookclub_password_hash_rejected_total",
+    "Password hash jobs shed with 429 because the queue was full.",
+)
+
+
+class PasswordService:
+    """
+    Runs bcrypt in a bounded process pool so hashing never blocks the event loop.
+
+    At most ``password_hash_workers + password_hash_queue_size`` jobs are
+    admitted per process; beyond that requests are shed with 429 so a
+    credential-stuffing burst cannot starve other traffic of CPU.
+    """
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _in_flight = 0
+
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(max_workers=settings.password_hash_workers)
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the worker processes (called on application shutdown)."""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+
+    @classmethod
+    async def _run(cls, operation: str, fn, *args):
+        if cls._in_flight >= settings.password_hash_workers + settings.password_hash_queue_size:
+            PASSWORD_HASH_REJECTED.inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication attempts, please try again shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        cls._in_flight += 1
+        PASSWORD_HASH_QUEUE_DEPTH.set(cls._in_flight)
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(cls._get_executor(), fn, *args)
+        finally:
+            cls._in_flight -= 1
+            PASSWORD_HASH_QUEUE_DEPTH.set(cls._in_flight)
+            PASSWORD_HASH_SECONDS.labels(operation).observe(time.perf_counter() - start)
+
+    @classmethod
+    async def hash_password(cls, password: str) -> str:
+        """Hash a password with the current scheme and cost."""
+        return await cls._run("hash", get_password_hash, password)
+
+    @classmethod
+    async def verify_password(cls, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password, rehashing it if the stored hash is outdated.
+
+        Returns:
+            Tuple of (valid, new_hash); new_hash is set when the stored hash
+            should be replaced
+        """
+        return await cls._run("verify", verify_and_update_password, password, hashed_password)
@@ -1,13 +1,15 @@
 """Progress service for managing reading progress."""
 from typing import List, Optional
 from uuid import UUID
-from decimal import Decimal
+from datetime import datetime
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from ..models.progress import UserReadingProgress
-from ..models.group import GroupMember
 from ..models.book import Book
 from ..schemas.progress import ProgressCreate, ProgressUpdate
+from .group_service import GroupService
 
 
 class ProgressService:
@@ -34,10 +36,7 @@ class ProgressService:
             HTTPException: If validation fails
         """
         # Verify user is member of group
-        membership = db.query(GroupMember).filter(
-            GroupMember.group_id == progress_data.group_id,
-            GroupMember.user_id == user_id
-        ).first()
+        membership = GroupService.get_membership(db, progress_data.group_id, user_id)
         if not membership:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -45,54 +44,51 @@ class ProgressService:
             )
 
         # Verify book exists
-        book = db.query(Book).filter(Book.id == progress_data.book_id).first()
+        book = db.get(Book, progress_data.book_id)
         if not book:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Book not found"
             )
 
+        # Prefill total pages from enriched book metadata
+        total_pages = progress_data.total_pages or book.page_count
+        if not total_pages:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Total pages is required for this book"
+            )
+
         # Validate progress
-        if progress_data.current_page > progress_data.total_pages:
+        if progress_data.current_page > total_pages:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current page cannot exceed total pages"
             )
 
-        # Calculate progress percentage
-        progress_percentage = (
-            Decimal(progress_data.current_page) / Decimal(progress_data.total_pages) * 100
+        # Insert or update in one statement; RETURNING hands back the stored row
+        stmt = insert(UserReadingProgress).values(
+            user_id=user_id,
+            book_id=progress_data.book_id,
+            group_id=progress_data.group_id,
+            current_page=progress_data.current_page,
+            total_pages=total_pages
         )
-
-        # Check if progress already exists
-        existing = db.query(UserReadingProgress).filter(
-            UserReadingProgress.user_id == user_id,
-            UserReadingProgress.book_id == progress_data.book_id,
-            UserReadingProgress.group_id == progress_data.group_id
-        ).first()
-
-        if existing:
-            # Update existing progress
-            existing.current_page = progress_data.current_page
-            existing.total_pages = progress_data.total_pages
-            existing.progress_percentage = progress_percentage
-            db.commit()
-            db.refresh(existing)
-            return existing
-        else:
-            # Create new progress
-            progress = UserReadingProgress(
-                user_id=user_id,
-                book_id=progress_data.book_id,
-                group_id=progress_data.group_id,
-                current_page=progress_data.current_page,
-                total_pages=progress_data.total_pages,
-                progress_percentage=progress_percentage
-            )
-            db.add(progress)
-            db.commit()
-            db.refresh(progress)
-            return progress
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                UserReadingProgress.user_id,
+                UserReadingProgress.book_id,
+                UserReadingProgress.group_id
+            ],
+            set_={
+                "current_page": stmt.excluded.current_page,
+                "total_pages": stmt.excluded.total_pages,
+                "updated_at": datetime.utcnow()
+            }
+        ).returning(UserReadingProgress)
+        progress = db.scalars(stmt, execution_options={"populate_existing": True}).one()
+        db.commit()
+        return progress
 
     @staticmethod
     def update_progress(
@@ -116,9 +112,7 @@ class ProgressService:
         Raises:
             HTTPException: If not found or not authorized
         """
-        progress = db.query(UserReadingProgress).filter(
-            UserReadingProgress.id == progress_id
-        ).first()
+        progress = db.get(UserReadingProgress, progress_id)
 
         if not progress:
             raise HTTPException(
@@ -132,23 +126,18 @@ class ProgressService:
                 detail="You can only update your own progress"
             )
 
+        total_pages = progress_data.total_pages or progress.total_pages
+
         # Validate progress
-        if progress_data.current_page > progress_data.total_pages:
+        if progress_data.current_page > total_pages:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current page cannot exceed total pages"
             )
 
-        # Calculate progress percentage
-        progress_percentage = (
-            Decimal(progress_data.current_page) / Decimal(progress_data.total_pages) * 100
-        )
-
         progress.current_page = progress_data.current_page
-        progress.total_pages = progress_data.total_pages
-        progress.progress_percentage = progress_percentage
+        progress.total_pages = total_pages
         db.commit()
-        db.refresh(progress)
         return progress
 
     @staticmethod
@@ -170,11 +159,14 @@ class ProgressService:
         Returns:
             UserReadingProgress instance or None
         """
-        return db.query(UserReadingProgress).filter(
-            UserReadingProgress.user_id == user_id,
-            UserReadingProgress.book_id == book_id,
-            UserReadingProgress.group_id == group_id
-        ).first()
+        # Hot path (every comment read); cached as a lambda statement
+        return db.execute(lambda_stmt(
+            lambda: select(UserReadingProgress).where(
+                UserReadingProgress.user_id == user_id,
+                UserReadingProgress.book_id == book_id,
+                UserReadingProgress.group_id == group_id
+            ).limit(1)
+        )).scalars().first()
 
     @staticmethod
     def get_user_all_progress(
@@ -225,10 +217,7 @@ class ProgressService:
             HTTPException: If user not member of group
         """
         # Verify user is member of group
-        membership = db.query(GroupMember).filter(
-            GroupMember.group_id == group_id,
-            GroupMember.user_id == user_id
-        ).first()
+        membership = GroupService.get_membership(db, group_id, user_id)
         if not membership:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -238,7 +227,7 @@ class ProgressService:
         return db.query(UserReadingProgress).filter(
             UserReadingProgress.group_id == group_id,
             UserReadingProgress.book_id == book_id
-        ).order_by(UserReadingProgress.progress_percentage.desc()).all()
+        ).order_by(UserReadingProgress.progress_bp.desc()).all()
 
     @staticmethod
     def delete_progress(
@@ -257,9 +246,7 @@ class ProgressService:
         Raises:
             HTTPException: If not found or not authorized
         """
-        progress = db.query(UserReadingProgress).filter(
-            UserReadingProgress.id == progress_id
-        ).first()
+        progress = db.get(UserReadingProgress, progress_id)
 
         if not progress:
             raise HTTPException(
@@ -0,0 +1,210 @@
+"""Spoiler report service: reporting, auto-hiding and the moderation queue."""
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, false, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from fastapi import HTTPException, status
+from ..config import get_settings
+from ..models.comment import Comment
+from ..models.report import SpoilerReport
+from ..utils.metrics import Counter
+from .comment_service import CommentService, visibility_index
+from .group_service import GroupService
+
+settings = get_settings()
+
+COMMENTS_AUTO_HIDDEN = Counter(
+    "bookclub_comments_auto_hidden_total",
+    "Comments hidden because their spoiler reports reached the threshold.",
+)
+
+
+class ReportService:
+    """Service for spoiler reports and their moderation."""
+
+    @staticmethod
+    def report_comment(
+        db: Session,
+        comment_id: UUID,
+        user_id: UUID,
+        reason: str
+    ) -> Tuple[int, bool]:
+        """
+        Report a comment as a spoiler.
+
+        Reporting is idempotent: a user's first report is stored and counted,
+        repeats change nothing until an admin dismisses the reports. The comment is hidden from feeds as soon as
+        its count reaches ``spoiler_report_hide_threshold``.
+
+        Args:
+            db: Database session
+            comment_id: Comment UUID
+            user_id: Reporting user's UUID
+            reason: Why the comment is a spoiler
+
+        Returns:
+            Tuple of (the comment's report count, whether it is hidden)
+
+        Raises:
+            HTTPException: If the comment is not visible to the user or is their own
+        """
+        comment = CommentService.get_comment_by_id(db, comment_id, user_id, include_hidden=True)
+        if comment.user_id == user_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You cannot report your own comment"
+            )
+
+        inserted = db.execute(
+            insert(SpoilerReport).values(
+                comment_id=comment_id,
+                group_id=comment.group_id,
+                reported_by=user_id,
+                reason=reason
+            ).on_conflict_do_nothing(
+                index_elements=[SpoilerReport.comment_id, SpoilerReport.reported_by],
+                index_where=SpoilerReport.status != "dismissed"
+            ).returning(SpoilerReport.id)
+        ).first()
+        if inserted is None:
+            return comment.report_count, comment.hidden_at is not None
+
+        # Count and hide in the same row update, so concurrent reports can't both miss the threshold
+        threshold = settings.spoiler_report_hide_threshold
+        now = datetime.utcnow()
+        crosses = and_(
+            Comment.hidden_at.is_(None),
+            Comment.report_count + 1 >= threshold
+        ) if threshold > 0 else false()
+        report_count, hidden_at = db.execute(
+            update(Comment).where(
+                Comment.id == comment_id
+            ).values(
+                report_count=Comment.report_count + 1,
+                hidden_at=case((crosses, now), else_=Comment.hidden_at)
+            ).returning(
+                Comment.report_count,
+                Comment.hidden_at
+            ).execution_options(synchronize_session=False)
+        ).one()
+        db.commit()
+
+        if hidden_at == now:
+            COMMENTS_AUTO_HIDDEN.inc()
+            visibility_index.remove((comment.group_id, comment.book_id), comment.id, comment.progress_bp)
+        return report_count, hidden_at is not None
+
+    @staticmethod
+    def _require_admin(db: Session, group_id: UUID, user_id: UUID) -> None:
+        membership = GroupService.get_membership(db, group_id, user_id)
+        if not membership or membership.role != "admin":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only group admins can moderate reports"
+            )
+
+    @staticmethod
+    def get_moderation_queue(
+        db: Session,
+        group_id: UUID,
+        user_id: UUID,
+        limit: int,
+        after: Optional[UUID] = None
+    ) -> Tuple[List[Tuple[SpoilerReport, Comment]], Optional[UUID]]:
+        """
+        Get a page of a group's pending reports, oldest first.
+
+        Args:
+            db: Database session
+            group_id: Group UUID
+            user_id: Admin's user UUID
+            limit: Maximum number of reports
+            after: Last report of the previous page
+
+        Returns:
+            ``(report, comment)`` pairs and the cursor for the next page, or
+            None on the last page
+
+        Raises:
+            HTTPException: If the user is not a group admin or the cursor is invalid
+        """
+        ReportService._require_admin(db, group_id, user_id)
+
+        # Served by the partial (group_id, created_at, id) index on pending reports
+        query = select(SpoilerReport, Comment).join(
+            Comment, SpoilerReport.comment_id == Comment.id
+        ).where(
+            SpoilerReport.group_id == group_id,
+            SpoilerReport.status == "pending"
+        )
+        if after is not None:
+            cursor = db.get(SpoilerReport, after)
+            if not cursor or cursor.group_id != group_id:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid report cursor")
+            query = query.where(
+                tuple_(SpoilerReport.created_at, SpoilerReport.id) > tuple_(cursor.created_at, cursor.id)
+            )
+
+        rows = db.execute(
+            query.order_by(SpoilerReport.created_at, SpoilerReport.id).limit(limit)
+        ).all()
+        next_after = rows[-1][0].id if len(rows) == limit else None
+        return rows, next_after
+
+    @staticmethod
+    def review_report(
+        db: Session,
+        report_id: UUID,
+        user_id: UUID,
+        decision: str
+    ) -> None:
+        """
+        Resolve or dismiss every pending report of a reported comment.
+
+        ``resolved`` confirms the spoiler and keeps the comment hidden (hiding
+        it if the threshold was not reached); ``dismissed`` restores it,
+        resets its report count and dismisses its earlier resolved reports
+        too, so every reporter can report it again.
+
+        Args:
+            db: Database session
+            report_id: Any report of the comment
+            user_id: Admin's user UUID
+            decision: 'resolved' or 'dismissed'
+
+        Raises:
+            HTTPException: If the report is not found or the user is not a group admin
+        """
+        report = db.get(SpoilerReport, report_id)
+        if not report:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Report not found"
+            )
+        ReportService._require_admin(db, report.group_id, user_id)
+
+        comment = db.get(Comment, report.comment_id)
+        was_hidden = comment.hidden_at is not None
+
+        reviewed = ("pending",) if decision == "resolved" else ("pending", "resolved")
+        db.execute(
+            update(SpoilerReport).where(
+                SpoilerReport.comment_id == comment.id,
+                SpoilerReport.status.in_(reviewed)
+            ).values(status=decision).execution_options(synchronize_session=False)
+        )
+        if decision == "resolved":
+            if not was_hidden:
+                comment.hidden_at = datetime.utcnow()
+        else:
+            comment.hidden_at = None
+            comment.report_count = 0
+        db.commit()
+
+        key = (comment.group_id, comment.book_id)
+        if decision == "resolved" and not was_hidden:
+            visibility_index.remove(key, comment.id, comment.progress_bp)
+        elif decision == "dismissed" and was_hidden and comment.deleted_at is None:
+            visibility_index.add(key, comment.id, comment.progress_bp, comment.created_at)
@@ -0,0 +1,34 @@
+"""Open Library cover URL helpers."""
+import re
+from typing import Optional
+
+COVER_SIZES = ("S", "M", "L")
+
+# Size used for BookCard thumbnails (and pre-fetched when a book is created)
+THUMBNAIL_SIZE = "M"
+
+_COVER_URL_RE = re.compile(r"/b/id/(\d{1,9})-[SML]\.jpg")  # Same pattern as Book.cover_id
+
+
+def cover_id_from_url(cover_url: Optional[str]) -> Optional[int]:
+    """
+    Extract the Open Library cover ID from a covers.openlibrary.org URL.
+
+    Args:
+        cover_url: URL like https://covers.openlibrary.org/b/id/12345-M.jpg
+
+    Returns:
+        Cover ID, or None if the URL is not an Open Library cover-by-ID URL
+    """
+    if not cover_url:
+        return None
+    match = _COVER_URL_RE.search(cover_url)
+    return int(match.group(1)) if match else None
+
+
+def cover_proxy_path(cover_url: Optional[str], size: str = THUMBNAIL_SIZE) -> Optional[str]:
+    """Return the API path serving a cached copy of the cover, if it can be proxied."""
+    cover_id = cover_id_from_url(cover_url)
+    if cover_id is None:
+        return None
+    return f"/covers/{cover_id}/{size}"
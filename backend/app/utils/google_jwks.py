@@ -0,0 +1,101 @@
+"""Cached Google signing certificates (JWKS) for local ID token verification."""
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSCache:
+    """
+    In-memory JWKS cache that honors the endpoint's Cache-Control max-age.
+
+    Keys are refreshed in the background shortly before they expire, so the
+    login path only waits on the network for the very first fetch, after an
+    idle period longer than the TTL, or when a token names a key id we have
+    never seen (Google rotated its keys).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        default_ttl: float = 3600.0,
+        refresh_margin: float = 300.0,
+        min_refetch_interval: float = 30.0,
+    ):
+        self.url = url
+        self.default_ttl = default_ttl
+        self.refresh_margin = refresh_margin
+        self.min_refetch_interval = min_refetch_interval
+        self._keys: Dict[str, dict] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._background: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _max_age(cache_control: Optional[str]) -> Optional[int]:
+        if not cache_control:
+            return None
+        match = _MAX_AGE_RE.search(cache_control)
+        return int(match.group(1)) if match else None
+
+    async def refresh(self) -> None:
+        """Fetch the key set, coalescing concurrent refreshes into one request."""
+        import httpx  # deferred until the first Google login
+
+        fetched_before = self._fetched_at
+        async with self._lock:
+            if self._fetched_at != fetched_before:
+                return  # another coroutine refreshed while we waited
+
+            async with httpx.AsyncClient() as client:
+                response = await client.get(self.url, timeout=10.0)
+                response.raise_for_status()
+
+            ttl = self._max_age(response.headers.get("cache-control"))
+            self._keys = {key["kid"]: key for key in response.json().get("keys", []) if "kid" in key}
+            self._fetched_at = time.monotonic()
+            self._expires_at = self._fetched_at + (ttl if ttl is not None else self.default_ttl)
+
+    def _schedule_refresh(self) -> None:
+        if self._background is None or self._background.done():
+            self._background = asyncio.create_task(self._refresh_quietly())
+
+    async def _refresh_quietly(self) -> None:
+        import httpx
+
+        try:
+            await self.refresh()
+        except httpx.HTTPError as e:
+            logger.warning(f"Background JWKS refresh from {self.url} failed: {e}")
+
+    async def get_key(self, kid: str) -> Optional[dict]:
+        """
+        Get the JWK for a key id.
+
+        Args:
+            kid: Key id from the token header
+
+        Returns:
+            JWK dict, or None if the key set does not contain ``kid``
+
+        Raises:
+            httpx.HTTPError: If the key set has to be fetched and the request fails
+        """
+        now = time.monotonic()
+        key = self._keys.get(kid)
+
+        if key is not None and now < self._expires_at:
+            if now >= self._expires_at - self.refresh_margin:
+                self._schedule_refresh()
+            return key
+
+        # Expired, or unknown kid (rotation); don't let bogus kids trigger a request storm
+        if key is not None or not self._keys or now - self._fetched_at >= self.min_refetch_interval:
+            await self.refresh()
+        return self._keys.get(kid)
@@ -0,0 +1,106 @@
+"""Idempotency-key bookkeeping: the store interface and its in-memory implementation."""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional, Tuple
+
+# How long a key stays locked by a request that never finished (e.g. the worker died)
+IN_PROGRESS_SECONDS = 60.0
+
+
+class StoredResponse(NamedTuple):
+    """A finished request's JSON response."""
+    status_code: int
+    body: bytes
+
+
+class IdempotencyKeyInUse(Exception):
+    """The key belongs to a request that is still being processed."""
+
+
+class IdempotencyKeyReused(Exception):
+    """The key was already used for a request with a different path or body."""
+
+
+class IdempotencyStore(ABC):
+    """
+    Records responses by ``(user, key)`` so a retried request can be answered
+    without running it again.
+
+    ``begin`` either claims the key for a new request (returns None) or
+    returns the original response; the claimant then calls ``finish`` with
+    its response, or ``abandon`` if it failed so the client can retry.
+    Implementations may block; async callers run them in a thread.
+    """
+
+    @abstractmethod
+    def begin(self, user_id: Hashable, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Raises:
+            IdempotencyKeyInUse: If the original request is still running
+            IdempotencyKeyReused: If the key was used for a different request
+        """
+
+    @abstractmethod
+    def finish(self, user_id: Hashable, key: str, response: StoredResponse) -> None:
+        """Store the response of the request that claimed the key."""
+
+    @abstractmethod
+    def abandon(self, user_id: Hashable, key: str) -> None:
+        """Release a claimed key whose request failed."""
+
+
+class _Entry:
+    __slots__ = ("expires_at", "fingerprint", "response")
+
+    def __init__(self, expires_at: float, fingerprint: str, response: Optional[StoredResponse] = None):
+        self.expires_at = expires_at
+        self.fingerprint = fingerprint
+        self.response = response
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """
+    Per-process store: an LRU of at most ``max_keys`` entries that expire
+    after ``ttl`` seconds.
+
+    Each worker only knows its own keys, so a retry routed to another worker
+    runs again; use the database store when that matters.
+    """
+
+    def __init__(self, max_keys: int, ttl: float):
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[Hashable, str], _Entry]" = OrderedDict()  # LRU first
+        self._lock = threading.Lock()
+
+    def begin(self, user_id: Hashable, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is not None and entry.expires_at > now:
+                if entry.fingerprint != fingerprint:
+                    raise IdempotencyKeyReused(key)
+                if entry.response is None:
+                    raise IdempotencyKeyInUse(key)
+                self._entries.move_to_end((user_id, key))
+                return entry.response
+            self._entries[(user_id, key)] = _Entry(now + IN_PROGRESS_SECONDS, fingerprint)
+            self._entries.move_to_end((user_id, key))
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+        return None
+
+    def finish(self, user_id: Hashable, key: str, response: StoredResponse) -> None:
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is not None:
+                entry.response = response
+                entry.expires_at = time.monotonic() + self.ttl
+
+    def abandon(self, user_id: Hashable, key: str) -> None:
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is not None and entry.response is None:
+                del self._entries[(user_id, key)]
@@ -0,0 +1,44 @@
+"""ISBN normalization utilities."""
+from typing import Optional
+
+
+def _isbn13_check_digit(first12: str) -> str:
+    """Compute the ISBN-13 check digit for the first 12 digits."""
+    total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(first12))
+    return str((10 - total % 10) % 10)
+
+
+def _is_valid_isbn10(isbn: str) -> bool:
+    """Validate an ISBN-10 (digits with an optional trailing X)."""
+    if not (isbn[:9].isdigit() and (isbn[9].isdigit() or isbn[9] == "X")):
+        return False
+    total = sum((10 - i) * (10 if c == "X" else int(c)) for i, c in enumerate(isbn))
+    return total % 11 == 0
+
+
+def normalize_isbn(raw: Optional[str]) -> Optional[str]:
+    """
+    Normalize an ISBN to its canonical ISBN-13 form.
+
+    Hyphens and spaces are stripped and ISBN-10 values are converted to
+    ISBN-13 ("978" prefix), so both forms of the same edition share one key.
+
+    Args:
+        raw: ISBN as entered or returned by Open Library
+
+    Returns:
+        13-digit ISBN string, or None if the value is empty or not a valid ISBN
+    """
+    if not raw:
+        return None
+
+    isbn = raw.replace("-", "").replace(" ", "").strip().upper()
+
+    if len(isbn) == 10 and _is_valid_isbn10(isbn):
+        first12 = "978" + isbn[:9]
+        return first12 + _isbn13_check_digit(first12)
+
+    if len(isbn) == 13 and isbn.isdigit() and _isbn13_check_digit(isbn[:12]) == isbn[12]:
+        return isbn
+
+    return None
@@ -0,0 +1,61 @@
+"""Compact in-memory revocation list backed by a Bloom filter."""
+import hashlib
+import math
+import time
+from typing import Iterable
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationList:
+    """
+    Per-process set of revoked session ids, checked on every authenticated request.
+
+    A miss means "definitely not revoked" and needs no database access; a hit
+    may be a false positive and must be confirmed by the caller. The filter is
+    rebuilt from the database every ``sync_interval`` seconds so revocations
+    made by other workers are picked up, and stale entries age out.
+    """
+
+    def __init__(self, capacity: int, sync_interval: float):
+        self.capacity = capacity
+        self.sync_interval = sync_interval
+        self._filter = BloomFilter(capacity)
+        self._synced_at = float("-inf")
+
+    def add(self, session_id: str) -> None:
+        self._filter.add(session_id)
+
+    def might_be_revoked(self, session_id: str) -> bool:
+        return session_id in self._filter
+
+    def needs_sync(self) -> bool:
+        return time.monotonic() - self._synced_at >= self.sync_interval
+
+    def replace(self, session_ids: Iterable[str]) -> None:
+        """Rebuild the filter from the authoritative list of revoked sessions."""
+        fresh = BloomFilter(self.capacity)
+        for session_id in session_ids:
+            fresh.add(session_id)
+        self._filter = fresh
+        self._synced_at = time.monotonic()
@@ -1,18 +1,38 @@
 """Security utilities for JWT and password handling."""
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Optional, Tuple
 from fastapi import HTTPException, status
 from ..config import get_settings
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache()
+def get_pwd_context():
+    """
+    Build the passlib context on first use.
+
+    Only the password hashing worker processes need passlib and its bcrypt
+    backend, so API workers never pay for importing them.
+    """
+    from passlib.context import CryptContext
+
+    # The first scheme hashes new passwords; hashes in other schemes, or bcrypt
+    # hashes at a different cost, are flagged for upgrade on the next login.
+    return CryptContext(
+        schemes=[scheme.strip() for scheme in settings.password_schemes.split(",")],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.bcrypt_rounds,
+        bcrypt__min_rounds=settings.bcrypt_rounds,
+        bcrypt__max_rounds=settings.bcrypt_rounds,
+    )
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -24,8 +44,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def verify_token(token: str) -> dict:
-    """Verify JWT token and return payload."""
+def verify_token(token: str, token_type: str = "access") -> dict:
+    """Verify JWT token of the given type ("access" or "refresh") and return payload."""
+    from jose import JWTError, jwt
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -35,7 +57,7 @@ def verify_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         user_id: str = payload.get("sub")
-        if user_id is None:
+        if user_id is None or payload.get("type") != token_type:
             raise credentials_exception
         return payload
     except JWTError:
@@ -43,10 +65,25 @@ def verify_token(token: str) -> dict:
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    return pwd_context.hash(password)
+    """Hash a password. Truncates to 72 bytes for bcrypt compatibility."""
+    # Bcrypt has a 72-byte limit, so truncate if necessary
+    password_bytes = password.encode('utf-8')[:72]
+    truncated_password = password_bytes.decode('utf-8', errors='ignore')
+    return get_pwd_context().hash(truncated_password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against a hash. Truncates to 72 bytes for bcrypt compatibility."""
+    password_bytes = plain_password.encode('utf-8')[:72]
+    return get_pwd_context().verify(password_bytes, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its scheme or cost is outdated.
+
+    Returns:
+        Tuple of (valid, new_hash); new_hash is None unless an upgrade is due
+    """
+    password_bytes = plain_password.encode('utf-8')[:72]
+    return get_pwd_context().verify_and_update(password_bytes, hashed_password)
@@ -0,0 +1,110 @@
+"""Fast JSON encoding for comment and progress payloads."""
+from typing import Any, Mapping, Optional
+import orjson
+from starlette.responses import Response
+
+
+def dumps(content: Any) -> bytes:
+    """Encode to JSON bytes; UUID and datetime are handled natively by orjson."""
+    return orjson.dumps(content)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response for payloads the server built itself.
+
+    Returning it from a route skips FastAPI's ``response_model`` validation
+    and ``jsonable_encoder`` pass; the route's ``response_model`` still
+    documents the shape in OpenAPI. Headers set on the injected ``Response``
+    (e.g. ``X-Primary-Until``) must be passed in explicitly, because FastAPI
+    only merges them into responses it builds.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None
+    ):
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def comment_payload(
+    comment,
+    like_count: int,
+    user_has_liked: bool,
+    user_name: str,
+    user_avatar_url: Optional[str]
+) -> dict:
+    """
+    Build a ``CommentWithUser``-shaped dict from a Comment row.
+
+    A deleted or hidden comment becomes a placeholder: its position in
+    the thread is kept, its content, author and likes are not.
+    """
+    if comment.is_removed:
+        return {
+            "content": "",
+            "id": comment.id,
+            "group_id": comment.group_id,
+            "book_id": comment.book_id,
+            "user_id": None,
+            "progress_page": comment.progress_page,
+            "progress_total_pages": comment.progress_total_pages,
+            "progress_percentage": comment.progress_bp / 100,
+            "parent_comment_id": comment.parent_comment_id,
+            "created_at": comment.created_at,
+            "like_count": 0,
+            "user_has_liked": False,
+            "user_name": "",
+            "user_avatar_url": None,
+            "deleted": comment.deleted_at is not None,
+            "hidden": comment.hidden_at is not None,
+        }
+    return {
+        "content": comment.content,
+        "id": comment.id,
+        "group_id": comment.group_id,
+        "book_id": comment.book_id,
+        "user_id": comment.user_id,
+        "progress_page": comment.progress_page,
+        "progress_total_pages": comment.progress_total_pages,
+        "progress_percentage": comment.progress_bp / 100,
+        "parent_comment_id": comment.parent_comment_id,
+        "created_at": comment.created_at,
+        "like_count": like_count,
+        "user_has_liked": user_has_liked,
+        "user_name": user_name,
+        "user_avatar_url": user_avatar_url,
+        "deleted": False,
+        "hidden": False,
+    }
+
+
+def progress_payload(progress) -> dict:
+    """Build a ``ProgressResponse``-shaped dict from a UserReadingProgress row."""
+    return {
+        "current_page": progress.current_page,
+        "total_pages": progress.total_pages,
+        "id": progress.id,
+        "user_id": progress.user_id,
+        "book_id": progress.book_id,
+        "group_id": progress.group_id,
+        "progress_percentage": progress.progress_bp / 100,
+        "updated_at": progress.updated_at,
+    }
+
+
+def progress_with_book_payload(progress) -> dict:
+    """Build a ``ProgressWithBook``-shaped dict; ``progress.book`` must be loadable."""
+    payload = progress_payload(progress)
+    book = progress.book
+    payload["book_title"] = book.title
+    payload["book_author"] = book.author
+    payload["book_cover_url"] = book.cover_url
+    return payload
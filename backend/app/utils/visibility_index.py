@@ -0,0 +1,193 @@
+"""In-process index of comment positions for spoiler-visibility checks."""
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _timestamp(created_at: datetime) -> float:
+    return (created_at - _EPOCH).total_seconds()
+
+
+class BookComments:
+    """
+    Comments of one (group, book) in feed order: ``(progress_bp, created_at)``.
+
+    Held as parallel arrays so a viewer's visible range is one binary
+    search and a slice, plus a comment id -> progress map for single-comment checks.
+    """
+
+    __slots__ = ("progress", "created", "ids", "progress_of", "loaded_at")
+
+    def __init__(self, rows: Iterable[Tuple[UUID, int, datetime]]):
+        """
+        Args:
+            rows: ``(comment id, progress_bp, created_at)``, already in feed order
+        """
+        self.progress = array("i")
+        self.created = array("d")
+        self.ids: List[UUID] = []
+        self.progress_of: Dict[UUID, int] = {}
+        for comment_id, progress_bp, created_at in rows:
+            self.ids.append(comment_id)
+            self.progress.append(progress_bp)
+            self.created.append(_timestamp(created_at))
+            self.progress_of[comment_id] = progress_bp
+        self.loaded_at = time.monotonic()
+
+    def visible_count(self, max_bp: int) -> int:
+        return bisect_right(self.progress, max_bp)
+
+    def add(self, comment_id: UUID, progress_bp: int, created_at: datetime) -> None:
+        created = _timestamp(created_at)
+        lo = bisect_left(self.progress, progress_bp)
+        hi = bisect_right(self.progress, progress_bp)
+        position = bisect_right(self.created, created, lo, hi)
+        self.ids.insert(position, comment_id)
+        self.progress.insert(position, progress_bp)
+        self.created.insert(position, created)
+        self.progress_of[comment_id] = progress_bp
+
+    def remove(self, comment_id: UUID, progress_bp: int) -> None:
+        lo = bisect_left(self.progress, progress_bp)
+        hi = bisect_right(self.progress, progress_bp)
+        for position in range(lo, hi):
+            if self.ids[position] == comment_id:
+                del self.ids[position]
+                del self.progress[position]
+                del self.created[position]
+                del self.progress_of[comment_id]
+                return
+
+
+class CommentVisibilityIndex:
+    """
+    LRU of ``BookComments`` for the most recently read books.
+
+    Entries are updated in place when this process creates or deletes a
+    comment, and reloaded after ``ttl`` seconds. A comment's progress never
+    changes after it is created, so an entry never reveals a comment early.
+
+    An entry can only answer "which comments are visible" if it holds every
+    comment of the book, so books are only indexed for callers that say the
+    load is ``complete``: it reads the primary, and this process writes
+    every comment (it indexes its own). Other callers get None without a
+    load and ask the database. An entry is also not kept if a write in this
+    process raced its load.
+    """
+
+    def __init__(self, max_books: int, ttl: float):
+        self.max_books = max_books
+        self.ttl = ttl
+        self._books: "OrderedDict[Hashable, BookComments]" = OrderedDict()  # LRU first
+        self._book_of: Dict[UUID, Hashable] = {}  # Comment id -> key of the entry holding it
+        self._lock = threading.Lock()
+        self._writes = 0  # add/remove calls so far, to spot writes racing a load
+
+    def _get(self, key: Hashable, load: Callable[[], BookComments], complete: bool) -> Optional[BookComments]:
+        if not complete:
+            return None
+        with self._lock:
+            book = self._books.get(key)
+            if book is not None and time.monotonic() - book.loaded_at < self.ttl:
+                self._books.move_to_end(key)
+                return book
+            writes = self._writes
+        # Query outside the lock; a concurrent load of the same book just wins or loses the race
+        book = load()
+        with self._lock:
+            if self._writes != writes:
+                # A comment written during the load may be missing; use it once, don't keep it
+                return book
+            self._forget(key)
+            self._books[key] = book
+            self._book_of.update(dict.fromkeys(book.ids, key))
+            while len(self._books) > self.max_books:
+                self._forget(next(iter(self._books)))
+        return book
+
+    def _forget(self, key: Hashable) -> None:
+        """Drop an entry and its comment ids (lock held)."""
+        book = self._books.pop(key, None)
+        if book is not None:
+            for comment_id in book.ids:
+                self._book_of.pop(comment_id, None)
+
+    def visible_count(
+        self,
+        key: Hashable,
+        max_bp: int,
+        load: Callable[[], BookComments],
+        complete: bool = False
+    ) -> Optional[int]:
+        """
+        Number of comments at or below ``max_bp``.
+
+        Args:
+            key: Book key
+            max_bp: Viewer's progress in basis points
+            load: Reads the book's comments from the database
+            complete: Whether ``load`` sees every comment (see the class docstring)
+
+        Returns:
+            The count, or None if the book can't be indexed for this caller
+        """
+        book = self._get(key, load, complete)
+        if book is None:
+            return None
+        with self._lock:
+            return book.visible_count(max_bp)
+
+    def ahead_ids(
+        self,
+        key: Hashable,
+        max_bp: int,
+        load: Callable[[], BookComments],
+        complete: bool = False
+    ) -> Optional[List[UUID]]:
+        """Ids of the comments beyond ``max_bp`` in feed order, or None; arguments as for ``visible_count``."""
+        book = self._get(key, load, complete)
+        if book is None:
+            return None
+        with self._lock:
+            return book.ids[book.visible_count(max_bp):]
+
+    def locate(self, comment_id: UUID) -> Optional[Tuple[Hashable, int]]:
+        """
+        Find an indexed comment without a query.
+
+        Returns:
+            ``(book key, progress_bp)``, or None if no indexed book holds the
+            comment (not read lately, new, deleted or hidden); ask the database then
+        """
+        with self._lock:
+            key = self._book_of.get(comment_id)
+            if key is None:
+                return None
+            book = self._books[key]
+            if time.monotonic() - book.loaded_at >= self.ttl:
+                return None
+            return key, book.progress_of[comment_id]
+
+    def add(self, key: Hashable, comment_id: UUID, progress_bp: int, created_at: datetime) -> None:
+        """Record a new comment if its book is indexed (otherwise it loads on next read)."""
+        with self._lock:
+            self._writes += 1
+            book = self._books.get(key)
+            if book is not None:
+                book.add(comment_id, progress_bp, created_at)
+                self._book_of[comment_id] = key
+
+    def remove(self, key: Hashable, comment_id: UUID, progress_bp: int) -> None:
+        with self._lock:
+            self._writes += 1
+            book = self._books.get(key)
+            if book is not None:
+                book.remove(comment_id, progress_bp)
+                self._book_of.pop(comment_id, None)
@@ -0,0 +1,134 @@
+"""
+Shared test fixtures: a Postgres test database, an API client and query budgets.
+
+Database tests need ``TEST_DATABASE_URL`` to point at a throwaway Postgres
+database (its tables are dropped and recreated); they are skipped when it
+is not set.
+"""
+import os
+import uuid
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+# Settings are read on import, so configure the app before importing it
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql://localhost/bookclub_test"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["ENVIRONMENT"] = "development"  # X-DB-* query stats headers
+for name in ("GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET", "GOOGLE_REDIRECT_URI",
+             "CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-test-secret-key-0123")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:5173")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.database import Base, SessionLocal, dispose_engine, init_engine
+from app.main import app
+from app.models.book import Book, GroupBook
+from app.models.group import Group, GroupMember
+from app.models.user import User
+from app.utils.security import create_access_token
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Primary engine with a freshly created schema."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = init_engine()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    dispose_engine()
+
+
+@pytest.fixture
+def db(engine):
+    """Session on the primary; every table is emptied after the test."""
+    session = SessionLocal()
+    yield session
+    session.close()
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+
+@pytest.fixture
+def client(engine):
+    """API client; the lifespan (background workers) is not started."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers():
+    """Build a Bearer header with an access token for a user."""
+    def headers(user: User) -> dict:
+        token = create_access_token({
+            "sub": str(user.id),
+            "name": user.name,
+            "avatar_url": user.avatar_url,
+            "sid": str(uuid.uuid4()),
+            "type": "access",
+        })
+        return {"Authorization": f"Bearer {token}"}
+    return headers
+
+
+@pytest.fixture
+def make_user(db):
+    """Factory creating users."""
+    def make(name: str = "Reader") -> User:
+        user = User(email=f"{uuid.uuid4().hex}@example.com", name=name)
+        db.add(user)
+        db.commit()
+        return user
+    return make
+
+
+@pytest.fixture
+def club(db, make_user):
+    """A group with an admin and one book on its shelf."""
+    admin = make_user("Admin")
+    group = Group(name="Club", invite_code=uuid.uuid4().hex[:12], created_by=admin.id)
+    book = Book(title="Book", author="Author", page_count=300)
+    db.add_all([group, book])
+    db.flush()
+    db.add_all([
+        GroupMember(group_id=group.id, user_id=admin.id, role="admin"),
+        GroupBook(group_id=group.id, book_id=book.id, added_by=admin.id),
+    ])
+    db.commit()
+    return group, book, admin
+
+
+@pytest.fixture
+def join(db):
+    """Add a user to a group as a member."""
+    def add(group: Group, user: User) -> None:
+        db.add(GroupMember(group_id=group.id, user_id=user.id, role="member"))
+        db.commit()
+    return add
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert that a response stayed within a SQL statement budget.
+
+    Reads the ``X-DB-Query-Count`` header set by QueryStatsMiddleware, so
+    it counts every statement the request issued before responding.
+
+    Usage::
+
+        query_budget(client.get(url, headers=headers), 5)
+    """
+    def check(response, max_queries: int) -> int:
+        count = int(response.headers["x-db-query-count"])
+        request = response.request
+        assert count <= max_queries, (
+            f"{request.method} {request.url.path} issued {count} SQL statements "
+            f"(budget {max_queries})"
+        )
+        return count
+    return check
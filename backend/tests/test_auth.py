@@ -0,0 +1,90 @@
+"""Refresh token rotation, reuse detection and session revocation."""
+import pytest
+from app.models.session import RevokedSession
+from app.services.auth_service import AuthService, revoked_sessions, settings
+from app.utils.revocation import RevocationList
+from app.utils.security import verify_token
+
+
+@pytest.fixture
+def tokens(db, make_user):
+    """A fresh login: the user and its first token pair."""
+    user = make_user()
+    return user, AuthService.create_token_response(db, user)
+
+
+def _refresh(client, refresh_token):
+    return client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def _me(client, access_token):
+    return client.get("/auth/me", headers={"Authorization": f"Bearer {access_token}"})
+
+
+def test_refresh_rotates_the_token_within_the_session(client, tokens):
+    user, login = tokens
+    response = _refresh(client, login.refresh_token)
+    assert response.status_code == 200
+    rotated = response.json()
+
+    old, new = verify_token(login.refresh_token, "refresh"), verify_token(rotated["refresh_token"], "refresh")
+    assert new["jti"] != old["jti"] and new["sid"] == old["sid"]
+    assert _me(client, rotated["access_token"]).status_code == 200
+    assert _refresh(client, rotated["refresh_token"]).status_code == 200
+
+
+def test_concurrent_refresh_gets_the_current_pair(client, tokens):
+    user, login = tokens
+    first = _refresh(client, login.refresh_token).json()
+
+    # A second tab presenting the same token a moment later is not a theft
+    second = _refresh(client, login.refresh_token)
+    assert second.status_code == 200
+    assert (verify_token(second.json()["refresh_token"], "refresh")["jti"]
+            == verify_token(first["refresh_token"], "refresh")["jti"])
+    assert _me(client, first["access_token"]).status_code == 200
+    assert _refresh(client, second.json()["refresh_token"]).status_code == 200
+
+
+def test_reuse_after_the_grace_period_revokes_the_session(client, tokens, monkeypatch):
+    monkeypatch.setattr(settings, "refresh_reuse_grace_seconds", 0)
+    user, login = tokens
+    rotated = _refresh(client, login.refresh_token).json()
+
+    assert _refresh(client, login.refresh_token).status_code == 401
+    # The thief's replay takes the legitimate holder's tokens down with it
+    assert _refresh(client, rotated["refresh_token"]).status_code == 401
+    assert _me(client, rotated["access_token"]).status_code == 401
+
+
+def test_logout_revokes_access_and_refresh_tokens(client, tokens):
+    user, login = tokens
+    headers = {"Authorization": f"Bearer {login.access_token}"}
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+
+    assert _me(client, login.access_token).status_code == 401
+    assert _refresh(client, login.refresh_token).status_code == 401
+
+
+def test_revocations_by_other_workers_are_picked_up_on_sync(client, db, tokens, monkeypatch):
+    user, login = tokens
+    assert _me(client, login.access_token).status_code == 200
+
+    # Another worker revoked the session: this worker's filter learns of it at the next sync
+    db.add(RevokedSession(family_id=verify_token(login.access_token)["sid"]))
+    db.commit()
+    monkeypatch.setattr(revoked_sessions, "_synced_at", float("-inf"))
+    assert _me(client, login.access_token).status_code == 401
+
+
+def test_revocation_list_has_no_false_negatives_and_ages_out_on_replace():
+    revoked = RevocationList(capacity=100, sync_interval=30)
+    sessions = [f"session-{i}" for i in range(100)]
+    for session_id in sessions:
+        revoked.add(session_id)
+    assert all(revoked.might_be_revoked(session_id) for session_id in sessions)
+    assert sum(revoked.might_be_revoked(f"other-{i}") for i in range(1000)) < 50
+
+    revoked.replace(sessions[:1])
+    assert revoked.might_be_revoked(sessions[0])
+    assert not all(revoked.might_be_revoked(session_id) for session_id in sessions[1:])
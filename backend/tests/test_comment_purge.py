@@ -0,0 +1,33 @@
+"""Background purge of soft-deleted comments."""
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.models.comment import Comment
+from app.services.comment_purge_service import CommentPurgeService, settings
+
+
+def test_purge_clears_a_deleted_chain_in_one_run(db, club, monkeypatch):
+    monkeypatch.setattr(settings, "comment_purge_batch_size", 2)
+    group, book, admin = club
+    long_ago = datetime.utcnow() - timedelta(seconds=settings.comment_purge_grace_seconds + 60)
+
+    def comment(parent=None, deleted_at=long_ago):
+        row = Comment(
+            group_id=group.id, book_id=book.id, user_id=admin.id, content="Comment",
+            progress_page=10, progress_total_pages=300,
+            parent_comment_id=parent.id if parent else None, deleted_at=deleted_at
+        )
+        db.add(row)
+        db.flush()
+        return row
+
+    # A deleted chain five deep, and a deleted parent kept as a live reply's placeholder
+    parent = None
+    for _ in range(5):
+        parent = comment(parent)
+    placeholder = comment()
+    live = comment(placeholder, deleted_at=None)
+    db.commit()
+
+    assert asyncio.run(CommentPurgeService.purge()) == 5
+    assert set(db.execute(select(Comment.id)).scalars()) == {placeholder.id, live.id}
@@ -0,0 +1,251 @@
+"""Comment feed behaviour: visibility, placeholders, likes, search and threads."""
+import uuid
+from datetime import datetime
+import pytest
+from app.models.comment import Comment
+from app.models.group import GroupMember
+from app.models.progress import UserReadingProgress
+from app.services import comment_service
+
+
+@pytest.fixture
+def reading(db, club, make_user, join, auth_headers):
+    """The club admin at page 150 of 300, and a member who has finished the book."""
+    group, book, admin = club
+    member = make_user("Member")
+    join(group, member)
+    db.add_all([
+        UserReadingProgress(user_id=admin.id, book_id=book.id, group_id=group.id, current_page=150, total_pages=300),
+        UserReadingProgress(user_id=member.id, book_id=book.id, group_id=group.id, current_page=300, total_pages=300),
+    ])
+    db.commit()
+    return group, book, auth_headers(admin), member, auth_headers(member)
+
+
+def _post(client, headers, group, book, page, content="Comment", parent=None):
+    response = client.post(
+        f"/comments/groups/{group.id}/comments",
+        json={"book_id": str(book.id), "content": content, "progress_page": page, "parent_comment_id": parent},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _feed(client, headers, group, book):
+    response = client.get(f"/comments/groups/{group.id}/books/{book.id}/comments", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_deleted_parent_placeholder_hides_its_author(client, reading):
+    group, book, admin_headers, member, member_headers = reading
+    parent = _post(client, member_headers, group, book, 10, "Parent")
+    _post(client, admin_headers, group, book, 20, "Reply", parent=parent["id"])
+    assert client.delete(f"/comments/{parent['id']}", headers=member_headers).status_code == 204
+
+    placeholder, reply = _feed(client, admin_headers, group, book)
+    assert placeholder["id"] == parent["id"] and placeholder["deleted"]
+    assert placeholder["user_id"] is None
+    assert placeholder["user_name"] == "" and placeholder["content"] == ""
+    assert reply["content"] == "Reply" and reply["user_name"] == "Admin"
+
+
+def test_comment_written_by_another_worker_shows_before_index_reloads(client, db, reading):
+    group, book, admin_headers, member, member_headers = reading
+    assert _feed(client, member_headers, group, book) == []  # indexes the book as empty
+
+    # Another worker's write never reaches this worker's index
+    db.add(Comment(
+        group_id=group.id, book_id=book.id, user_id=member.id,
+        content="Elsewhere", progress_page=10, progress_total_pages=300
+    ))
+    db.commit()
+
+    assert [comment["content"] for comment in _feed(client, member_headers, group, book)] == ["Elsewhere"]
+
+
+def test_comment_beyond_progress_is_refused(client, reading):
+    group, book, admin_headers, member, member_headers = reading
+    ahead = _post(client, member_headers, group, book, 200, "Ahead")
+    _feed(client, member_headers, group, book)  # indexes the book
+
+    response = client.get(f"/comments/{ahead['id']}", headers=admin_headers)
+    assert response.status_code == 403
+    assert client.get(f"/comments/{ahead['id']}", headers=member_headers).json()["content"] == "Ahead"
+
+
+def test_single_writer_index_answers_empty_feeds_and_sees_own_writes(client, reading, monkeypatch, query_budget):
+    monkeypatch.setattr(comment_service.settings, "visibility_index_single_writer", True)
+    group, book, admin_headers, member, member_headers = reading
+
+    _feed(client, member_headers, group, book)  # indexes the book as empty
+    response = client.get(f"/comments/groups/{group.id}/books/{book.id}/comments", headers=member_headers)
+    assert response.json() == []
+    empty_queries = query_budget(response, 4)
+
+    _post(client, admin_headers, group, book, 10, "Mine")
+    response = client.get(f"/comments/groups/{group.id}/books/{book.id}/comments", headers=member_headers)
+    assert [comment["content"] for comment in response.json()] == ["Mine"]
+    assert int(response.headers["x-db-query-count"]) > empty_queries
+
+    # The admin, at page 150, gets comments ahead from the index's slice
+    for page, content in ((280, "Later"), (200, "Soon"), (100, "Seen")):
+        _post(client, member_headers, group, book, page, content)
+    response = client.get(f"/comments/groups/{group.id}/books/{book.id}/comments/ahead", headers=admin_headers)
+    assert [comment["content"] for comment in response.json()] == ["Soon", "Later"]
+
+
+def test_unlike_checks_the_comment_like_liking_does(client, db, reading, make_user):
+    group, book, admin_headers, member, member_headers = reading
+    seen = _post(client, member_headers, group, book, 10, "Seen")
+    ahead = _post(client, member_headers, group, book, 200, "Ahead")
+    assert client.post(f"/comments/{seen['id']}/like", headers=admin_headers).json()["like_count"] == 1
+
+    response = client.delete(f"/comments/{seen['id']}/like", headers=admin_headers)
+    assert response.status_code == 200 and response.json()["like_count"] == 0
+    assert client.delete(f"/comments/{ahead['id']}/like", headers=admin_headers).status_code == 403
+    assert client.delete(f"/comments/{uuid.uuid4()}/like", headers=admin_headers).status_code == 404
+
+    # Progress outlives membership, but a former member can no longer unlike
+    client.post(f"/comments/{seen['id']}/like", headers=member_headers)
+    db.query(GroupMember).filter_by(group_id=group.id, user_id=member.id).delete()
+    db.commit()
+    assert client.delete(f"/comments/{seen['id']}/like", headers=member_headers).status_code == 403
+
+
+def _search(client, headers, group, book, q, **params):
+    response = client.get(
+        f"/comments/groups/{group.id}/books/{book.id}/comments/search",
+        params={"q": q, **params},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_search_never_returns_spoilers_or_removed_comments(client, db, reading):
+    group, book, admin_headers, member, member_headers = reading
+    _post(client, member_headers, group, book, 100, "The butler seems nervous")
+    _post(client, member_headers, group, book, 250, "The butler did it!")  # Beyond the admin's page 150
+    deleted = _post(client, member_headers, group, book, 50, "Deleted butler theory")
+    hidden = _post(client, member_headers, group, book, 60, "Hidden butler spoiler")
+    assert client.delete(f"/comments/{deleted['id']}", headers=member_headers).status_code == 204
+    db.get(Comment, uuid.UUID(hidden["id"])).hidden_at = datetime.utcnow()
+    db.commit()
+
+    page = _search(client, admin_headers, group, book, "butler")
+    assert [comment["content"] for comment in page["comments"]] == ["The butler seems nervous"]
+    assert page["next_offset"] is None
+    # The spoiler matches for someone who has read that far
+    assert len(_search(client, member_headers, group, book, "butler")["comments"]) == 2
+
+
+def test_search_ranks_best_matches_first_and_pages_by_offset(client, reading):
+    group, book, admin_headers, member, member_headers = reading
+    _post(client, member_headers, group, book, 10, "A letter arrives")
+    _post(client, member_headers, group, book, 20, "Letters, letters and more letters")
+    _post(client, member_headers, group, book, 30, "Another letter")
+    _post(client, member_headers, group, book, 40, "Nothing to see here")
+
+    page = _search(client, admin_headers, group, book, "letter", limit=2)
+    # More matches rank higher; equal ranks keep feed order
+    assert [comment["content"] for comment in page["comments"]] == [
+        "Letters, letters and more letters", "A letter arrives"
+    ]
+    assert page["next_offset"] == 2
+
+    page = _search(client, admin_headers, group, book, "letter", limit=2, offset=page["next_offset"])
+    assert [comment["content"] for comment in page["comments"]] == ["Another letter"]
+    assert page["next_offset"] is None
+
+
+def _threads(client, headers, group, book, **params):
+    response = client.get(f"/comments/groups/{group.id}/books/{book.id}/threads", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def threads(client, reading):
+    """
+    Threads as the admin (page 150 of 300) should see them::
+
+        A (p10)                      shown
+          A1 (p20)                   shown
+            A1a (p30)                shown
+          A2 (p200)                  beyond progress: cut off
+            A2a (p40)                cut off with its parent
+        B (p20, deleted)             placeholder for B1
+          B1 (p25)                   shown
+        C (p30, deleted)             nothing live below: pruned
+          C1 (p35, deleted)          pruned
+        D (p200)                     beyond progress
+        E (p40)                      shown
+    """
+    group, book, admin_headers, member, member_headers = reading
+    ids = {}
+
+    def post(name, page, parent=None):
+        ids[name] = _post(client, member_headers, group, book, page, name, parent and ids[parent])["id"]
+
+    post("A", 10)
+    post("A1", 20, "A")
+    post("A1a", 30, "A1")
+    post("A2", 200, "A")
+    post("A2a", 40, "A2")
+    post("B", 20)
+    post("B1", 25, "B")
+    post("C", 30)
+    post("C1", 35, "C")
+    post("D", 200)
+    post("E", 40)
+    for name in ("C1", "C", "B"):
+        assert client.delete(f"/comments/{ids[name]}", headers=member_headers).status_code == 204
+    return group, book, admin_headers, ids
+
+
+def test_threads_cut_spoiler_subtrees_and_prune_removed_branches(client, threads):
+    group, book, admin_headers, ids = threads
+    names = {comment_id: name for name, comment_id in ids.items()}
+
+    page = _threads(client, admin_headers, group, book)
+    shown = [
+        (names[comment["id"]], comment["depth"], comment["reply_count"], comment["deleted"])
+        for comment in page["comments"]
+    ]
+    assert shown == [
+        ("A", 0, 1, False),
+        ("A1", 1, 1, False),
+        ("A1a", 2, 0, False),
+        ("B", 0, 1, True),
+        ("B1", 1, 0, False),
+        ("E", 0, 0, False),
+    ]
+    assert page["comments"][3]["content"] == "" and page["comments"][3]["user_id"] is None
+    assert page["next_after"] is None
+
+
+def test_threads_page_by_top_level_keyset(client, threads):
+    group, book, admin_headers, ids = threads
+    names = {comment_id: name for name, comment_id in ids.items()}
+
+    def roots(page):
+        return [names[comment["id"]] for comment in page["comments"] if comment["depth"] == 0]
+
+    first = _threads(client, admin_headers, group, book, limit=2)
+    assert roots(first) == ["A", "B"] and first["next_after"] == ids["B"]
+
+    # C fills a slot on the second page even though pruning drops it
+    second = _threads(client, admin_headers, group, book, limit=2, after=first["next_after"])
+    assert roots(second) == ["E"] and second["next_after"] == ids["E"]
+
+    last = _threads(client, admin_headers, group, book, limit=2, after=second["next_after"])
+    assert last == {"comments": [], "next_after": None}
+
+    response = client.get(
+        f"/comments/groups/{group.id}/books/{book.id}/threads",
+        params={"after": ids["A1"]},
+        headers=admin_headers,
+    )
+    assert response.status_code == 400
@@ -0,0 +1,103 @@
+"""Allowlist CORS middleware: preflights, simple requests and errors."""
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+from app.middleware.cors import CORSMiddleware, build_allowlist
+
+ORIGIN = "https://bookly.club"
+
+
+class Router:
+    """Inner ASGI app that counts the requests reaching it."""
+
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("boom")
+        await PlainTextResponse("ok")(scope, receive, send)
+
+
+@pytest.fixture
+def router():
+    return Router()
+
+
+@pytest.fixture
+def cors(router):
+    middleware = CORSMiddleware(router, allow_origins=build_allowlist(ORIGIN))
+    return middleware, TestClient(middleware, raise_server_exceptions=False)
+
+
+def _preflight(client, origin=ORIGIN, headers="authorization"):
+    return client.options("/groups", headers={
+        "Origin": origin,
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": headers,
+    })
+
+
+def test_allowlist_expands_schemes_and_keeps_dev_hosts():
+    allowlist = build_allowlist("bookly.club, https://www.bookly.club/")
+    assert {"https://bookly.club", "http://bookly.club", "https://www.bookly.club"} <= set(allowlist)
+    assert "http://localhost:5173" in allowlist
+
+
+def test_preflight_is_answered_without_the_router(cors, router):
+    middleware, client = cors
+    first, second = _preflight(client), _preflight(client)
+    assert router.calls == 0
+    for response in (first, second):
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == ORIGIN
+        assert response.headers["access-control-allow-headers"] == "authorization"
+        assert "POST" in response.headers["access-control-allow-methods"]
+    assert len(middleware._preflight_cache) == 1
+
+
+def test_preflight_cache_is_bounded(router):
+    client = TestClient(CORSMiddleware(router, allow_origins=[ORIGIN], preflight_cache_size=2))
+    for i in range(5):
+        assert _preflight(client, headers=f"x-custom-{i}").status_code == 200
+    assert len(client.app._preflight_cache) == 2
+    assert router.calls == 0
+
+
+def test_preflight_from_unknown_origin_is_rejected(cors, router):
+    middleware, client = cors
+    response = _preflight(client, origin="https://evil.example")
+    assert response.status_code == 400
+    assert "access-control-allow-origin" not in response.headers
+    assert router.calls == 0
+
+
+@pytest.mark.parametrize("origin, allowed", [
+    (ORIGIN, True),
+    ("https://evil.example", False),
+    ("https://bookly.club.evil.example", False),
+])
+def test_simple_request_headers_follow_allowlist(cors, router, origin, allowed):
+    middleware, client = cors
+    response = client.get("/groups", headers={"Origin": origin})
+    assert response.status_code == 200
+    assert router.calls == 1
+    assert response.headers.get("access-control-allow-origin") == (origin if allowed else None)
+    assert (response.headers.get("access-control-allow-credentials") == "true") is allowed
+
+
+def test_request_without_origin_passes_through(cors, router):
+    middleware, client = cors
+    response = client.get("/groups")
+    assert response.text == "ok"
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_unhandled_error_keeps_cors_headers():
+    client = TestClient(CORSMiddleware(Router(fail=True), allow_origins=[ORIGIN]), raise_server_exceptions=False)
+    response = client.get("/groups", headers={"Origin": ORIGIN})
+    assert response.status_code == 500
+    assert response.json()["message"] == "Internal server error"
+    assert response.headers["access-control-allow-origin"] == ORIGIN
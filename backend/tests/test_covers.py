@@ -0,0 +1,54 @@
+"""Cover proxy: known covers only, served from the disk cache with ETags."""
+import pytest
+from app.models.book import Book
+from app.services import cover_service
+from app.services.cover_service import CoverCache, CoverService
+
+IMAGE = b"\xff\xd8\xff\xe0 not really a jpeg"
+
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    """An empty cover cache and a stub Open Library; returns the fetched cover keys."""
+    monkeypatch.setattr(cover_service, "_cache", CoverCache(str(tmp_path), 1024 * 1024))
+    fetched = []
+
+    async def fetch(cover_id, size):
+        fetched.append(f"{cover_id}-{size}")
+        return IMAGE
+
+    monkeypatch.setattr(CoverService, "_fetch", staticmethod(fetch))
+    return fetched
+
+
+@pytest.fixture
+def book_cover(db):
+    book = Book(title="Book", author="Author", cover_url="https://covers.openlibrary.org/b/id/12345-M.jpg")
+    db.add(book)
+    db.commit()
+    assert book.cover_id == 12345
+    return book.cover_id
+
+
+def test_cover_is_fetched_once_then_served_from_disk(client, upstream, book_cover):
+    first = client.get(f"/covers/{book_cover}/M")
+    second = client.get(f"/covers/{book_cover}/M")
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content == IMAGE
+    assert first.headers["content-type"] == "image/jpeg"
+    assert first.headers["etag"] == second.headers["etag"]
+    assert upstream == ["12345-M"]
+
+
+def test_matching_etag_gets_304(client, upstream, book_cover):
+    etag = client.get(f"/covers/{book_cover}/M").headers["etag"]
+
+    response = client.get(f"/covers/{book_cover}/M", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b"" and response.headers["etag"] == etag
+
+
+def test_unknown_cover_is_not_fetched(client, upstream, book_cover):
+    assert client.get(f"/covers/{book_cover + 1}/M").status_code == 404
+    assert upstream == []
@@ -0,0 +1,145 @@
+"""Local Google ID token verification against a stubbed certs endpoint."""
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwt
+from app.services import auth_service
+from app.services.auth_service import AuthService, settings
+from app.utils.google_jwks import JWKSCache
+
+
+def _b64(number: int) -> str:
+    raw = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+class SigningKey:
+    """A locally generated RSA key published under a key id."""
+
+    def __init__(self, kid: str):
+        self.kid = kid
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.pem = self._key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ).decode()
+
+    @property
+    def jwk(self) -> dict:
+        numbers = self._key.public_key().public_numbers()
+        return {"kid": self.kid, "kty": "RSA", "alg": "RS256", "use": "sig", "n": _b64(numbers.n), "e": _b64(numbers.e)}
+
+    def sign(self, **claims) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": settings.google_client_id,
+            "sub": "google-123",
+            "email": "reader@example.com",
+            "name": "Reader",
+            "iat": now,
+            "exp": now + 3600,
+            **claims,
+        }
+        return jwt.encode(payload, self.pem, algorithm="RS256", headers={"kid": self.kid})
+
+
+@pytest.fixture
+def certs():
+    """
+    A local certs endpoint serving ``certs.keys`` with ``certs.max_age``.
+
+    ``certs.requests`` counts the fetches.
+    """
+    class Certs:
+        keys = [SigningKey("key-1")]
+        max_age = 600
+        requests = 0
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            Certs.requests += 1
+            body = json.dumps({"keys": [key.jwk for key in Certs.keys]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", f"public, max-age={Certs.max_age}, must-revalidate")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    Certs.url = f"http://127.0.0.1:{server.server_port}/certs"
+    yield Certs
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def jwks(certs, monkeypatch):
+    """Verify tokens with a fresh cache of the stub endpoint's keys."""
+    cache = JWKSCache(certs.url, min_refetch_interval=0)
+    monkeypatch.setattr(auth_service, "google_jwks", cache)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_valid_token_is_verified_with_cached_keys(certs, jwks):
+    token = certs.keys[0].sign()
+
+    user = await AuthService.verify_google_token(token)
+    assert (user.google_id, user.email, user.name) == ("google-123", "reader@example.com", "Reader")
+    await AuthService.verify_google_token(token)
+    assert certs.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_control_max_age_sets_the_expiry(certs, jwks):
+    await jwks.get_key("key-1")
+    assert jwks._expires_at - jwks._fetched_at == certs.max_age
+
+    # Within max-age the cached key is used; once it has passed the set is fetched again
+    await jwks.get_key("key-1")
+    assert certs.requests == 1
+    jwks._expires_at = time.monotonic() - 1
+    await jwks.get_key("key-1")
+    assert certs.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetches_rotated_keys(certs, jwks):
+    await AuthService.verify_google_token(certs.keys[0].sign())
+
+    certs.keys = [SigningKey("key-2")]
+    user = await AuthService.verify_google_token(certs.keys[0].sign())
+    assert user.google_id == "google-123"
+    assert certs.requests == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("claims", [
+    {"iss": "https://accounts.example.com"},
+    {"aud": "someone-elses-client-id"},
+    {"exp": int(time.time()) - 60},
+])
+async def test_wrong_issuer_audience_or_expiry_is_rejected(certs, jwks, claims):
+    with pytest.raises(HTTPException) as error:
+        await AuthService.verify_google_token(certs.keys[0].sign(**claims))
+    assert error.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_token_signed_by_another_key_is_rejected(certs, jwks):
+    impostor = SigningKey("key-1")  # Claims Google's key id, but a different key
+    with pytest.raises(HTTPException) as error:
+        await AuthService.verify_google_token(impostor.sign())
+    assert error.value.status_code == 401
@@ -0,0 +1,40 @@
+"""Idempotency-Key replays, with the in-memory and the database store."""
+import pytest
+from sqlalchemy import func, select
+from app.models.comment import Comment
+from app.models.progress import UserReadingProgress
+from app.services import idempotency_service
+from app.services.idempotency_service import REPLAYED_HEADER, DatabaseIdempotencyStore
+from app.utils.idempotency import MemoryIdempotencyStore
+
+
+@pytest.fixture(params=["memory", "database"])
+def store(request, engine, monkeypatch):
+    """Serve the test's requests from a fresh store of each kind."""
+    if request.param == "memory":
+        store = MemoryIdempotencyStore(100, 60)
+    else:
+        store = DatabaseIdempotencyStore(60)
+    monkeypatch.setattr(idempotency_service, "idempotency_store", store)
+    return store
+
+
+def test_retried_comment_is_created_once(client, db, club, auth_headers, store):
+    group, book, admin = club
+    db.add(UserReadingProgress(
+        user_id=admin.id, book_id=book.id, group_id=group.id, current_page=150, total_pages=300
+    ))
+    db.commit()
+    headers = {**auth_headers(admin), "Idempotency-Key": "comment-1"}
+    url = f"/comments/groups/{group.id}/comments"
+    body = {"book_id": str(book.id), "content": "Once", "progress_page": 10}
+
+    first = client.post(url, json=body, headers=headers)
+    retry = client.post(url, json=body, headers=headers)
+    assert first.status_code == retry.status_code == 201
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+    assert db.execute(select(func.count(Comment.id))).scalar() == 1
+
+    reused = client.post(url, json={**body, "content": "Twice"}, headers=headers)
+    assert reused.status_code == 422
@@ -0,0 +1,37 @@
+"""Worker boot imports, measured with ``python -X importtime``."""
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Integrations that must only be imported on first use
+LAZY_MODULES = ("httpx", "jose", "passlib", "bcrypt", "google.auth", "cloudinary")
+
+
+def _imported_modules(target: str) -> list:
+    """Modules a fresh interpreter imports for ``import target``, per ``-X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        cwd=BACKEND,
+        env=os.environ,  # conftest configured the app's settings
+    )
+    assert result.returncode == 0, result.stderr
+    return [
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "self [us]" not in line
+    ]
+
+
+def test_app_boot_does_not_import_lazy_integrations():
+    modules = _imported_modules("app.main")
+    assert "app.main" in modules
+
+    eager = sorted({
+        module for module in modules
+        if any(module == lazy or module.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    })
+    assert not eager, f"Imported at boot but should be lazy: {', '.join(eager)}"
@@ -0,0 +1,77 @@
+"""Request metrics are labelled by route template, never by raw path."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.main import app
+from app.middleware.metrics import (
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+    HTTP_RESPONSE_BYTES,
+    UNMATCHED_ROUTE,
+    MetricsMiddleware,
+    _in_flight,
+)
+
+ROUTE = "/probes/{probe_id}"
+
+
+@pytest.fixture
+def probes():
+    """A small app behind MetricsMiddleware; records the in-flight gauge seen by handlers."""
+    inner = FastAPI()
+    seen_in_flight = []
+
+    @inner.get(ROUTE)
+    async def get_probe(probe_id: int):
+        seen_in_flight.append(_in_flight.value)
+        return {"probe_id": probe_id}
+
+    @inner.get("/probes/{probe_id}/fail")
+    async def fail_probe(probe_id: int):
+        raise RuntimeError("boom")
+
+    return TestClient(MetricsMiddleware(inner), raise_server_exceptions=False), seen_in_flight
+
+
+def _labelsets(metric) -> set:
+    return set(metric._children)
+
+
+def test_requests_are_labelled_by_route_template(probes):
+    client, seen_in_flight = probes
+    before = HTTP_REQUESTS.labels("GET", ROUTE, 200).value
+    sizes = [len(client.get(f"/probes/{probe_id}").content) for probe_id in (1, 22, 333)]
+
+    assert HTTP_REQUESTS.labels("GET", ROUTE, 200).value - before == 3
+    assert not any(values[1].startswith("/probes/") and "{" not in values[1] for values in _labelsets(HTTP_REQUESTS))
+    latency = HTTP_REQUEST_SECONDS.labels("GET", ROUTE)
+    assert latency.count >= 3 and latency.sum > 0
+    assert HTTP_RESPONSE_BYTES.labels("GET", ROUTE).sum >= sum(sizes)
+    assert seen_in_flight == [1.0, 1.0, 1.0]
+    assert _in_flight.value == 0
+
+
+def test_unmatched_paths_share_one_label(probes):
+    client, _ = probes
+    before = HTTP_REQUESTS.labels("GET", UNMATCHED_ROUTE, 404).value
+    for path in ("/nope", "/nope/again", "/probes"):
+        assert client.get(path).status_code == 404
+    assert HTTP_REQUESTS.labels("GET", UNMATCHED_ROUTE, 404).value - before == 3
+    assert not any(values[1].startswith("/nope") for values in _labelsets(HTTP_REQUESTS))
+
+
+def test_unhandled_error_is_counted_as_500(probes):
+    client, _ = probes
+    before = HTTP_REQUESTS.labels("GET", "/probes/{probe_id}/fail", 500).value
+    assert client.get("/probes/7/fail").status_code == 500
+    assert HTTP_REQUESTS.labels("GET", "/probes/{probe_id}/fail", 500).value - before == 1
+    assert _in_flight.value == 0
+
+
+def test_metrics_endpoint_exposes_route_templates():
+    client = TestClient(app)
+    client.get("/metrics")
+    body = client.get("/metrics").text
+    assert "# TYPE bookclub_http_request_duration_seconds histogram" in body
+    assert 'bookclub_http_requests_total{method="GET",route="/metrics",status="200"}' in body
+    assert "bookclub_http_requests_in_flight" in body
@@ -0,0 +1,37 @@
+"""Reading progress: basis-point percentages and page bounds."""
+import pytest
+from app.schemas.progress import MAX_PAGES
+
+
+def _save_progress(client, headers, group, book, current_page, total_pages):
+    return client.post("/progress", headers=headers, json={
+        "book_id": str(book.id), "group_id": str(group.id),
+        "current_page": current_page, "total_pages": total_pages,
+    })
+
+
+def test_progress_percentage_is_truncated_basis_points(client, club, auth_headers):
+    group, book, admin = club
+    response = _save_progress(client, auth_headers(admin), group, book, 200, 300)
+    assert response.status_code == 201, response.text
+    assert response.json()["progress_percentage"] == 66.66
+
+
+def test_largest_page_fits_the_basis_point_column(client, club, auth_headers):
+    group, book, admin = club
+    response = _save_progress(client, auth_headers(admin), group, book, MAX_PAGES, MAX_PAGES)
+    assert response.status_code == 201, response.text
+    assert response.json()["progress_percentage"] == 100
+
+
+@pytest.mark.parametrize("current_page, total_pages", [(MAX_PAGES + 1, MAX_PAGES + 1), (10, MAX_PAGES + 1)])
+def test_pages_that_would_overflow_are_rejected(client, club, auth_headers, current_page, total_pages):
+    group, book, admin = club
+    headers = auth_headers(admin)
+    assert _save_progress(client, headers, group, book, current_page, total_pages).status_code == 422
+
+    response = client.post(f"/comments/groups/{group.id}/comments", headers=headers, json={
+        "book_id": str(book.id), "content": "Spoiler", "progress_page": current_page,
+        "progress_total_pages": total_pages,
+    })
+    assert response.status_code == 422
@@ -0,0 +1,79 @@
+"""
+Per-endpoint SQL statement budgets: counts must not grow with the data.
+
+Budgets leave room for the revocation-list sync that one request per
+``revocation_sync_seconds`` pays on top of the route's own statements.
+"""
+import pytest
+from app.models.comment import Comment
+from app.models.progress import UserReadingProgress
+
+
+@pytest.fixture
+def busy_club(db, club, make_user, join):
+    """Build the club with ``n`` other members who have each commented, on pages ``page`` to ``page + 99``."""
+    def build(n: int, page: int = 10):
+        group, book, admin = club
+        db.add(UserReadingProgress(
+            user_id=admin.id, book_id=book.id, group_id=group.id, current_page=150, total_pages=300
+        ))
+        for i in range(n):
+            member = make_user(f"Member {i}")
+            join(group, member)
+            db.add(Comment(
+                group_id=group.id, book_id=book.id, user_id=member.id,
+                content=f"Comment {i}", progress_page=page + i % 100, progress_total_pages=300
+            ))
+        db.commit()
+        return group, book, admin
+    return build
+
+
+@pytest.mark.parametrize("n", [1, 10])
+def test_thread_page_budget(client, busy_club, auth_headers, query_budget, n):
+    group, book, admin = busy_club(n)
+    response = client.get(f"/comments/groups/{group.id}/books/{book.id}/threads", headers=auth_headers(admin))
+    assert response.status_code == 200
+    assert len(response.json()["comments"]) == n
+    query_budget(response, 5)
+
+
+@pytest.mark.parametrize("n", [1, 10])
+def test_group_list_budget(client, busy_club, auth_headers, query_budget, n):
+    group, book, admin = busy_club(n)
+    response = client.get("/groups", headers=auth_headers(admin))
+    assert response.status_code == 200
+    query_budget(response, 4)
+
+
+@pytest.mark.parametrize("n", [1, 10])
+def test_progress_list_budget(client, busy_club, auth_headers, query_budget, n):
+    group, book, admin = busy_club(n)
+    response = client.get("/progress", headers=auth_headers(admin))
+    assert response.status_code == 200
+    query_budget(response, 3)
+
+
+def test_budget_overrun_fails(client, busy_club, auth_headers, query_budget):
+    group, book, admin = busy_club(1)
+    response = client.get("/progress", headers=auth_headers(admin))
+    with pytest.raises(AssertionError, match="budget 0"):
+        query_budget(response, 0)
+
+
+@pytest.mark.parametrize("n", [1, 10, 1000])
+def test_comment_feed_budget(client, busy_club, auth_headers, query_budget, n):
+    group, book, admin = busy_club(n)
+    response = client.get(f"/comments/groups/{group.id}/books/{book.id}/comments", headers=auth_headers(admin))
+    assert response.status_code == 200
+    assert len(response.json()) == n
+    query_budget(response, 6)
+
+
+@pytest.mark.parametrize("n", [1, 10])
+def test_comments_ahead_budget(client, busy_club, auth_headers, query_budget, n):
+    group, book, admin = busy_club(n, page=200)
+    response = client.get(f"/comments/groups/{group.id}/books/{book.id}/comments/ahead", headers=auth_headers(admin))
+    assert response.status_code == 200
+    assert len(response.json()) == n
+    query_budget(response, 6)
@@ -0,0 +1,111 @@
+"""
+Replica routing with read-your-writes, against two local databases.
+
+Needs ``TEST_REPLICA_DATABASE_URL``: a second throwaway database standing in
+for a replica. Nothing replicates into it except ``replicate()``, so a read
+served by the replica can't see writes the test hasn't copied over.
+"""
+import os
+import time
+import pytest
+from sqlalchemy import create_engine, insert, select, text
+from app import database
+from app.database import Base, PRIMARY_UNTIL_HEADER
+from app.models.progress import UserReadingProgress
+
+TEST_REPLICA_DATABASE_URL = os.environ.get("TEST_REPLICA_DATABASE_URL")
+
+
+@pytest.fixture
+def replica(engine, monkeypatch):
+    """
+    Route GET requests to the replica database for the test.
+
+    Returns:
+        ``replicate()``, which copies the primary's rows to the replica
+    """
+    if not TEST_REPLICA_DATABASE_URL:
+        pytest.skip("TEST_REPLICA_DATABASE_URL is not set")
+    replica_engine = create_engine(TEST_REPLICA_DATABASE_URL)
+    Base.metadata.drop_all(bind=replica_engine)
+    Base.metadata.create_all(bind=replica_engine)
+
+    monkeypatch.setattr(database.settings, "database_replica_urls", TEST_REPLICA_DATABASE_URL)
+    database.dispose_engine()
+    database.init_engine()
+
+    def replicate() -> None:
+        tables = Base.metadata.sorted_tables
+        with engine.connect() as source, replica_engine.begin() as target:
+            target.execute(text(f"TRUNCATE {', '.join(t.name for t in tables)} CASCADE"))
+            for table in tables:
+                columns = [c for c in table.columns if c.computed is None]
+                rows = source.execute(select(*columns)).mappings().all()
+                if rows:
+                    target.execute(insert(table), [dict(row) for row in rows])
+
+    yield replicate
+
+    monkeypatch.undo()
+    database.dispose_engine()
+    database.init_engine()
+    Base.metadata.drop_all(bind=replica_engine)
+    replica_engine.dispose()
+
+
+@pytest.fixture
+def reader(db, club, auth_headers):
+    """The club admin, finished with the book so every comment is visible."""
+    group, book, admin = club
+    db.add(UserReadingProgress(
+        user_id=admin.id, book_id=book.id, group_id=group.id, current_page=300, total_pages=300
+    ))
+    db.commit()
+    return group, book, auth_headers(admin)
+
+
+def _post_comment(client, headers, group, book, content):
+    response = client.post(
+        f"/comments/groups/{group.id}/comments",
+        json={"book_id": str(book.id), "content": content, "progress_page": 10, "progress_total_pages": 300},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response
+
+
+def _feed(client, headers, group, book):
+    response = client.get(f"/comments/groups/{group.id}/books/{book.id}/comments", headers=headers)
+    assert response.status_code == 200, response.text
+    return [comment["content"] for comment in response.json()]
+
+
+def test_reads_use_replica_and_writes_pin_reads_to_primary(client, reader, replica):
+    group, book, headers = reader
+    replica()
+
+    response = _post_comment(client, headers, group, book, "Fresh")
+    primary_until = response.headers[PRIMARY_UNTIL_HEADER]
+
+    # The replica hasn't seen the write yet...
+    assert _feed(client, headers, group, book) == []
+    # ...but echoing X-Primary-Until reads it from the primary, even though
+    # the replica read above left this worker's visibility index empty
+    assert _feed(client, {**headers, PRIMARY_UNTIL_HEADER: primary_until}, group, book) == ["Fresh"]
+
+    replica()
+    assert _feed(client, headers, group, book) == ["Fresh"]
+
+
+def test_forged_or_expired_primary_until_reads_replica(client, reader, replica):
+    group, book, headers = reader
+    replica()
+    primary_until = _post_comment(client, headers, group, book, "Fresh").headers[PRIMARY_UNTIL_HEADER]
+    until, _, signature = primary_until.partition(":")
+
+    far_future = int(time.time()) + 86400
+    for forged in (str(far_future), f"{far_future}:{signature}", f"{until}:{'0' * len(signature)}"):
+        assert _feed(client, {**headers, PRIMARY_UNTIL_HEADER: forged}, group, book) == []
+
+    expired = database._primary_until_value(int(time.time()) - 1)
+    assert _feed(client, {**headers, PRIMARY_UNTIL_HEADER: expired}, group, book) == []
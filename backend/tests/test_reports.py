@@ -0,0 +1,50 @@
+"""Spoiler reports: counting, auto-hiding and moderation."""
+import pytest
+from app.models.comment import Comment
+from app.models.progress import UserReadingProgress
+from app.services.report_service import settings
+
+
+@pytest.fixture
+def reported(db, club, make_user, join, auth_headers, monkeypatch):
+    """A comment by the admin, and two members who have read past it; hiding takes two reports."""
+    monkeypatch.setattr(settings, "spoiler_report_hide_threshold", 2)
+    group, book, admin = club
+    readers = [make_user(f"Reader {i}") for i in range(2)]
+    for user in [admin, *readers]:
+        if user is not admin:
+            join(group, user)
+        db.add(UserReadingProgress(
+            user_id=user.id, book_id=book.id, group_id=group.id, current_page=300, total_pages=300
+        ))
+    comment = Comment(
+        group_id=group.id, book_id=book.id, user_id=admin.id,
+        content="It was the butler", progress_page=10, progress_total_pages=300
+    )
+    db.add(comment)
+    db.commit()
+    return group, comment, auth_headers(admin), [auth_headers(user) for user in readers]
+
+
+def _report(client, headers, comment):
+    response = client.post(f"/comments/{comment.id}/report", json={"reason": "Spoiler"}, headers=headers)
+    assert response.status_code == 202, response.text
+    return response.json()
+
+
+def test_dismissed_reporters_can_report_again(client, reported):
+    group, comment, admin_headers, reader_headers = reported
+    assert _report(client, reader_headers[0], comment)["report_count"] == 1
+    assert _report(client, reader_headers[1], comment)["hidden"]
+
+    queue = client.get(f"/comments/groups/{group.id}/reports", headers=admin_headers).json()["reports"]
+    response = client.put(
+        f"/comments/reports/{queue[0]['id']}", json={"status": "dismissed"}, headers=admin_headers
+    )
+    assert response.status_code == 204
+
+    # Counted afresh, and hidden again once the threshold is reached again
+    ack = _report(client, reader_headers[0], comment)
+    assert ack["report_count"] == 1 and not ack["hidden"]
+    assert _report(client, reader_headers[0], comment)["report_count"] == 1
+    assert _report(client, reader_headers[1], comment)["hidden"]
@@ -0,0 +1,85 @@
+"""The orjson feed path against FastAPI's validated ``response_model`` path."""
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from starlette.responses import JSONResponse
+from app.models.comment import Comment
+from app.models.user import User
+from app.schemas.comment import CommentWithUser
+from app.utils.serialization import FastJSONResponse, comment_payload
+
+FEED_SIZE = 1000
+
+
+def _feed() -> List[Comment]:
+    """A 1,000-comment feed with authors loaded, built in memory."""
+    authors = [
+        User(id=uuid.uuid4(), name=f"Reader {i}", avatar_url=None if i % 2 else f"https://example.com/{i}.png")
+        for i in range(12)
+    ]
+    group_id, book_id = uuid.uuid4(), uuid.uuid4()
+    start = datetime(2026, 10, 19, 12, 0, 0, 123456)
+    feed = []
+    for i in range(FEED_SIZE):
+        comment = Comment(
+            id=uuid.uuid4(), group_id=group_id, book_id=book_id, user_id=authors[i % 12].id,
+            content=f"Comment {i} about chapter {i % 30}", progress_page=i % 300, progress_total_pages=300,
+            progress_bp=(i % 300) * 10000 // 300, created_at=start + timedelta(seconds=i)
+        )
+        comment.user = authors[i % 12]
+        feed.append(comment)
+    return feed
+
+
+def _validated_body(feed: List[Comment]) -> bytes:
+    """What the route returned before: CommentWithUser models, re-validated and jsonable-encoded."""
+    field = create_response_field(name="feed", type_=List[CommentWithUser])
+    models = [
+        CommentWithUser(
+            id=c.id, group_id=c.group_id, book_id=c.book_id, user_id=c.user_id, content=c.content,
+            progress_page=c.progress_page, progress_total_pages=c.progress_total_pages,
+            progress_percentage=c.progress_bp / 100, parent_comment_id=c.parent_comment_id,
+            created_at=c.created_at, like_count=i % 7, user_has_liked=i % 3 == 0,
+            user_name=c.user.name, user_avatar_url=c.user.avatar_url
+        )
+        for i, c in enumerate(feed)
+    ]
+    content = asyncio.run(serialize_response(field=field, response_content=models, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def _fast_body(feed: List[Comment]) -> bytes:
+    return FastJSONResponse([
+        comment_payload(c, i % 7, i % 3 == 0, c.user.name, c.user.avatar_url) for i, c in enumerate(feed)
+    ]).body
+
+
+def _cpu_ms(render, feed: List[Comment], runs: int = 5) -> float:
+    """Best-of-three CPU time per response, in milliseconds."""
+    render(feed)
+    best = float("inf")
+    for _ in range(3):
+        started = time.process_time()
+        for _ in range(runs):
+            render(feed)
+        best = min(best, (time.process_time() - started) / runs * 1000)
+    return best
+
+
+def test_feed_payload_matches_response_model():
+    feed = _feed()
+    fast = json.loads(_fast_body(feed))
+    assert fast == json.loads(_validated_body(feed))
+    assert len(fast) == FEED_SIZE
+
+
+def test_feed_serialization_is_cheaper_than_validation():
+    feed = _feed()
+    validated, fast = _cpu_ms(_validated_body, feed), _cpu_ms(_fast_body, feed)
+    # About 4x on a 1,000-comment feed; 2x leaves room for noisy machines
+    assert fast * 2 < validated, f"orjson path {fast:.1f} ms vs validated {validated:.1f} ms per response"
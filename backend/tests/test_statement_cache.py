@@ -0,0 +1,61 @@
+"""
+Hot-path lookups are lambda statements served from SQLAlchemy's compiled cache.
+
+After the first call a lambda statement only extracts new bound values; it
+neither rebuilds the SELECT nor regenerates its cache key.
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from app.models.comment import Comment
+from app.models.progress import UserReadingProgress
+from app.services.comment_service import CommentService
+from app.services.group_service import GroupService
+from app.services.progress_service import ProgressService
+
+HOT_LOOKUPS = {
+    "membership": lambda db, group, book, user: GroupService.get_membership(db, group.id, user.id),
+    "progress": lambda db, group, book, user: ProgressService.get_user_progress(db, user.id, book.id, group.id),
+    "visible_comments": lambda db, group, book, user: CommentService.get_visible_comments(db, group.id, book.id, user.id),
+    "comments_ahead": lambda db, group, book, user: CommentService.get_comments_ahead(db, group.id, book.id, user.id),
+}
+
+
+@pytest.fixture
+def statements(db):
+    """Record the invoked statement and compiled-cache outcome of every execution on ``db``."""
+    engine = db.get_bind()
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append((context.invoked_statement, context.cache_hit))
+
+    event.listen(engine, "after_cursor_execute", record)
+    yield seen
+    event.remove(engine, "after_cursor_execute", record)
+
+
+@pytest.mark.parametrize("lookup", HOT_LOOKUPS)
+def test_hot_lookup_hits_compiled_cache(db, club, make_user, join, statements, lookup):
+    group, book, admin = club
+    reader = make_user("Reader")
+    join(group, reader)
+    db.add_all([
+        UserReadingProgress(user_id=admin.id, book_id=book.id, group_id=group.id, current_page=150, total_pages=300),
+        UserReadingProgress(user_id=reader.id, book_id=book.id, group_id=group.id, current_page=30, total_pages=300),
+        Comment(group_id=group.id, book_id=book.id, user_id=admin.id, content="Chapter 1",
+                progress_page=10, progress_total_pages=300),
+        Comment(group_id=group.id, book_id=book.id, user_id=admin.id, content="Chapter 9",
+                progress_page=120, progress_total_pages=300),
+    ])
+    db.commit()
+
+    HOT_LOOKUPS[lookup](db, group, book, admin)
+    statements.clear()
+    HOT_LOOKUPS[lookup](db, group, book, reader)  # new bound values, same statement
+
+    assert statements
+    for invoked, cache_hit in statements:
+        assert isinstance(invoked, StatementLambdaElement)
+        assert cache_hit is CacheStats.CACHE_HIT
@@ -0,0 +1,49 @@
+"""In-memory comment visibility index."""
+import uuid
+from datetime import datetime, timedelta
+from app.utils.visibility_index import BookComments, CommentVisibilityIndex
+
+START = datetime(2026, 1, 1)
+
+
+def _rows(*progress):
+    return [(uuid.uuid4(), bp, START + timedelta(seconds=i)) for i, bp in enumerate(progress)]
+
+
+def test_incomplete_callers_never_load():
+    index = CommentVisibilityIndex(max_books=4, ttl=60)
+
+    def load():
+        raise AssertionError("loaded for a caller that can't use the entry")
+
+    assert index.visible_count("book", 5000, load) is None
+    assert index.ahead_ids("book", 5000, load) is None
+
+
+def test_counts_and_ahead_slice_follow_writes():
+    index = CommentVisibilityIndex(max_books=4, ttl=60)
+    rows = _rows(1000, 2000, 3000)
+    load = lambda: BookComments(rows)
+
+    assert index.visible_count("book", 2000, load, complete=True) == 2
+    assert index.ahead_ids("book", 2000, load, complete=True) == [rows[2][0]]
+
+    new_id = uuid.uuid4()
+    index.add("book", new_id, 2500, START + timedelta(hours=1))
+    assert index.ahead_ids("book", 2000, load, complete=True) == [new_id, rows[2][0]]
+    assert index.locate(new_id) == ("book", 2500)
+
+    index.remove("book", rows[0][0], 1000)
+    assert index.visible_count("book", 2000, load, complete=True) == 1
+    assert index.locate(rows[0][0]) is None
+
+
+def test_evicted_books_are_no_longer_located():
+    index = CommentVisibilityIndex(max_books=1, ttl=60)
+    first, second = _rows(1000), _rows(1000)
+    index.visible_count("first", 0, lambda: BookComments(first), complete=True)
+    assert index.locate(first[0][0]) == ("first", 1000)
+
+    index.visible_count("second", 0, lambda: BookComments(second), complete=True)
+    assert index.locate(first[0][0]) is None
+    assert index.locate(second[0][0]) == ("second", 1000)
@@ -2,6 +2,7 @@ import { Link } from 'react-router-dom'
 import Card from '../common/Card'
 import BookCover from './BookCover'
 import ProgressIndicator from '../progress/ProgressIndicator'
+import { apiUrl } from '../../services/api'
 
 const BookCard = ({ book, groupId, progress }) => {
   return (
@@ -9,7 +10,7 @@ const BookCard = ({ book, groupId, progress }) => {
       <Card hover className="h-full">
         <div className="flex gap-4">
           <BookCover
-            src={book.cover_url}
+            src={book.cover_thumbnail_url ? apiUrl(book.cover_thumbnail_url) : book.cover_url}
             alt={book.title}
             size="md"
           />
@@ -30,6 +30,17 @@ const CommentCard = ({ comment, onLike, onReport, onReply, currentUserId, curren
     ? 'bg-surface border border-border rounded-lg p-3 ml-4 sm:ml-8'
     : 'bg-surface border border-border rounded-lg p-4'
 
+  // Deleted and hidden comments stay in the feed only to hold their replies' place
+  if (comment.deleted || comment.hidden) {
+    return (
+      <div className={containerClasses}>
+        <p className="text-sm italic text-text-tertiary">
+          {comment.deleted ? 'This comment was deleted' : 'This comment was hidden after spoiler reports'}
+        </p>
+      </div>
+    )
+  }
+
   return (
     <>
       <div className={containerClasses}>
@@ -3,7 +3,7 @@ import Modal from '../common/Modal'
 import Input from '../common/Input'
 import Button from '../common/Button'
 
-const UpdateProgressModal = ({ isOpen, onClose, onUpdate, currentProgress, isUpdating }) => {
+const UpdateProgressModal = ({ isOpen, onClose, onUpdate, currentProgress, bookPageCount, isUpdating }) => {
   const [currentPage, setCurrentPage] = useState('')
   const [totalPages, setTotalPages] = useState('')
   const [errors, setErrors] = useState({})
@@ -12,8 +12,11 @@ const UpdateProgressModal = ({ isOpen, onClose, onUpdate, currentProgress, isUpd
     if (currentProgress) {
       setCurrentPage(currentProgress.current_page?.toString() || '')
       setTotalPages(currentProgress.total_pages?.toString() || '')
+    } else if (bookPageCount) {
+      // Prefill from the page count enriched from Open Library
+      setTotalPages(bookPageCount.toString())
     }
-  }, [currentProgress])
+  }, [currentProgress, bookPageCount])
 
   const handleSubmit = (e) => {
     e.preventDefault()
@@ -35,9 +35,11 @@ export const useComments = (groupId, bookId) => {
     mutationFn: ({ commentId, liked }) => (
       liked ? commentService.unlikeComment(commentId) : commentService.likeComment(commentId)
     ),
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['comments', groupId, bookId] })
-      queryClient.invalidateQueries({ queryKey: ['commentsAhead', groupId, bookId] })
+    onSuccess: ({ comment_id, like_count, user_has_liked }) => {
+      // The response carries the new state, so patch the cached feed instead of refetching it
+      queryClient.setQueryData(['comments', groupId, bookId], (current) => current?.map((c) => (
+        c.id === comment_id ? { ...c, like_count, user_has_liked } : c
+      )))
     },
     onError: (error) => {
       toast.error(error.response?.data?.detail || 'Failed to update like')
@@ -46,7 +48,10 @@ export const useComments = (groupId, bookId) => {
 
   const reportCommentMutation = useMutation({
     mutationFn: ({ commentId, reason }) => commentService.reportComment(commentId, reason),
-    onSuccess: () => {
+    onSuccess: (data) => {
+      if (data?.hidden) {
+        queryClient.invalidateQueries({ queryKey: ['comments', groupId, bookId] })
+      }
       toast.success('Comment reported. Thank you!')
     },
     onError: (error) => {
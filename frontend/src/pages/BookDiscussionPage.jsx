@@ -183,6 +183,7 @@ const BookDiscussionPage = () => {
         onClose={() => setShowProgressModal(false)}
         onUpdate={updateProgress}
         currentProgress={progress}
+        bookPageCount={book.page_count}
         isUpdating={isUpdating}
       />
     </div>
@@ -11,6 +11,10 @@ const api = axios.create({
   withCredentials: false,
 })
 
+// Signed "<unix seconds>:<signature>" token from the last write, and its deadline
+let primaryUntil = null
+let primaryUntilAt = 0
+
 // Request interceptor to add auth token
 api.interceptors.request.use(
   (config) => {
@@ -18,6 +22,10 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`
     }
+    // After a write, keep reads on the primary database until replicas catch up
+    if (primaryUntilAt > Date.now() / 1000) {
+      config.headers['X-Primary-Until'] = primaryUntil
+    }
     return config
   },
   (error) => {
@@ -25,18 +33,72 @@ api.interceptors.request.use(
   }
 )
 
+export const clearSession = () => {
+  localStorage.removeItem('accessToken')
+  localStorage.removeItem('refreshToken')
+  localStorage.removeItem('user')
+}
+
+// Access tokens are short-lived; concurrent 401s share a single refresh
+let refreshPromise = null
+
+const refreshAccessToken = () => {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem('refreshToken')
+    refreshPromise = (refreshToken
+      ? axios.post(`${API_BASE_URL}/auth/refresh`, { refresh_token: refreshToken })
+      : Promise.reject(new Error('No refresh token'))
+    )
+      .then((response) => {
+        const { access_token, refresh_token, user } = response.data
+        localStorage.setItem('accessToken', access_token)
+        localStorage.setItem('refreshToken', refresh_token)
+        localStorage.setItem('user', JSON.stringify(user))
+        return access_token
+      })
+      .finally(() => {
+        refreshPromise = null
+      })
+  }
+  return refreshPromise
+}
+
 // Response interceptor to handle errors
 api.interceptors.response.use(
-  (response) => response,
-  (error) => {
-    if (error.response?.status === 401) {
-      // Clear token and redirect to login
-      localStorage.removeItem('accessToken')
-      localStorage.removeItem('user')
+  (response) => {
+    const token = response.headers['x-primary-until']
+    const until = Number(token?.split(':')[0])
+    if (until > primaryUntilAt) {
+      primaryUntil = token
+      primaryUntilAt = until
+    }
+    return response
+  },
+  async (error) => {
+    const original = error.config
+    const isAuthRoute = original?.url?.startsWith('/auth/') && original.url !== '/auth/me'
+
+    if (error.response?.status === 401 && original && !original._retried && !isAuthRoute) {
+      original._retried = true
+      try {
+        const token = await refreshAccessToken()
+        original.headers.Authorization = `Bearer ${token}`
+        return api(original)
+      } catch {
+        // Fall through to sign-out below
+      }
+    }
+
+    if (error.response?.status === 401 && !isAuthRoute) {
+      // Clear tokens and redirect to login
+      clearSession()
       window.location.href = '/login'
     }
     return Promise.reject(error)
   }
 )
 
+// Resolve an API-relative path (e.g. a cached cover URL) against the API base
+export const apiUrl = (path) => (path ? `${API_BASE_URL}${path}` : path)
+
 export default api
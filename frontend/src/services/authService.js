@@ -1,11 +1,12 @@
-import api from './api'
+import api, { clearSession } from './api'
 
 export const authService = {
   async emailPasswordRegister(email, password, name) {
     const response = await api.post('/auth/register', { email, password, name })
-    const { access_token, user } = response.data
+    const { access_token, refresh_token, user } = response.data
 
     localStorage.setItem('accessToken', access_token)
+    localStorage.setItem('refreshToken', refresh_token)
     localStorage.setItem('user', JSON.stringify(user))
 
     return { token: access_token, user }
@@ -13,9 +14,10 @@ export const authService = {
 
   async emailPasswordLogin(email, password) {
     const response = await api.post('/auth/login', { email, password })
-    const { access_token, user } = response.data
+    const { access_token, refresh_token, user } = response.data
 
     localStorage.setItem('accessToken', access_token)
+    localStorage.setItem('refreshToken', refresh_token)
     localStorage.setItem('user', JSON.stringify(user))
 
     return { token: access_token, user }
@@ -23,9 +25,10 @@ export const authService = {
 
   async googleLogin(credential) {
     const response = await api.post('/auth/google', { token: credential })
-    const { access_token, user } = response.data
+    const { access_token, refresh_token, user } = response.data
 
     localStorage.setItem('accessToken', access_token)
+    localStorage.setItem('refreshToken', refresh_token)
     localStorage.setItem('user', JSON.stringify(user))
 
     return { token: access_token, user }
@@ -37,9 +40,11 @@ export const authService = {
   },
 
   async logout() {
-    await api.post('/auth/logout')
-    localStorage.removeItem('accessToken')
-    localStorage.removeItem('user')
+    try {
+      await api.post('/auth/logout')
+    } finally {
+      clearSession()
+    }
   },
 
   getStoredUser() {